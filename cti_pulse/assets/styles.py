@@ -187,6 +187,56 @@ def load_custom_css():
             background: linear-gradient(135deg, rgba(56, 161, 105, 0.05) 0%, rgba(255, 255, 255, 0.95) 100%);
         }
 
+        /* Collapsible card details */
+        .card-details {
+            margin-top: 0.75rem;
+            padding-top: 0.5rem;
+            border-top: 1px solid #e2e8f0;
+        }
+
+        .card-details summary {
+            cursor: pointer;
+            font-weight: 600;
+            color: #4a5568;
+        }
+
+        .card-related {
+            margin-top: 0.75rem;
+            padding: 0.5rem 0.75rem;
+            background: #edf2f7;
+            border-radius: 8px;
+        }
+
+        .card-related summary {
+            cursor: pointer;
+            font-weight: 600;
+            color: #2b6cb0;
+        }
+
+        /* Surging threat and source badges */
+        .trend-badge {
+            display: inline-block;
+            margin: 0.2rem 0.3rem;
+            padding: 0.2rem 0.6rem;
+            background: #fed7d7;
+            color: #c53030;
+            border-radius: 999px;
+            font-size: 0.85rem;
+            font-weight: 600;
+        }
+
+        .trend-badges {
+            margin-bottom: 0.5rem;
+        }
+
+        .card-details pre {
+            white-space: pre-wrap;
+            font-size: 0.8rem;
+            background: #f7fafc;
+            padding: 0.5rem;
+            border-radius: 8px;
+        }
+
         /* Executive Summary */
         .exec-summary {
             background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
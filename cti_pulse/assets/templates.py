@@ -3,6 +3,22 @@ HTML Templates for CyberPulse Application
 Centralized HTML content for better maintainability
 """
 
+import html
+from urllib.parse import urlsplit
+
+
+def escape_text(value):
+    """HTML-escape article text and collapse whitespace (blank lines would end a markdown HTML block)"""
+    return html.escape(" ".join(str(value).split()))
+
+
+def is_web_url(url):
+    """Whether a feed URL is safe to link: http(s) only, never javascript: or data:"""
+    try:
+        return urlsplit(str(url).strip()).scheme.lower() in ('http', 'https')
+    except ValueError:
+        return False
+
 
 def get_header_template():
     """Main application header template"""
@@ -25,8 +41,13 @@ def get_ai_container_template():
     """
 
 
-def get_executive_summary_template(threat_level, total_threats, high_severity, top_threat, sentiment):
-    """Executive summary template"""
+def get_executive_summary_template(threat_level, total_threats, high_severity, top_threat, sentiment, surging=()):
+    """Executive summary template; ``surging`` lists threats spiking against their baseline"""
+    surging_block = f"""
+            <div>
+                <strong>Surging:</strong><br>
+                🔥 {escape_text(', '.join(surging))}
+            </div>""" if surging else ""
     return f"""
     <div class="exec-summary">
         <h2>📊 Executive Threat Summary</h2>
@@ -46,13 +67,14 @@ def get_executive_summary_template(threat_level, total_threats, high_severity, t
             <div>
                 <strong>Top Threat:</strong><br>
                 {top_threat}
-            </div>
+            </div>{surging_block}
         </div>
         <div style="margin-top: 1.5rem; padding-top: 1rem; border-top: 1px solid rgba(255,255,255,0.3);">
             <strong>Key Recommendations:</strong>
             <ul style="margin-top: 0.5rem;">
                 <li>{"Immediate attention required for high-severity threats" if high_severity > 3 else "Continue monitoring current threat levels"}</li>
                 <li>{"Focus on " + top_threat + " mitigation strategies" if top_threat != "None" else "Maintain current security posture"}</li>
+                {"<li>Investigate the sudden rise in " + escape_text(surging[0]) + " reporting</li>" if surging else ""}
             </ul>
         </div>
     </div>
@@ -70,21 +92,21 @@ def get_metric_card_template(value, label, icon="📊"):
 
 
 def get_alert_card_template(title, severity, category, source, summary, date, severity_class, emoji):
-    """Alert card template"""
+    """Alert card template (article text is escaped)"""
     return f"""
     <div class="alert-card {severity_class}">
         <h4 style="margin: 0 0 0.5rem 0; color: #2d3748;">
-            {emoji} {title}
+            {emoji} {escape_text(title)}
         </h4>
         <div style="display: flex; gap: 1rem; margin-bottom: 0.75rem; flex-wrap: wrap;">
             <span><strong>Severity:</strong> {severity}/10</span>
-            <span><strong>Category:</strong> {category}</span>
-            <span><strong>Source:</strong> {source}</span>
+            <span><strong>Category:</strong> {escape_text(category)}</span>
+            <span><strong>Source:</strong> {escape_text(source)}</span>
         </div>
         <p style="margin: 0.5rem 0; color: #4a5568; line-height: 1.5;">
-            {summary[:300]}{"..." if len(summary) > 300 else ""}
+            {escape_text(summary[:300])}{"..." if len(summary) > 300 else ""}
         </p>
-        <small style="color: #718096;">📅 {date}</small>
+        <small style="color: #718096;">📅 {escape_text(date)}</small>
     </div>
     """
 
@@ -141,29 +163,103 @@ def get_welcome_screen_template():
     """
 
 
-def get_threat_article_template(index, title, severity, date, source, summary, severity_class, emoji):
-    """Individual threat article template"""
+def get_threat_article_template(index, title, severity, date, source, summary, severity_class, emoji, details="",
+                                related=""):
+    """Individual threat article template (article text is escaped; ``details`` and ``related`` are trusted HTML)"""
     return f"""
     <div class="alert-card {severity_class}">
         <h5 style="margin: 0 0 0.5rem 0; color: #2d3748;">
-            {emoji} <strong>Article {index}: {title}</strong>
+            {emoji} <strong>Article {index}: {escape_text(title)}</strong>
         </h5>
         <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); 
                     gap: 0.5rem; margin-bottom: 0.75rem;">
             <span><strong>Severity:</strong> {severity}/10</span>
-            <span><strong>📅 Published:</strong> {date}</span>
-            <span><strong>📰 Source:</strong> {source}</span>
+            <span><strong>📅 Published:</strong> {escape_text(date)}</span>
+            <span><strong>📰 Source:</strong> {escape_text(source)}</span>
         </div>
         <div style="margin-top: 1rem; padding-top: 0.75rem; border-top: 1px solid #e2e8f0;">
             <strong>Summary:</strong>
             <p style="margin: 0.5rem 0 0 0; color: #4a5568; line-height: 1.6;">
-                {summary}
+                {escape_text(summary)}
             </p>
         </div>
+        {related}
+        {details}
     </div>
     """
 
 
+def get_cluster_related_template(source_count, others):
+    """Badge and collapsible list of other reports on the same incident
+
+    ``others`` holds ``(title, url, source, date, severity)`` tuples.
+    """
+    items = "".join(
+        f"<li><a href=\"{escape_text(url)}\" target=\"_blank\" rel=\"noopener noreferrer\">{escape_text(title)}</a>"
+        f" — {escape_text(source)}, {escape_text(date)} (severity {severity}/10)</li>"
+        if is_web_url(url) else
+        f"<li>{escape_text(title)} — {escape_text(source)}, {escape_text(date)} (severity {severity}/10)</li>"
+        for title, url, source, date, severity in others
+    )
+    return f"""
+    <details class="card-related">
+        <summary>📰 Reported by {source_count} source{'s' if source_count != 1 else ''} · {len(others)} related article{'s' if len(others) != 1 else ''}</summary>
+        <ul style="margin: 0.25rem 0;">{items}</ul>
+    </details>
+    """
+
+
+def get_surging_badges_template(label, surging):
+    """Row of "surging" badges, ``surging`` maps a name to its spike stats"""
+    badges = "".join(
+        f"<span class=\"trend-badge\" title=\"{stats['count']} articles on {escape_text(stats['day'])}, "
+        f"baseline {stats['baseline']}/day\">🔥 {escape_text(name)} · {stats['z']:.1f}σ</span>"
+        for name, stats in surging.items()
+    )
+    return f"""
+    <div class="trend-badges"><strong>{escape_text(label)}:</strong> {badges}</div>
+    """
+
+
+def get_article_details_template(sentiment_compound, sentiment_neg, category, threat_score, threat_keyword,
+                                 highlights, raw_json, indicators=(), techniques=()):
+    """Collapsible article details, replacing the per-card Show Details button"""
+    indicator_items = "".join(f"<li><code>{escape_text(value)}</code> ({escape_text(kind.upper())})</li>"
+                              for kind, value in indicators)
+    indicators_block = (f"<strong>🧬 Indicators:</strong><ul style=\"margin: 0.25rem 0;\">{indicator_items}</ul>"
+                        if indicators else "")
+    techniques_block = (f"<strong>🧭 ATT&amp;CK:</strong> {escape_text(', '.join(techniques))}<br>"
+                        if techniques else "")
+    highlight_items = "".join(f"<li><em>{escape_text(h)}</em></li>" for h in highlights)
+    highlights_block = (f"<strong>🔍 Key Highlights:</strong><ul style=\"margin: 0.25rem 0;\">{highlight_items}</ul>"
+                        if highlights else "")
+    return f"""
+    <details class="card-details">
+        <summary>🔍 Show Details</summary>
+        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 0.5rem; margin: 0.5rem 0;">
+            <div>
+                <strong>📊 Sentiment Analysis:</strong><br>
+                • Compound Score: {sentiment_compound:.3f}<br>
+                • Negative: {sentiment_neg:.3f}<br>
+                • Category: {escape_text(category)}
+            </div>
+            <div>
+                <strong>📈 Threat Scoring:</strong><br>
+                • Final Score: {threat_score:.1f}/10<br>
+                • Threat Type: {escape_text(threat_keyword)}
+            </div>
+        </div>
+        {techniques_block}
+        {highlights_block}
+        {indicators_block}
+        <details>
+            <summary>Show raw data</summary>
+            <pre>{html.escape(raw_json)}</pre>
+        </details>
+    </details>
+    """
+
+
 def get_no_threats_message_template():
     """No threats found message template"""
     return """
@@ -0,0 +1,4 @@
+"""
+Benchmarks package for CyberPulse application
+Standalone scripts measuring memory and throughput of the data pipeline
+"""
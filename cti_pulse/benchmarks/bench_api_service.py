@@ -0,0 +1,188 @@
+"""
+Load test: requests per second for the REST/JSON API service on one core
+
+Starts ``service.api_server`` in a subprocess pinned to a single CPU and
+drives it from client processes on the remaining CPUs over keep-alive
+connections. The request mix is served by the service itself (term
+extraction, stored history, conditional requests) so the upstream threat
+API is not part of the measurement.
+
+Target: SERVICE_CONFIG['target_rps'] requests/second for cached responses
+on one core.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_api_service [--seconds 10] [--clients 4]
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from config.settings import SERVICE_CONFIG
+
+QUERIES = [
+    'ransomware hitting hospitals',
+    'phishing emails targeting banks',
+    'zero-day exploit in vpn appliances',
+    'ddos against gaming platforms',
+    'supply chain attack on npm packages',
+    'data breach at retailer',
+    'apt group espionage campaign',
+    'malware outbreak spreading via usb'
+]
+
+
+def request_mix():
+    paths = [f"/api/terms?q={q.replace(' ', '+')}" for q in QUERIES]
+    paths += [f"/api/history?page={page}&page_size=20" for page in range(1, 5)]
+    return paths
+
+
+def _client_thread(port, paths, stop_at, counts, etags):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    done = errors = 0
+    i = 0
+    while time.perf_counter() < stop_at:
+        path = paths[i % len(paths)]
+        headers = {'Accept-Encoding': 'gzip'}
+        # Every other request revalidates with the ETag, as polling tools do
+        if i % 2 and path in etags:
+            headers['If-None-Match'] = etags[path]
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status == 200:
+                etags[path] = response.getheader('ETag')
+            elif response.status != 304:
+                errors += 1
+            done += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port)
+        i += 1
+    conn.close()
+    counts.append((done, errors))
+
+
+def _client_process(port, seconds, threads, cpu, queue):
+    if hasattr(os, 'sched_setaffinity') and cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    paths = request_mix()
+    stop_at = time.perf_counter() + seconds
+    counts, etags = [], {}
+    workers = [threading.Thread(target=_client_thread, args=(port, paths, stop_at, counts, etags))
+               for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    queue.put((sum(c[0] for c in counts), sum(c[1] for c in counts)))
+
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process (Linux), or None"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def wait_for_server(server, port, timeout=30):
+    """Wait for the health endpoint; False if the server exits or the timeout passes first"""
+    deadline = time.time() + timeout
+    while time.time() < deadline and server.poll() is None:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/health')
+            conn.getresponse().read()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8699)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--clients', type=int, default=4, help="Client processes")
+    parser.add_argument('--threads', type=int, default=4, help="Keep-alive connections per client process")
+    args = parser.parse_args()
+
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else [None]
+    server_cpu, client_cpus = cpus[0], cpus[1:] or cpus
+
+    def pin_server():
+        if server_cpu is not None:
+            os.sched_setaffinity(0, {server_cpu})
+
+    # Server output goes to a file rather than a pipe, so a long run cannot fill it and block the server
+    server_log = tempfile.TemporaryFile()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'service.api_server', '--port', str(args.port)],
+        preexec_fn=pin_server if hasattr(os, 'sched_setaffinity') else None,
+        stdout=server_log, stderr=subprocess.STDOUT
+    )
+    try:
+        if not wait_for_server(server, args.port):
+            server.terminate()
+            server.wait()
+            server_log.seek(0)
+            output = server_log.read().decode('utf-8', errors='replace').strip()
+            sys.exit(f"Server did not start (exit code {server.returncode})" + (f":\n{output}" if output else ""))
+
+        # Warm the response cache
+        for path in request_mix():
+            conn = http.client.HTTPConnection('127.0.0.1', args.port)
+            conn.request('GET', path)
+            conn.getresponse().read()
+            conn.close()
+
+        cpu_before = cpu_seconds(server.pid)
+        queue = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=_client_process, args=(
+                args.port, args.seconds, args.threads, client_cpus[i % len(client_cpus)], queue))
+            for i in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        results = [queue.get() for _ in clients]
+        for client in clients:
+            client.join()
+        cpu_after = cpu_seconds(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    done = sum(r[0] for r in results)
+    errors = sum(r[1] for r in results)
+    rps = done / args.seconds
+    target = SERVICE_CONFIG['target_rps']
+
+    print(f"Server pinned to CPU {server_cpu}; {args.clients} client processes x {args.threads} connections")
+    print(f"Requests:  {done:,} in {args.seconds:.0f}s ({errors} errors)")
+    print(f"Throughput: {rps:,.0f} req/s wall clock")
+
+    # With a single CPU the clients compete with the server for it, so also
+    # report requests per second of server CPU time: the rate one dedicated
+    # core sustains.
+    if cpu_before is not None and cpu_after is not None and cpu_after > cpu_before:
+        per_core = done / (cpu_after - cpu_before)
+        print(f"Server CPU: {cpu_after - cpu_before:.1f}s -> {per_core:,.0f} req/s per core")
+        rps = per_core if len(cpus) == 1 else rps
+    print(f"Target: {target:,} req/s on one core -> {'PASS' if rps >= target else 'FAIL'}")
+
+
+if __name__ == '__main__':
+    main()
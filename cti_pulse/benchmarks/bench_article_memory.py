@@ -0,0 +1,104 @@
+"""
+Memory benchmark: bytes per analysed article in session state
+
+Compares the previous per-article dict (summary, clean_summary and the raw
+API article all held in memory) with the slim ThreatArticle record, which
+keeps the summary's token IDs instead of its cleaned text.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_article_memory
+"""
+
+import gc
+import json
+import random
+import tracemalloc
+
+from utils.article_record import ThreatArticle
+from utils.tokens import clean_text, get_vocabulary
+
+SOURCES = ['bleepingcomputer.com', 'krebsonsecurity.com', 'darkreading.com', 'thehackernews.com', 'reuters.com']
+WORDS = ('critical ransomware attack hospital data breach exploit vulnerability patched systems '
+         'attackers encrypted servers demanded payment investigators said customers affected').split()
+
+
+def make_raw_article(i):
+    """Synthetic article shaped like an API search result"""
+    summary = ' '.join(random.choice(WORDS) for _ in range(120)).capitalize() + '.'
+    return {
+        'title': f"Threat report {i}: " + ' '.join(random.choice(WORDS) for _ in range(8)),
+        'summary': summary,
+        'url': f"https://www.{random.choice(SOURCES)}/news/{i}",
+        'timestamp': '2026-10-01T12:00:00Z',
+        'highlights': [' '.join(random.choice(WORDS) for _ in range(25)) for _ in range(3)],
+        'smart_tags': {'entities': [random.choice(WORDS) for _ in range(10)]},
+        'score': random.random()
+    }
+
+
+def make_before(raw, threat_keyword):
+    """Per-article dict as previously stored in session state"""
+    summary = raw['summary']
+    return {
+        'title': raw['title'],
+        'summary': summary,
+        'clean_summary': clean_text(summary),
+        'sentiment_compound': -0.8,
+        'sentiment_neg': 0.3,
+        'published_date': raw['timestamp'],
+        'source': raw['url'].split('/')[2].replace('www.', ''),
+        'highlights': raw['highlights'],
+        'threat_keyword': threat_keyword,
+        'category': 'Malware',
+        'raw_article': raw,
+        'threat_score': 8.5
+    }
+
+
+def make_after(raw, threat_keyword, index):
+    """Slim record as now stored in session state"""
+    before = make_before(raw, threat_keyword)
+    token_ids = get_vocabulary().encode(raw['summary'])
+    return ThreatArticle.from_analysis(dict(before, url=raw['url'], token_ids=token_ids), 'ab' * 32, index)
+
+
+def measure(build, payloads):
+    """Bytes retained per article by whatever ``build`` keeps in session state"""
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    kept = build(payloads)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert kept
+    return (current - start) / len(payloads)
+
+
+def build_before(payloads):
+    """Old layout: raw_data response plus a dict per article"""
+    raw_data = {'results': [json.loads(p) for p in payloads]}
+    analysis = [make_before(raw, 'ransomware attack') for raw in raw_data['results']]
+    return raw_data, analysis
+
+
+def build_after(payloads):
+    """New layout: slim records only; decoded articles are dropped"""
+    return [make_after(json.loads(p), 'ransomware attack', i) for i, p in enumerate(payloads)]
+
+
+def main(count=2000):
+    random.seed(7)
+    payloads = [json.dumps(make_raw_article(i)) for i in range(count)]
+
+    before = measure(build_before, payloads)
+    after = measure(build_after, payloads)
+
+    print(f"Articles measured:     {count}")
+    print(f"Before (dict + raw):   {before:,.0f} bytes/article")
+    print(f"After (ThreatArticle): {after:,.0f} bytes/article")
+    print(f"Reduction:             {100 * (1 - after / before):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
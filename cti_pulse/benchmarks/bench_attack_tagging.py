@@ -0,0 +1,78 @@
+"""
+Scaling benchmark: ATT&CK tagging cost per article vs pattern count
+
+Tags synthetic articles with the bundled technique mapping, then with the
+same mapping padded by extra synthetic phrases (x10, x100). The
+Aho-Corasick automaton makes one pass per article, so articles/second
+should stay roughly flat while the pattern count grows.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_attack_tagging [--articles 5000]
+"""
+
+import argparse
+import copy
+import json
+import random
+import time
+
+from config.settings import ATTACK_CONFIG
+from utils.attack_tagger import AttackTagger
+
+WORDS = ('critical ransomware attack hospital data breach exploit vulnerability patched systems attackers '
+         'encrypted servers demanded payment investigators said customers affected researchers warned the group '
+         'phishing emails stolen credentials moved laterally shadow copies exfiltrated cobalt strike').split()
+
+
+def padded_mapping(mapping, factor, rng):
+    """Mapping with ``factor`` times as many phrases
+
+    Extra phrases start with words that occur in the articles but end in
+    made-up words, so the automaton walks into them on every article
+    without adding matches; the tag count stays comparable.
+    """
+    mapping = copy.deepcopy(mapping)
+    for technique in mapping['techniques']:
+        extra = []
+        for _ in range(len(technique['phrases']) * (factor - 1)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(1, 3))]
+            extra.append(' '.join(words + [f"zz{rng.randint(0, 10 ** 6)}"]))
+        technique['phrases'] = technique['phrases'] + extra
+    return mapping
+
+
+def make_article(rng):
+    summary = ' '.join(rng.choice(WORDS) for _ in range(120))
+    return {
+        'title': ' '.join(rng.choice(WORDS) for _ in range(10)),
+        'summary': summary,
+        'highlights': [summary[:160], summary[300:460], summary[600:760]]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ATT&CK tagging throughput vs pattern count")
+    parser.add_argument('--articles', type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with open(ATTACK_CONFIG['mapping_path'], encoding='utf-8') as f:
+        mapping = json.load(f)
+    articles = [make_article(rng) for _ in range(args.articles)]
+
+    print(f"{'Patterns':>9} {'States':>8} {'Build':>8} {'Articles/s':>11} {'Tags/article':>13}")
+    for factor in (1, 10, 100):
+        started = time.perf_counter()
+        tagger = AttackTagger(padded_mapping(mapping, factor, rng) if factor > 1 else mapping)
+        build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        tags = sum(len(tagger.tag_article(article)) for article in articles)
+        elapsed = time.perf_counter() - started
+
+        print(f"{tagger.pattern_count:>9,} {len(tagger.automaton):>8,} {build:>7.2f}s "
+              f"{args.articles / elapsed:>11,.0f} {tags / args.articles:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
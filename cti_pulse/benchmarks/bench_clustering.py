@@ -0,0 +1,126 @@
+"""
+Scaling benchmark: incremental campaign clustering cost per new article
+
+Streams synthetic coverage into CampaignClusterer: each incident is
+reported by several outlets, each rewording about a quarter of the base
+story, mixed with one-off articles that share the same vocabulary. The
+stream is timed in slices, so the per-article cost can be checked as the
+number of stored articles grows, and the final grouping is scored with
+pairwise precision and recall against the true incidents. Traced memory
+and LSH bucket count are reported too; with ``--max-clusters`` below the
+number of incidents they should level off rather than grow with the stream.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_clustering [--articles 50000] [--max-clusters 5000]
+"""
+
+import argparse
+import itertools
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+
+from utils.clustering import CampaignClusterer
+
+SOURCES = ['bleepingcomputer.com', 'krebsonsecurity.com', 'darkreading.com', 'securityweek.com',
+           'therecord.media', 'thehackernews.com', 'theregister.com', 'zdnet.com', 'wired.com', 'reuters.com']
+
+
+def make_vocabulary(rng, size=5000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+def zipf_words(rng, vocabulary, weights, n):
+    # Zipf-distributed words: a shared common core and a long tail, like news text
+    return rng.choices(vocabulary, cum_weights=weights, k=n)
+
+
+def reword(rng, words, vocabulary, weights, rate=0.25):
+    """Another outlet's version: some words changed, opening trimmed, own closing"""
+    words = [zipf_words(rng, vocabulary, weights, 1)[0] if rng.random() < rate else word for word in words]
+    cut = rng.randrange(len(words) // 4)
+    return words[cut:] + zipf_words(rng, vocabulary, weights, cut)
+
+
+def make_stream(rng, count, coverage=(2, 12), singles=0.4):
+    """Articles tagged with their true incident id, in arrival order"""
+    vocabulary = make_vocabulary(rng)
+    # Content words only (stopwords are dropped before shingling), so the head is flatter
+    weights = list(itertools.accumulate(1 / (rank + 50) for rank in range(len(vocabulary))))
+    stream = []
+    incident = 0
+    while len(stream) < count:
+        base = zipf_words(rng, vocabulary, weights, 90)
+        outlets = 1 if rng.random() < singles else rng.randint(*coverage)
+        for _ in range(outlets):
+            words = reword(rng, base, vocabulary, weights) if outlets > 1 else base
+            stream.append(({
+                'article_id': f"https://news.example/{len(stream)}",
+                'title': ' '.join(words[:10]),
+                'summary': ' '.join(words[10:]),
+                'source': rng.choice(SOURCES),
+                'threat_keyword': 'ransomware attack'
+            }, incident))
+        incident += 1
+    # Outlets publish over time, so interleave nearby incidents
+    stream.sort(key=lambda item: item[1] + rng.random() * 20)
+    return stream[:count]
+
+
+def pair_scores(stream, clusterer):
+    """Pairwise precision/recall of predicted clusters vs true incidents
+
+    Articles whose cluster was evicted (beyond ``max_clusters``) are skipped.
+    """
+    predicted, truth = defaultdict(list), defaultdict(list)
+    for article, incident in stream:
+        cluster = clusterer.cluster_of(article['article_id'])
+        if cluster is not None:
+            predicted[cluster.cluster_id].append(incident)
+            truth[incident].append(article['article_id'])
+
+    true_pairs = sum(len(m) * (len(m) - 1) // 2 for m in truth.values())
+    found_pairs = sum(len(m) * (len(m) - 1) // 2 for m in predicted.values())
+    correct = 0
+    for members in predicted.values():
+        counts = defaultdict(int)
+        for incident in members:
+            counts[incident] += 1
+        correct += sum(c * (c - 1) // 2 for c in counts.values())
+    return correct / max(found_pairs, 1), correct / max(true_pairs, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Campaign clustering cost per article vs history size")
+    parser.add_argument('--articles', type=int, default=50000)
+    parser.add_argument('--slices', type=int, default=5)
+    parser.add_argument('--max-clusters', type=int, default=None, help="Default: CLUSTER_CONFIG['max_clusters']")
+    args = parser.parse_args()
+
+    stream = make_stream(random.Random(7), args.articles)
+    tracemalloc.start()
+    clusterer = CampaignClusterer(max_clusters=args.max_clusters)
+
+    print(f"{'Stored':>8} {'us/article':>11} {'Candidates':>11} {'Clusters':>9} {'Buckets':>9} {'MB':>7}")
+    size = len(stream) // args.slices
+    for start in range(0, len(stream), size):
+        batch = stream[start:start + size]
+        candidates = clusterer.stats['candidates']
+        started = time.perf_counter()
+        for article, _ in batch:
+            clusterer.add(article)
+        elapsed = time.perf_counter() - started
+        print(f"{start + len(batch):>8,} {elapsed / len(batch) * 1e6:>11.0f} "
+              f"{(clusterer.stats['candidates'] - candidates) / len(batch):>11.2f} {len(clusterer):>9,} "
+              f"{len(clusterer._buckets):>9,} {tracemalloc.get_traced_memory()[0] / 2**20:>7.1f}")
+
+    precision, recall = pair_scores(stream, clusterer)
+    incidents = len({incident for _, incident in stream})
+    print(f"Incidents: {incidents:,}  clusters: {len(clusterer):,}  "
+          f"pairwise precision {precision:.3f}  recall {recall:.3f}")
+
+
+if __name__ == '__main__':
+    main()
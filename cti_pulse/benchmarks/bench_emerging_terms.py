@@ -0,0 +1,81 @@
+"""
+Scaling benchmark: emerging-term extraction cost and memory vs stream length
+
+Streams synthetic summaries (Zipf-distributed vocabulary) published over
+many days into EmergingTerms, with a few made-up malware names appearing
+only in the last days. Reports the per-article cost, the counters held
+(bounded by days kept x capacity, however long the stream) and whether
+the injected names come out on top.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_emerging_terms [--days 60] [--per-day 300] [--share 0.05]
+"""
+
+import argparse
+import itertools
+import random
+import time
+from datetime import date, timedelta
+
+from utils.emerging_terms import EmergingTerms
+
+INJECTED = ['zorvexlocker', 'kryptinabot', 'velmorastealer']
+
+
+def make_vocabulary(rng, size=8000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emerging-term extraction cost and memory vs stream length")
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--per-day', type=int, default=300)
+    parser.add_argument('--share', type=float, default=0.05,
+                        help="Share of articles in the last two days mentioning each injected name")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocabulary = make_vocabulary(rng)
+    weights = list(itertools.accumulate(1 / (rank + 20) for rank in range(len(vocabulary))))
+    first = date.today() - timedelta(days=args.days - 1)
+    extractor = EmergingTerms()
+
+    print(f"{'Day':>5} {'Articles':>9} {'us/article':>11} {'Days kept':>10} {'Counters':>9}")
+    elapsed = 0.0
+    articles = 0
+    for day in range(args.days):
+        published = (first + timedelta(days=day)).isoformat()
+        batch = []
+        for _ in range(args.per_day):
+            words = rng.choices(vocabulary, cum_weights=weights, k=60)
+            if day >= args.days - 2:
+                words.extend(name for name in INJECTED if rng.random() < args.share)
+            batch.append({
+                'article_id': f"https://news.example/{articles + len(batch)}",
+                'threat_keyword': 'malware outbreak',
+                'summary': ' '.join(words),
+                'published_date': published
+            })
+
+        started = time.perf_counter()
+        for article in batch:
+            extractor.add(article)
+        elapsed += time.perf_counter() - started
+        articles += len(batch)
+        if (day + 1) % max(1, args.days // 5) == 0:
+            counters = sum(len(bucket.terms) for bucket in extractor.days.values())
+            print(f"{day + 1:>5} {articles:>9,} {elapsed / articles * 1e6:>11.0f} "
+                  f"{len(extractor.days):>10} {counters:>9,}")
+
+    started = time.perf_counter()
+    terms = extractor.emerging()
+    query = time.perf_counter() - started
+    found = [entry['term'] for entry in terms]
+    print(f"Query {query * 1000:.1f} ms. Top terms: {', '.join(found[:5]) or 'none'}")
+    print(f"Injected found: {sum(term in found for term in INJECTED)}/{len(INJECTED)}  "
+          f"other terms flagged: {sum(term not in INJECTED for term in found)}")
+
+
+if __name__ == '__main__':
+    main()
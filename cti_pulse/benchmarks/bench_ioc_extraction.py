@@ -0,0 +1,87 @@
+"""
+Throughput benchmark: IOC/CVE extraction, articles per second on one core
+
+Runs ``extract_article_indicators`` over synthetic articles shaped like
+API search results (title, ~120-word summary, three highlights), a share
+of which mention CVEs, IPs, domains, URLs and hashes, then builds the
+IndicatorIndex.
+
+Target: tens of thousands of articles per second (at least 20,000), so
+extraction can run inline during fetch.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_ioc_extraction [--articles 20000]
+"""
+
+import argparse
+import hashlib
+import random
+import time
+
+from utils.indicators import IndicatorIndex, extract_article_indicators
+
+WORDS = ('critical ransomware attack hospital data breach exploit vulnerability patched systems '
+         'attackers encrypted servers demanded payment investigators said customers affected '
+         'researchers warned the group version 2.1 update released on Tuesday after U.S. agencies').split()
+
+
+def make_indicator(rng):
+    kind = rng.randrange(6)
+    if kind == 0:
+        return f"CVE-{rng.randint(2015, 2026)}-{rng.randint(1000, 99999)}"
+    if kind == 1:
+        return '.'.join(str(rng.randint(1, 254)) for _ in range(4))
+    if kind == 2:
+        return f"{rng.choice(['update', 'secure', 'cdn', 'login'])}-{rng.randint(1, 999)}.{rng.choice(['com', 'net', 'ru', 'io'])}"
+    if kind == 3:
+        return f"hxxps://files{rng.randint(1, 99)}[.]example[.]org/{rng.randint(1, 9999)}/payload.bin"
+    if kind == 4:
+        return hashlib.sha256(str(rng.random()).encode()).hexdigest()
+    return hashlib.md5(str(rng.random()).encode()).hexdigest()
+
+
+def make_article(i, rng):
+    summary = [rng.choice(WORDS) for _ in range(120)]
+    # About half the articles carry one to four indicators
+    if rng.random() < 0.5:
+        for _ in range(rng.randint(1, 4)):
+            summary.insert(rng.randrange(len(summary)), make_indicator(rng))
+    summary = ' '.join(summary).capitalize() + '.'
+    return {
+        'article_id': f"https://news.example.com/{i}",
+        'title': f"Threat report {i}: " + ' '.join(rng.choice(WORDS) for _ in range(8)),
+        'summary': summary,
+        'highlights': [summary[j:j + 160] for j in (0, 300, 600)]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IOC/CVE extraction throughput")
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    articles = [make_article(i, rng) for i in range(args.articles)]
+    chars = sum(len(a['title']) + len(a['summary']) + sum(map(len, a['highlights'])) for a in articles)
+
+    best = float('inf')
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for article in articles:
+            article['indicators'] = extract_article_indicators(article)
+        best = min(best, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    index = IndicatorIndex(articles)
+    index_time = time.perf_counter() - started
+
+    rate = args.articles / best
+    print(f"Articles:      {args.articles:,} ({chars / args.articles:,.0f} chars each)")
+    print(f"Extraction:    {best:.3f}s -> {rate:,.0f} articles/s ({chars / best / 1e6:.1f} MB/s)")
+    print(f"Index build:   {index_time:.3f}s for {len(index):,} unique indicators {index.type_counts()}")
+    print(f"Target >= 20,000 articles/s -> {'PASS' if rate >= 20000 else 'FAIL'}")
+
+
+if __name__ == '__main__':
+    main()
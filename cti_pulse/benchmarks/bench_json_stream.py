@@ -0,0 +1,87 @@
+"""
+Streaming benchmark: incremental response parsing vs decoding the whole body
+
+First checks correctness: a small response with floats, exponents,
+negative numbers, escapes and literals is fed in two pieces split at
+every byte offset, and each time must parse to the same result as
+``json.loads``. Then times ThreatResponseReader on a large synthetic
+response fed in ``chunk_size`` pieces against one ``json.loads`` of the
+buffered body.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_json_stream [--articles 2000] [--chunk-size 65536]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from utils.api_client import ThreatResponseReader
+from utils.json_stream import StreamingArrayParser
+
+WORDS = ('critical ransomware attack hospital data breach exploit vulnerability patched systems attackers '
+         'encrypted servers demanded payment investigators said customers affected').split()
+
+SAMPLE = ('{"took":12.5,"total":-3,"ratio":1e5,"neg":-2.25E-3,"flag":true,"none":null,'
+          '"results":[1.5e-3,-2,{"title":"caf\\u00e9 \\"quoted\\"","score":0.75,"tags":["a",1E2]},'
+          'false,120,"end"],"after":0.5}')
+
+
+def check_splits(text):
+    """Feed ``text`` split at every offset; returns the number of splits checked"""
+    expected = json.loads(text)
+    for offset in range(len(text) + 1):
+        parser = StreamingArrayParser('results')
+        items = parser.feed(text[:offset]) + parser.feed(text[offset:]) + parser.close()
+        assert items == expected['results'], (offset, items)
+        assert parser.meta == {key: value for key, value in expected.items() if key != 'results'}, offset
+    return len(text) + 1
+
+
+def make_body(rng, articles):
+    return json.dumps({'took': 0.25, 'total': articles, 'results': [{
+        'title': f"Report {i}: " + ' '.join(rng.choice(WORDS) for _ in range(8)),
+        'summary': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(60, 160))) + '.',
+        'url': f"https://news{i % 7}.example/{i}",
+        'timestamp': f"2026-10-{1 + i % 28:02d}",
+        'score': rng.random(),
+        'highlights': [' '.join(rng.choice(WORDS) for _ in range(25))],
+        'extra': {'author': 'staff', 'tags': ['security'] * 5}
+    } for i in range(articles)]}).encode('utf-8')
+
+
+def stream(body, chunk_size):
+    reader = ThreatResponseReader()
+    for start in range(0, len(body), chunk_size):
+        reader.feed(body[start:start + chunk_size])
+    return reader.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming response parsing vs whole-body decoding")
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--chunk-size', type=int, default=65536)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Split check: {check_splits(SAMPLE)} splits of a {len(SAMPLE)}-byte response parsed identically")
+
+    body = make_body(random.Random(7), args.articles)
+    timings = {'streamed': float('inf'), 'json.loads': float('inf')}
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        streamed = stream(body, args.chunk_size)
+        timings['streamed'] = min(timings['streamed'], time.perf_counter() - started)
+        started = time.perf_counter()
+        whole = json.loads(body)
+        timings['json.loads'] = min(timings['json.loads'], time.perf_counter() - started)
+    assert len(streamed['results']) == len(whole['results']) == args.articles
+
+    print(f"Body: {len(body) / 1e6:.1f} MB, {args.articles:,} articles, {args.chunk_size:,}-byte chunks")
+    for name, seconds in timings.items():
+        print(f"{name:<12} {seconds * 1000:>8.1f} ms  {len(body) / seconds / 1e6:>6.1f} MB/s")
+
+
+if __name__ == '__main__':
+    main()
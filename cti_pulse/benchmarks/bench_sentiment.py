@@ -0,0 +1,91 @@
+"""
+Scaling benchmark: batch NumPy VADER vs NLTK polarity_scores
+
+Builds a regression corpus of clean summaries that mix lexicon words with
+the words VADER's rules react to (boosters, dampeners, negations, "but",
+"least", "never so", "kind of", idioms), plus a mixed-case share to
+exercise the ALL-CAPS rules. Every text is scored by both
+implementations; the report gives the largest compound/neg difference and
+the number of texts where any score differs, then the time per batch at
+growing batch sizes.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_sentiment [--texts 5000] [--words 60]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+from utils.sentiment import BatchSentimentAnalyzer
+
+FILLER = ['attackers', 'the', 'of', 'in', 'network', 'servers', 'at', 'a', 'reported', 'group',
+          'campaign', 'data', 'this', 'so', 'researchers', 'exploited', 'systems', 'to', 'and', 'i']
+RULE_WORDS = ['not', 'never', 'no', 'very', 'extremely', 'hardly', 'slightly', 'kind', 'sort', 'least',
+              'but', 'nor', 'without', 'barely', 'cant', 'dont', 'yeah', 'right', 'cut', 'mustard',
+              'kiss', 'death', 'bomb', 'hand', 'mouth', 'just', 'enough']
+
+
+def make_corpus(rng, count, words):
+    lexicon = sorted(SentimentIntensityAnalyzer().lexicon)
+    lexicon = [word for word in lexicon if word.isalpha()]
+    boosters = [word for word in VaderConstants.BOOSTER_DICT if word.isalpha()]
+    texts = []
+    for index in range(count):
+        tokens = []
+        for _ in range(rng.randint(0, words)):
+            pick = rng.random()
+            if pick < 0.15:
+                tokens.append(rng.choice(lexicon))
+            elif pick < 0.25:
+                tokens.append(rng.choice(RULE_WORDS))
+            elif pick < 0.3:
+                tokens.append(rng.choice(boosters))
+            else:
+                tokens.append(rng.choice(FILLER))
+        if index % 5 == 0:
+            tokens = [token.upper() if rng.random() < 0.2 else token for token in tokens]
+        texts.append(' '.join(tokens))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch NumPy VADER vs NLTK polarity_scores")
+    parser.add_argument('--texts', type=int, default=5000)
+    parser.add_argument('--words', type=int, default=60, help="Maximum words per text")
+    args = parser.parse_args()
+
+    texts = make_corpus(random.Random(7), args.texts, args.words)
+    sia = SentimentIntensityAnalyzer()
+    batch = BatchSentimentAnalyzer()
+
+    expected = [sia.polarity_scores(text) for text in texts]
+    scores = batch.score(texts)
+    worst = {key: max(abs(e[key] - value) for e, value in zip(expected, scores[key].tolist()))
+             for key in ('compound', 'neg', 'neu', 'pos')}
+    differing = sum(any(e[key] != scores[key][i] for key in e) for i, e in enumerate(expected))
+    print(f"Regression corpus: {len(texts):,} texts, {differing} differ; max |diff| "
+          + ", ".join(f"{key} {value:.4f}" for key, value in worst.items()))
+
+    print(f"{'Batch':>7} {'NLTK ms':>9} {'Batch ms':>9} {'Speedup':>8} {'us/text':>8}")
+    for size in (10, 100, 1000, len(texts)):
+        chunk = texts[:size]
+        started = time.perf_counter()
+        for text in chunk:
+            sia.polarity_scores(text)
+        nltk_s = time.perf_counter() - started
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            batch.score(chunk)
+            timings.append(time.perf_counter() - started)
+        batch_s = float(np.median(timings))
+        print(f"{size:>7,} {nltk_s * 1000:>9.1f} {batch_s * 1000:>9.1f} {nltk_s / batch_s:>7.1f}x "
+              f"{batch_s / size * 1e6:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Latency benchmark: restoring a dashboard after a browser reload
+
+Builds a dashboard of synthetic articles the way a fetch does (processor
+analysis, then the session's indexes), snapshots it, and times:
+
+- refetch: what a reload used to cost, minus the network: analysing every
+  API response again and rebuilding the indexes
+- restore: memory-mapping the Arrow snapshot into ThreatArticle records,
+  then rebuilding the indexes
+
+Also checks the restored dashboard matches the original and compares the
+snapshot's size with a pickle of the same threat data.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_session_restore [--articles 500] [--repeat 5] [--compression zstd]
+"""
+
+import argparse
+import pickle
+import random
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from utils.article_index import ScoredArticleIndex
+from utils.session_snapshot import SessionSnapshots
+from utils.session_store import session_results
+from utils.threat_processor import ThreatProcessor
+
+THREATS = ['ransomware attack', 'data breach', 'phishing campaign', 'zero day exploit', 'supply chain attack']
+WORDS = ('critical ransomware attack hospital data breach exploit vulnerability patched systems attackers '
+         'encrypted servers demanded payment investigators said customers affected phishing emails '
+         'stolen credentials CVE-2026-1234 evil-domain.example 203.0.113.7').split()
+
+
+def make_responses(rng, articles):
+    """Synthetic API responses, one per threat"""
+    per_threat = articles // len(THREATS)
+    return {threat: {'results': [{
+        'title': f"{threat.title()} report {i}: " + ' '.join(rng.choice(WORDS) for _ in range(6)),
+        'summary': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))) + '.',
+        'url': f"https://news{i % 7}.example/{threat.replace(' ', '-')}/{i}",
+        'published_date': f"2026-10-{1 + i % 28:02d}",
+        'highlights': [' '.join(rng.choice(WORDS) for _ in range(20))]
+    } for i in range(per_threat)]} for threat in THREATS}
+
+
+def refetch(processor, responses):
+    threat_data = {threat: {'raw_ref': None, 'index': ScoredArticleIndex(
+        processor.analyze_threat_sentiment(response, threat))} for threat, response in responses.items()}
+    return session_results(threat_data, 3)
+
+
+def restore(snapshots, token):
+    threat_data, state = snapshots.load(token)
+    return session_results(threat_data, state['severity_filter'])
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings)) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard restore after a reload: refetch vs snapshot")
+    parser.add_argument('--articles', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--compression', default=None, help="Snapshot codec ('zstd', 'lz4', '' for none)")
+    args = parser.parse_args()
+
+    processor = ThreatProcessor()
+    responses = make_responses(random.Random(7), args.articles)
+    refetch(processor, responses)   # warm the vocabulary and lexicon
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshots = SessionSnapshots(directory, compression=args.compression)
+        token = uuid.uuid4().hex
+        refetch_ms, original = timed(lambda: refetch(processor, responses), args.repeat)
+        size = snapshots.save(token, original['threat_data'], {'severity_filter': 3})
+        restore_ms, restored = timed(lambda: restore(snapshots, token), args.repeat)
+        load_ms, _ = timed(lambda: snapshots.load(token), args.repeat)
+
+    for threat, data in original['threat_data'].items():
+        before = [article.to_dict() for article in data['index']]
+        after = [article.to_dict() for article in restored['threat_data'][threat]['index']]
+        assert before == after, threat
+    assert [a.article_id for a in original['alert_index'].top()] == \
+           [a.article_id for a in restored['alert_index'].top()]
+    assert len(original['indicator_index']) == len(restored['indicator_index'])
+
+    count = sum(len(data['index']) for data in original['threat_data'].values())
+    pickled = len(pickle.dumps(original['threat_data'], pickle.HIGHEST_PROTOCOL))
+    print(f"{count} articles across {len(THREATS)} threats; restored dashboard identical")
+    codec = snapshots.write_options.compression or 'uncompressed'
+    print(f"Snapshot: {size / 1024:,.0f} KB Arrow IPC, {codec} ({pickled / 1024:,.0f} KB pickled)")
+    print(f"{'Path':<32} {'ms':>8}")
+    print(f"{'refetch (analysis, no network)':<32} {refetch_ms:>8.1f}")
+    print(f"{'restore (snapshot + indexes)':<32} {restore_ms:>8.1f}")
+    print(f"{'  of which snapshot load':<32} {load_ms:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Memory benchmark: server memory held for dashboard results as sessions grow
+
+Simulates sessions that each fetch a dashboard of synthetic articles
+(processor analysis, ScoredArticleIndex, rollup, alert and indicator
+indexes) and stores their results:
+
+- unbounded: every session's results stay in memory, as they did in
+  ``st.session_state``
+- budgeted: a SessionStore with a total budget, spilling least recently
+  used sessions to a temporary SQLite cache
+
+Reports traced memory at growing session counts, how close the store's
+measured footprint is to the memory actually allocated, and the time to
+spill and to reload a session's results.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_session_store [--sessions 20] [--articles 500] [--budget-mb 16]
+"""
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from config.settings import UI_CONFIG
+from utils.article_index import ScoredArticleIndex, TopKIndex
+from utils.cache_backend import SQLiteCache
+from utils.indicators import IndicatorIndex
+from utils.rollups import ThreatRollup
+from utils.session_store import MB, SessionStore
+from utils.threat_processor import ThreatProcessor
+
+THREATS = ['ransomware attack', 'data breach', 'phishing campaign']
+WORDS = ('critical ransomware attack hospital data breach exploit vulnerability patched systems attackers '
+         'encrypted servers demanded payment investigators said customers affected phishing emails '
+         'stolen credentials CVE-2026-1234 evil-domain.example 203.0.113.7').split()
+
+
+def make_response(rng, session, threat, count):
+    """Synthetic API response for one threat"""
+    return {'results': [{
+        'title': f"{threat.title()} report {session}-{i}: " + ' '.join(rng.choice(WORDS) for _ in range(6)),
+        'summary': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))) + '.',
+        'url': f"https://news{i % 7}.example/{session}/{threat.replace(' ', '-')}/{i}",
+        'published_date': f"2026-10-{1 + i % 28:02d}"
+    } for i in range(count)]}
+
+
+def build_results(processor, rng, session, articles):
+    """One session's dashboard results, built as fetch_threat_intelligence does"""
+    threat_data = {}
+    for threat in THREATS:
+        analysis = processor.analyze_threat_sentiment(
+            make_response(rng, session, threat, articles // len(THREATS)), threat)
+        threat_data[threat] = {'raw_ref': None, 'index': ScoredArticleIndex(analysis)}
+    return {
+        'threat_data': threat_data,
+        'rollup': ThreatRollup.from_threat_data(threat_data, 3),
+        'alert_index': TopKIndex.from_threat_data(threat_data, UI_CONFIG['max_critical_alerts']),
+        'indicator_index': IndicatorIndex.from_threat_data(threat_data)
+    }
+
+
+def traced_mb():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / MB
+
+
+def run(store, processor, sessions, articles, checkpoints):
+    """Store ``sessions`` results one by one; traced MB at each checkpoint"""
+    rng = random.Random(7)
+    base = traced_mb()
+    rows = {}
+    for session in range(1, sessions + 1):
+        store.put(f"session-{session}", build_results(processor, rng, session, articles), articles)
+        if session in checkpoints:
+            rows[session] = (traced_mb() - base, store.resident_bytes() / MB)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server memory for dashboard results, unbounded vs budgeted")
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--articles', type=int, default=500, help="Articles per session")
+    parser.add_argument('--budget-mb', type=float, default=16, help="Total budget of the budgeted store")
+    args = parser.parse_args()
+
+    processor = ThreatProcessor()
+    build_results(processor, random.Random(0), 0, args.articles)   # warm the vocabulary and lexicon
+    checkpoints = sorted({1, 5, 10, args.sessions} & set(range(1, args.sessions + 1)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SQLiteCache(os.path.join(directory, 'spill.db'))
+        tracemalloc.start()
+        unbounded = SessionStore(total_budget_mb=1e6, session_budget_mb=1e6, backend=backend)
+        unbounded_rows = run(unbounded, processor, args.sessions, args.articles, checkpoints)
+        del unbounded
+        budgeted = SessionStore(total_budget_mb=args.budget_mb, session_budget_mb=args.budget_mb, backend=backend)
+        budgeted_rows = run(budgeted, processor, args.sessions, args.articles, checkpoints)
+        tracemalloc.stop()
+
+        print(f"{args.articles} articles per session; budgeted store: {args.budget_mb:g} MB in total")
+        print(f"{'Sessions':>8} {'Unbounded MB':>13} {'Measured MB':>12} {'Budgeted MB':>12} {'Resident MB':>12}")
+        for session in checkpoints:
+            traced, measured = unbounded_rows[session]
+            budget_traced, resident = budgeted_rows[session]
+            print(f"{session:>8} {traced:>13.1f} {measured:>12.1f} {budget_traced:>12.1f} {resident:>12.1f}")
+        states = [row['state'] for row in budgeted.sessions()]
+        print(f"Budgeted store: {states.count('memory')} sessions in memory, {states.count('spilled')} spilled; "
+              f"{budgeted.stats}")
+
+        # Spill and reload one session at a time: put, force it out, then get it back
+        spill_ms, reload_ms = [], []
+        store = SessionStore(total_budget_mb=1e6, session_budget_mb=1e6, backend=backend)
+        rng = random.Random(11)
+        for session in range(5):
+            token = f"latency-{session}"
+            store.put(token, build_results(processor, rng, session, args.articles), args.articles)
+            entry = store._entries[token]
+            started = time.perf_counter()
+            store._spill(token, entry)
+            spill_ms.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            assert store.get(token) is not None
+            reload_ms.append((time.perf_counter() - started) * 1000)
+        print(f"Spill {float(np.median(spill_ms)):.1f} ms, reload {float(np.median(reload_ms)):.1f} ms "
+              f"per session of {args.articles} articles (median of {len(spill_ms)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Scaling benchmark: long-history aggregates from daily sketches vs exact counting
+
+Builds a synthetic history (Zipf-distributed sources, random categories,
+scores and indicators), sketches it into daily buckets, then answers
+date-range aggregates both ways: exact Counter/set/quantile passes over
+the article rows, and merged HistorySketches buckets. Sketch queries are
+timed cold (month merges built) and warm (month merges cached). Reports
+the observed error of every approximate figure.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_sketches [--days 365] [--per-day 300]
+"""
+
+import argparse
+import itertools
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+import numpy as np
+
+from config.settings import CYBER_THREATS
+from utils.sketches import HistorySketches
+
+
+def make_history(rng, days, per_day):
+    sources = [f"outlet{i}.example" for i in range(3000)]
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(sources))))
+    threats = list(CYBER_THREATS)
+    first = date.today() - timedelta(days=days - 1)
+    articles = []
+    for day in range(days):
+        published = (first + timedelta(days=day)).isoformat()
+        for _ in range(per_day):
+            threat = rng.choice(threats)
+            articles.append({
+                'article_id': f"https://news.example/{len(articles)}",
+                'threat_keyword': threat,
+                'category': CYBER_THREATS[threat]['category'],
+                'source': rng.choices(sources, cum_weights=weights)[0],
+                'title': 'Attackers exploit flaw',
+                'summary': f"Exploitation of CVE-2026-{rng.randrange(40000):05d} traced to "
+                           f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                'published_date': published,
+                'threat_score': min(10, max(1, round(rng.gauss(5, 2))))
+            })
+    return articles, first
+
+
+def exact(articles, since, until):
+    rows = [a for a in articles if since.isoformat() <= a['published_date'][:10] <= until.isoformat()]
+    indicators = set()
+    for a in rows:
+        indicators.update(a['summary'].split()[2::3])
+    return {
+        'articles': len(rows),
+        'distinct_sources': len({a['source'] for a in rows}),
+        'distinct_indicators': len(indicators),
+        'top_sources': Counter(a['source'] for a in rows).most_common(10),
+        'categories': Counter(a['category'] for a in rows),
+        'p90': float(np.quantile([a['threat_score'] for a in rows], 0.9))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Date-range aggregates: daily sketches vs exact passes")
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--per-day', type=int, default=300)
+    args = parser.parse_args()
+
+    articles, first = make_history(random.Random(7), args.days, args.per_day)
+    sketches = HistorySketches(state_path=f"{tempfile.mkdtemp()}/sketches.json.gz")
+    started = time.perf_counter()
+    for article in articles:
+        sketches.add(article)
+    build = time.perf_counter() - started
+    print(f"Sketched {len(articles):,} articles in {build:.1f}s ({build / len(articles) * 1e6:.0f} us/article)")
+
+    print(f"{'Range':>6} {'Exact ms':>9} {'Cold ms':>8} {'Warm ms':>8} {'Sources err':>12} {'IOCs err':>9} "
+          f"{'Top-10 max over':>16} {'Cat. max over':>14} {'p90 exact/sketch':>17}")
+    last = first + timedelta(days=args.days - 1)
+    for span in (7, 30, 90, args.days):
+        since = last - timedelta(days=span - 1)
+        started = time.perf_counter()
+        truth = exact(articles, since, last)
+        exact_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        sketches.aggregate(since, last)
+        cold_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        stats = sketches.aggregate(since, last)
+        warm_ms = (time.perf_counter() - started) * 1000
+
+        true_sources = Counter(a['source'] for a in articles if since.isoformat() <= a['published_date'])
+        top_over = max(count - true_sources[source] for source, count, _ in stats['top_sources'])
+        category_over = max(count - truth['categories'][category] for category, count, _ in stats['categories'])
+        print(f"{span:>5}d {exact_ms:>9.1f} {cold_ms:>8.1f} {warm_ms:>8.1f} "
+              f"{stats['distinct_sources'] / truth['distinct_sources'] - 1:>+12.2%} "
+              f"{stats['distinct_indicators'] / truth['distinct_indicators'] - 1:>+9.2%} "
+              f"{top_over:>16,} {category_over:>14,} "
+              f"{truth['p90']:>8.1f}/{stats['score_quantiles']['p90']:<8.1f}")
+
+    started = time.perf_counter()
+    sketches.save()
+    save = time.perf_counter() - started
+    started = time.perf_counter()
+    HistorySketches.load(sketches.state_path)
+    print(f"Snapshot saved in {save:.2f}s, loaded in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
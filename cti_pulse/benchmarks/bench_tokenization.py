@@ -0,0 +1,180 @@
+"""
+Profile: per-article text-processing cost, separate string passes vs shared token IDs
+
+Runs the text work done for each fetched article both ways, stage by
+stage, on synthetic news summaries (mixed case, punctuation, URLs). Words
+are Zipf-distributed over a realistic vocabulary, the lexicon and keyword
+words of security news at the head and a long tail of rarer words, as
+generated for the clustering benchmark:
+
+- before: clean_text for sentiment, VADER splitting the cleaned string,
+  the high-impact keyword substring scan, clean_text again for the
+  clustering shingles and again for clean_summary when a card renders
+- after: one encode_batch per response, then sentiment, keyword counts,
+  shingles and clean_summary all read the token ID arrays
+
+Each stage's output is checked to be identical both ways. The corpus is
+processed twice: the first pass meets every distinct word for the first
+time, so it pays for adding it to the vocabulary and filling its columns;
+the repeat pass only meets known words. The difference is reported as the
+cost per first-seen word.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_tokenization [--articles 5000] [--batch 100] [--words 80] [--vocabulary 50000]
+"""
+
+import argparse
+import itertools
+import random
+import time
+import zlib
+
+import numpy as np
+
+from benchmarks.bench_clustering import make_vocabulary, zipf_words
+from config.settings import HIGH_IMPACT_KEYWORDS
+from utils.clustering import CampaignClusterer
+from utils.scoring import ScoringModel
+from utils.sentiment import BatchSentimentAnalyzer
+from utils.tokens import STOPWORDS, clean_text, get_vocabulary
+
+WORDS = ('critical ransomware attack hospital data breach exploit vulnerability patched systems attackers '
+         'encrypted servers demanded payment investigators said customers affected not very severe but '
+         'researchers warned the group targeted networks across Europe with stolen credentials and '
+         'phishing emails emergency patch released today global outage major compromise').split()
+PUNCTUATION = ['', '', '', ',', '.', ':', "'s", '!']
+
+
+def make_articles(rng, count, words, size):
+    vocabulary = WORDS + make_vocabulary(rng, size)
+    weights = list(itertools.accumulate(1 / (rank + 10) for rank in range(len(vocabulary))))
+    articles = []
+    for i in range(count):
+        tokens = [word + rng.choice(PUNCTUATION)
+                  for word in zipf_words(rng, vocabulary, weights, rng.randint(words // 2, words))]
+        tokens = [token.capitalize() if rng.random() < 0.1 else token for token in tokens]
+        tokens.insert(rng.randrange(len(tokens)), f"https://news.example/{i}")
+        articles.append({
+            'title': ' '.join(zipf_words(rng, vocabulary, weights, 8)).title(),
+            'summary': ' '.join(tokens)
+        })
+    return articles
+
+
+def old_shingles(text):
+    words = clean_text(text).split()
+    grams = {word for word in set(words) - STOPWORDS if len(word) > 2}
+    return np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+
+
+def before(batch, analyzer):
+    """Previous per-stage string work; returns (stage seconds, outputs)"""
+    times, out = {}, {}
+    started = time.perf_counter()
+    cleaned = [clean_text(article['summary']) for article in batch]
+    times['tokenise'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    out['sentiment'] = analyzer.score(cleaned)['compound']
+    times['sentiment'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    out['keywords'] = [sum(1 for keyword in HIGH_IMPACT_KEYWORDS if keyword in text) for text in cleaned]
+    times['keywords'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    out['shingles'] = [old_shingles(f"{article['title']} {article['summary']}") for article in batch]
+    times['shingles'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    out['clean_summary'] = [clean_text(article['summary']) for article in batch]
+    times['clean_summary'] = time.perf_counter() - started
+    return times, out
+
+
+def after(batch, analyzer, model, clusterer, vocabulary):
+    """Shared tokenisation; returns (stage seconds, outputs)"""
+    times, out = {}, {}
+    started = time.perf_counter()
+    ids, offsets = vocabulary.encode_batch([article['summary'] for article in batch])
+    arrays = [ids[offsets[i]:offsets[i + 1]] for i in range(len(batch))]
+    times['tokenise'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    out['sentiment'] = analyzer.score_tokens(ids, offsets)['compound']
+    times['sentiment'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    out['keywords'] = model.keyword_counts(arrays).tolist()
+    times['keywords'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    out['shingles'] = [clusterer.shingles(np.concatenate((vocabulary.encode(article['title']), tokens)))
+                       for article, tokens in zip(batch, arrays)]
+    times['shingles'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    out['clean_summary'] = [vocabulary.decode(tokens) for tokens in arrays]
+    times['clean_summary'] = time.perf_counter() - started
+    return times, out
+
+
+def run(articles, size, analyzer, model, clusterer, vocabulary):
+    """Both ways over every batch, checking outputs; returns summed stage seconds per way"""
+    totals = {'before': {}, 'after': {}}
+    for start in range(0, len(articles), size):
+        batch = articles[start:start + size]
+        # After first: the string path's sentiment also encodes, so it would add the batch's new words
+        new_times, new_out = after(batch, analyzer, model, clusterer, vocabulary)
+        old_times, old_out = before(batch, analyzer)
+        assert np.array_equal(old_out['sentiment'], new_out['sentiment'])
+        assert old_out['keywords'] == new_out['keywords']
+        assert all(set(a.tolist()) == set(b.tolist()) for a, b in zip(old_out['shingles'], new_out['shingles']))
+        assert old_out['clean_summary'] == new_out['clean_summary']
+        for name, times in (('before', old_times), ('after', new_times)):
+            for stage, seconds in times.items():
+                totals[name][stage] = totals[name].get(stage, 0.0) + seconds
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-article text processing: string passes vs shared token IDs")
+    parser.add_argument('--articles', type=int, default=5000)
+    parser.add_argument('--batch', type=int, default=100, help="Articles per API response")
+    parser.add_argument('--words', type=int, default=80, help="Maximum words per summary")
+    parser.add_argument('--vocabulary', type=int, default=50000, help="Distinct words the summaries draw from")
+    args = parser.parse_args()
+
+    articles = make_articles(random.Random(7), args.articles, args.words, args.vocabulary)
+    vocabulary = get_vocabulary()
+    analyzer = BatchSentimentAnalyzer(vocabulary)
+    model = ScoringModel()
+    clusterer = CampaignClusterer()
+
+    known = len(vocabulary)
+    first = run(articles, args.batch, analyzer, model, clusterer, vocabulary)
+    first_seen = len(vocabulary) - known
+    repeat = run(articles, args.batch, analyzer, model, clusterer, vocabulary)
+    assert len(vocabulary) == known + first_seen
+
+    def per_article(stages):
+        return {stage: seconds / len(articles) * 1e6 for stage, seconds in stages.items()}
+
+    old = per_article({stage: min(first['before'][stage], repeat['before'][stage]) for stage in first['before']})
+    cold, warm = per_article(first['after']), per_article(repeat['after'])
+    print(f"{len(articles):,} articles in responses of {args.batch}; all outputs identical both ways")
+    print(f"{'Stage':<14} {'Before us':>10} {'First pass us':>14} {'Change':>8} {'Repeat us':>10} {'Change':>8}")
+    for stage, seconds in itertools.chain(old.items(), [('total', sum(old.values()))]):
+        new = [sum(times.values()) if stage == 'total' else times[stage] for times in (cold, warm)]
+        print(f"{stage:<14} {seconds:>10.1f} {new[0]:>14.1f} {new[0] / seconds - 1:>+8.0%} "
+              f"{new[1]:>10.1f} {new[1] / seconds - 1:>+8.0%}")
+
+    extra = sum(first['after'].values()) - sum(repeat['after'].values())
+    print(f"First-seen words: {first_seen:,} ({first_seen / len(articles):.1f} per article), "
+          f"{extra / first_seen * 1e6:.1f} us each (first pass minus repeat)")
+    tokens = sum(len(clean_text(article['summary']).split()) for article in articles) / len(articles)
+    print(f"Vocabulary: {len(vocabulary):,} words; token IDs kept per article: {tokens * 4 + 33:.0f} bytes")
+
+
+if __name__ == '__main__':
+    main()
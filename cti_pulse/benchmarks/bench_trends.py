@@ -0,0 +1,92 @@
+"""
+Scaling benchmark: streaming trend detection cost per new article
+
+Streams synthetic daily coverage (Poisson-like volume per threat, with a
+few injected surges) into TrendDetector, timed in slices, so the
+per-article cost can be checked as history grows. Also reports how many
+injected surges were flagged, the snapshot size and how long restoring
+it takes compared with replaying the whole stream.
+
+Run from the cti_pulse directory:
+    python -m benchmarks.bench_trends [--days 365]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date
+
+from config.settings import CYBER_THREATS
+from utils.trends import TrendDetector
+
+SOURCES = ['bleepingcomputer.com', 'krebsonsecurity.com', 'darkreading.com', 'securityweek.com',
+           'therecord.media', 'thehackernews.com', 'theregister.com', 'zdnet.com', 'wired.com', 'reuters.com']
+
+
+def make_stream(rng, days, surges):
+    """Articles in arrival order, plus the set of injected (threat, day) surges"""
+    threats = list(CYBER_THREATS)
+    rates = {threat: rng.uniform(3, 15) for threat in threats}
+    start = date.today().toordinal() - days
+    injected = {(rng.choice(threats), rng.randrange(30, days)) for _ in range(surges)}
+
+    stream = []
+    for day in range(days):
+        for threat in threats:
+            count = sum(1 for _ in range(int(rates[threat] * 2)) if rng.random() < 0.5)
+            if (threat, day) in injected:
+                count += int(rates[threat] * 3) + 5
+            for _ in range(count):
+                stream.append({
+                    'article_id': f"https://news.example/{len(stream)}",
+                    'threat_keyword': threat,
+                    'source': rng.choice(SOURCES),
+                    # Some coverage arrives a day late
+                    'published_date': date.fromordinal(start + day - (rng.random() < 0.1)).isoformat(),
+                    'threat_score': rng.randint(2, 8)
+                })
+    return stream, injected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming trend detection cost per article vs history size")
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--surges', type=int, default=20)
+    parser.add_argument('--slices', type=int, default=5)
+    args = parser.parse_args()
+
+    stream, injected = make_stream(random.Random(7), args.days, args.surges)
+    state_path = os.path.join(tempfile.mkdtemp(), 'trends.json')
+    detector = TrendDetector(state_path=state_path)
+
+    print(f"{'Articles':>9} {'us/article':>11} {'Series':>7} {'Events':>7}")
+    size = len(stream) // args.slices
+    replay = 0.0
+    for start in range(0, len(stream), size):
+        batch = stream[start:start + size]
+        started = time.perf_counter()
+        for article in batch:
+            detector.observe(article)
+        elapsed = time.perf_counter() - started
+        replay += elapsed
+        print(f"{start + len(batch):>9,} {elapsed / len(batch) * 1e6:>11.1f} "
+              f"{len(detector.series):>7,} {len(detector.events):>7,}")
+
+    flagged = {(event['name'], event['day']) for event in detector.anomalies('threat') if event['kind'] == 'volume'}
+    first_day = date.today().toordinal() - args.days
+    hits = sum(1 for threat, day in injected if (threat, date.fromordinal(first_day + day).isoformat()) in flagged)
+    print(f"Injected surges flagged: {hits}/{len(injected)}  "
+          f"other volume events: {len(flagged) - hits}")
+
+    detector.save()
+    started = time.perf_counter()
+    TrendDetector.load(state_path)
+    restore = time.perf_counter() - started
+    print(f"Snapshot {os.path.getsize(state_path) / 1024:.0f} KiB, restored in {restore * 1000:.1f} ms "
+          f"vs {replay * 1000:.0f} ms to replay {len(stream):,} articles")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,7 +13,10 @@ class AIAssistant:
         ai_col1, ai_col2 = st.columns([1, 1])
 
         with ai_col1:
-            ai_severity_filter = st.slider("🚨 AI Severity Filter", 1, 10, 3, key="ai_severity")
+            ai_severity_filter = st.slider(
+                "🚨 AI Severity Filter", 1, 10, 3, key="ai_severity",
+                on_change=lambda: st.session_state.update(severity_filter=st.session_state.ai_severity)
+            )
         with ai_col2:
             ai_articles_per_threat = st.slider("📄 AI Articles per threat", 5, 100, 15, key="ai_articles")
 
@@ -0,0 +1,155 @@
+import json
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from assets.templates import (get_alert_card_template, get_threat_article_template, get_article_details_template,
+                              get_cluster_related_template)
+from assets.styles import get_severity_color_class, get_severity_emoji
+from config.settings import UI_CONFIG
+from utils.attack_tagger import get_attack_tagger
+
+
+def _compact(fragment):
+    """Strip template indentation and newlines so fragments concatenate into one HTML block"""
+    return "".join(line.strip() for line in fragment.splitlines())
+
+
+class FragmentCache:
+    """Process-wide LRU of rendered card HTML, keyed by article id and display state
+
+    Cards depend only on the (immutable) scored article and its position,
+    so reruns and other sessions showing the same article reuse the string.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or UI_CONFIG['fragment_cache_size']
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is not None:
+                self._entries.move_to_end(key)
+                return fragment
+
+        fragment = _compact(render())
+        with self._lock:
+            self._entries[key] = fragment
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fragment
+
+
+_fragments = FragmentCache()
+
+
+class CardRenderer:
+    """Render pages of article and alert cards as single escaped HTML blocks
+
+    One ``st.markdown`` call per page replaces one call (plus a details
+    button and columns) per card, cutting the element count and rerun
+    payload for large tabs. Details use a native ``<details>`` element, so
+    expanding a card needs no rerun.
+    """
+
+    def __init__(self, format_date, fragments=None):
+        self.format_date = format_date
+        self.fragments = fragments or _fragments
+
+    def article_card(self, article, index):
+        key = ('article', article['article_id'], article['threat_keyword'], index, article['threat_score'])
+        return self.fragments.get_or_render(key, lambda: self._render_article(article, index))
+
+    def cluster_card(self, members, index):
+        """Card for the top article of an incident, listing the other reports"""
+        lead = members[0]
+        # Sources of the reports shown, not of every article the cluster ever took in
+        source_count = len({article['source'] for article in members})
+        key = ('cluster', lead['article_id'], lead['threat_keyword'], index, lead['threat_score'],
+               tuple(article['article_id'] for article in members[1:]), source_count)
+        return self.fragments.get_or_render(
+            key, lambda: self._render_article(lead, index, self._render_related(members[1:], source_count)))
+
+    def alert_card(self, article):
+        key = ('alert', article['article_id'], article['threat_keyword'], article['threat_score'])
+        return self.fragments.get_or_render(key, lambda: self._render_alert(article))
+
+    def _render_related(self, others, source_count):
+        return get_cluster_related_template(source_count, [
+            (article['title'], article['url'], article['source'],
+             self.format_date(article['published_date']), f"{article['threat_score']:.1f}")
+            for article in others
+        ])
+
+    def _render_article(self, article, index, related=""):
+        clean_summary = article['clean_summary']
+        raw_data = {
+            'clean_summary': clean_summary[:200] + "..." if len(clean_summary) > 200 else clean_summary,
+            'sentiment_scores': {
+                'compound': article['sentiment_compound'],
+                'negative': article['sentiment_neg']
+            },
+            'metadata': {
+                'source': article['source'],
+                'published_date': article['published_date'],
+                'threat_keyword': article['threat_keyword']
+            }
+        }
+        details = get_article_details_template(
+            article['sentiment_compound'],
+            article['sentiment_neg'],
+            article['category'],
+            article['threat_score'],
+            article['threat_keyword'],
+            list(article.get('highlights') or ())[:3],  # Show top 3 highlights
+            json.dumps(raw_data),
+            article.get('indicators') or (),
+            [get_attack_tagger().technique_label(t) for t in article.get('techniques') or ()]
+        )
+        return get_threat_article_template(
+            index,
+            article['title'],
+            f"{article['threat_score']:.1f}",
+            self.format_date(article['published_date']),
+            article['source'],
+            article['summary'],
+            get_severity_color_class(article['threat_score']),
+            get_severity_emoji(article['threat_score']),
+            details,
+            related
+        )
+
+    def _render_alert(self, article):
+        return get_alert_card_template(
+            article['title'],
+            f"{article['threat_score']:.1f}",
+            article['category'],
+            article['source'],
+            article['summary'],
+            self.format_date(article['published_date']),
+            get_severity_color_class(article['threat_score']),
+            get_severity_emoji(article['threat_score'])
+        )
+
+    def render_articles(self, articles, start_index=1):
+        """Render a page of article cards as one markdown element"""
+        page = "".join(self.article_card(article, i) for i, article in enumerate(articles, start_index))
+        st.markdown(f'<div class="card-page">{page}</div>', unsafe_allow_html=True)
+
+    def render_groups(self, groups, start_index=1):
+        """Render a page of incident groups (lists of articles, best first) as one markdown element"""
+        cards = []
+        for i, members in enumerate(groups, start_index):
+            if len(members) == 1:
+                cards.append(self.article_card(members[0], i))
+            else:
+                cards.append(self.cluster_card(members, i))
+        st.markdown(f'<div class="card-page">{"".join(cards)}</div>', unsafe_allow_html=True)
+
+    def render_alerts(self, articles):
+        """Render alert cards as one markdown element"""
+        page = "".join(self.alert_card(article) for article in articles)
+        st.markdown(f'<div class="card-page">{page}</div>', unsafe_allow_html=True)
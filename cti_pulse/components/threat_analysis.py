@@ -1,15 +1,22 @@
 import streamlit as st
 import numpy as np
 from datetime import datetime
-from assets.templates import get_threat_article_template
-from assets.styles import get_severity_color_class, get_severity_emoji
+from components.card_renderer import CardRenderer
+from config.settings import UI_CONFIG
 
 
 class ThreatAnalysis:
     """Detailed threat analysis component"""
 
-    def render_detailed_analysis(self, all_threat_data):
-        """Render detailed threat analysis for each threat type"""
+    def __init__(self):
+        self.cards = CardRenderer(self._format_date)
+
+    def render_detailed_analysis(self, all_threat_data, rollup=None, clusterer=None):
+        """Render detailed threat analysis for each threat type
+
+        With a ``clusterer``, articles covering the same incident render as
+        one card listing the other outlets' reports.
+        """
         st.header("🔍 Detailed Threat Analysis")
 
         # Use tabs instead of nested expanders
@@ -20,29 +27,42 @@ class ThreatAnalysis:
             for tab, (threat_name, data) in zip(tabs, all_threat_data.items()):
                 with tab:
                     if data['analysis']:
-                        self._render_threat_content(threat_name, data)
+                        self._render_threat_content(threat_name, data, rollup, clusterer)
 
-    def _render_threat_content(self, threat_name, data):
+    def _render_threat_content(self, threat_name, data, rollup=None, clusterer=None):
         """Render content for a specific threat"""
         threat_articles = data['analysis']
 
         # Threat-specific metrics
-        self._render_threat_metrics(threat_articles)
-
-        # Article list with details
-        st.subheader(f"📄 All {len(threat_articles)} Articles:")
-
-        # Use session state to track which articles have expanded details
-        if 'expanded_articles' not in st.session_state:
-            st.session_state.expanded_articles = set()
+        self._render_threat_metrics(threat_articles, rollup.threat_averages(threat_name) if rollup else None)
 
-        for i, article in enumerate(threat_articles, 1):
-            self._render_article_with_details(article, i, threat_name)
-
-    def _render_threat_metrics(self, threat_articles):
+        # Article list with details, one HTML block per page
+        if clusterer is not None:
+            groups = [members for _, members in clusterer.group(threat_articles)]
+            st.subheader(f"📄 All {len(threat_articles)} Articles in {len(groups)} Incidents:")
+        else:
+            groups = [[article] for article in threat_articles]
+            st.subheader(f"📄 All {len(threat_articles)} Articles:")
+
+        page_size = UI_CONFIG['cards_per_page']
+        pages = (len(groups) + page_size - 1) // page_size
+        page = 1
+        if pages > 1:
+            page = st.selectbox(
+                "Page", range(1, pages + 1), key=f"page_{threat_name}",
+                format_func=lambda p: f"Page {p} of {pages} "
+                                      f"(cards {(p - 1) * page_size + 1}-{min(p * page_size, len(groups))})"
+            )
+        start = (page - 1) * page_size
+        self.cards.render_groups(groups[start:start + page_size], start_index=start + 1)
+
+    def _render_threat_metrics(self, threat_articles, averages=None):
         """Render metrics for a specific threat type"""
-        avg_sentiment = np.mean([a['sentiment_compound'] for a in threat_articles])
-        avg_severity = np.mean([a['threat_score'] for a in threat_articles])
+        if averages is not None:
+            avg_severity, avg_sentiment = averages
+        else:
+            avg_sentiment = np.mean([a['sentiment_compound'] for a in threat_articles])
+            avg_severity = np.mean([a['threat_score'] for a in threat_articles])
         recent_count = sum(1 for a in threat_articles if self._is_recent(a['published_date']))
 
         col1, col2, col3, col4 = st.columns(4)
@@ -97,85 +117,6 @@ class ThreatAnalysis:
         </div>
         """, unsafe_allow_html=True)
 
-    def _render_article_with_details(self, article, index, threat_name):
-        """Render article with expandable details"""
-        severity_class = get_severity_color_class(article['threat_score'])
-        emoji = get_severity_emoji(article['threat_score'])
-        formatted_date = self._format_date(article['published_date'])
-
-        # Unique key for this article
-        article_key = f"{threat_name}_{index}_{hash(article['title'])}"
-
-        # Main article display
-        st.markdown(get_threat_article_template(
-            index,
-            article['title'],
-            f"{article['threat_score']:.1f}",
-            formatted_date,
-            article['source'],
-            article['summary'],
-            severity_class,
-            emoji
-        ), unsafe_allow_html=True)
-
-        # Toggle button for details
-        col1, col2 = st.columns([2, 3])
-        with col1:
-            if st.button(
-                    "🔍 Show Details" if article_key not in st.session_state.expanded_articles else "🔽 Hide Details",
-                    key=f"toggle_{article_key}",
-                    use_container_width=True
-            ):
-                if article_key in st.session_state.expanded_articles:
-                    st.session_state.expanded_articles.remove(article_key)
-                else:
-                    st.session_state.expanded_articles.add(article_key)
-                st.rerun()
-
-        # Show details if expanded
-        if article_key in st.session_state.expanded_articles:
-            with st.container():
-                st.markdown("---")
-                self._render_article_details(article)
-                st.markdown("---")
-
-    def _render_article_details(self, article):
-        """Render detailed information for a single article"""
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.markdown("**📊 Sentiment Analysis:**")
-            st.write(f"• Compound Score: {article['sentiment_compound']:.3f}")
-            st.write(f"• Negative: {article['sentiment_neg']:.3f}")
-            st.write(f"• Category: {article['category']}")
-
-        with col2:
-            st.markdown("**📈 Threat Scoring:**")
-            st.write(f"• Final Score: {article['threat_score']:.1f}/10")
-            st.write(f"• Threat Type: {article['threat_keyword']}")
-
-        # Highlights if available
-        if article.get('highlights'):
-            st.markdown("**🔍 Key Highlights:**")
-            for highlight in article['highlights'][:3]:  # Show top 3 highlights
-                st.markdown(f"• *{highlight}*")
-
-        # Raw summary for debugging
-        if st.checkbox(f"Show raw data", key=f"raw_{hash(article['title'])}"):
-            st.json({
-                'clean_summary': article['clean_summary'][:200] + "..." if len(article['clean_summary']) > 200 else
-                article['clean_summary'],
-                'sentiment_scores': {
-                    'compound': article['sentiment_compound'],
-                    'negative': article['sentiment_neg']
-                },
-                'metadata': {
-                    'source': article['source'],
-                    'published_date': article['published_date'],
-                    'threat_keyword': article['threat_keyword']
-                }
-            })
-
     def _format_date(self, date_str):
         """Format date string for display"""
         if date_str == 'Date not available':
@@ -1,15 +1,22 @@
 import streamlit as st
-import numpy as np
+import pandas as pd
 import base64
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from assets.templates import *
-from assets.styles import get_severity_color_class, get_severity_emoji
-from config.settings import CYBER_THREATS
+from components.card_renderer import CardRenderer
+from config.settings import CYBER_THREATS, FANOUT_CONFIG, ADAPTIVE_FETCH_CONFIG, UI_CONFIG
 from utils.data_processor import generate_executive_summary
+from utils.rollups import ThreatRollup, CRITICAL_SCORE
+from utils.article_index import TopKIndex
+from utils.attack_tagger import get_attack_tagger
 
 class UIComponents:
     """UI Components for the CyberPulse application"""
 
+    def __init__(self):
+        self.cards = CardRenderer(self._format_date)
+
     def render_header(self):
         """Render the main application header"""
         try:
@@ -42,8 +49,24 @@ class UIComponents:
         )
 
         # Settings
-        severity_filter = st.sidebar.slider("🚨 Minimum Severity", 1, 10, 3)
+        severity_filter = st.sidebar.slider(
+            "🚨 Minimum Severity", 1, 10, 3, key="sidebar_severity",
+            on_change=lambda: st.session_state.update(severity_filter=st.session_state.sidebar_severity)
+        )
         articles_per_threat = st.sidebar.slider("📄 Articles per threat", 5, 100, 15)
+        attack_tactics = st.sidebar.multiselect(
+            "🧭 ATT&CK Tactics:", get_attack_tagger().tactic_names(), default=[], key="attack_tactics",
+            help="Only show articles tagged with techniques from these tactics"
+        )
+        fanout = st.sidebar.checkbox(
+            "🔀 Synonym fan-out", value=FANOUT_CONFIG['enabled'],
+            help="Also search each threat's synonyms concurrently and merge the results"
+        )
+        adaptive = st.sidebar.checkbox(
+            "🎚️ Adaptive fetch", value=ADAPTIVE_FETCH_CONFIG['enabled'],
+            help="Fetch in growing steps and stop once enough articles pass the severity filter; "
+                 "'Articles per threat' becomes the ceiling"
+        )
 
         # Buttons
         fetch_button = st.sidebar.button("🔍 Fetch Intelligence", type="primary")
@@ -57,9 +80,65 @@ class UIComponents:
             'selected_threats': selected_threats,
             'severity_filter': severity_filter,
             'articles_per_threat': articles_per_threat,
+            'fanout': fanout,
+            'adaptive': adaptive,
+            'attack_tactics': attack_tactics,
             'should_process': fetch_button
         }
 
+    def render_emerging_terms(self, emerging):
+        """Sidebar list of emerging summary terms; clicking one asks the AI assistant about it"""
+        terms = emerging.emerging()
+        start, end = emerging.window()
+
+        st.sidebar.markdown("---")
+        st.sidebar.subheader("🌱 Emerging Terms")
+        if not terms:
+            st.sidebar.caption("No terms are standing out against the background window yet.")
+            return
+        st.sidebar.caption(f"Summaries published {start:%b %d}–{end:%b %d} vs the "
+                           f"{emerging.background_days} days before")
+
+        for entry in terms:
+            st.sidebar.button(
+                f"{entry['term']} · {entry['count']} articles · ×{entry['lift']}",
+                key=f"emerging_{entry['term']}",
+                help=f"Background: {entry['background']} articles. Click to ask the AI assistant.",
+                on_click=self._ask_about_term, args=(entry,)
+            )
+
+    @staticmethod
+    def _ask_about_term(entry):
+        """Put a query about an emerging term into the AI query box (runs before the rerun)"""
+        threats = " and ".join(entry['threats']) or "cyber threat"
+        st.session_state.ai_query_input = f"What {threats} activity mentions {entry['term']}?"
+
+    def render_session_memory(self, store, token):
+        """Render the per-session results footprint held by this server process"""
+        sessions = store.sessions()
+        with st.sidebar.expander("🧮 Session Memory", expanded=False):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Sessions", len(sessions))
+            with col2:
+                st.metric("In Memory", f"{store.resident_bytes() / 2**20:.2f} MB",
+                          help=f"Budget {store.total_budget / 2**20:.0f} MB in total, "
+                               f"{store.session_budget / 2**20:.0f} MB per session")
+            if not sessions:
+                st.caption("No session has fetched results yet.")
+                return
+
+            st.dataframe(pd.DataFrame([{
+                'Session': row['token'][:8] + (' (you)' if row['token'] == token else ''),
+                'MB': round(row['bytes'] / 2**20, 2),
+                'Articles': row['articles'],
+                'State': row['state'],
+                'Idle': f"{row['idle'] / 60:.0f} min"
+            } for row in sessions]), hide_index=True)
+            stats = store.stats
+            st.caption(f"{stats['stored']} stored · {stats['spilled']} spilled · {stats['reloaded']} reloaded · "
+                       f"{stats['evicted']} evicted")
+
     def _test_api_connection(self):
         """Test API connection"""
         from utils.api_client import APIClient
@@ -74,9 +153,9 @@ class UIComponents:
         else:
             st.sidebar.error("❌ API connection failed")
 
-    def render_executive_summary(self, all_threat_data):
+    def render_executive_summary(self, all_threat_data, rollup=None, trend_detector=None):
         """Render executive summary"""
-        summary_data = generate_executive_summary(all_threat_data)
+        summary_data = generate_executive_summary(all_threat_data, rollup, trend_detector)
 
         threat_level_emoji = "🔴 CRITICAL" if summary_data['high_severity'] > 5 else \
             "🟡 ELEVATED" if summary_data['high_severity'] > 0 else "🟢 NORMAL"
@@ -86,16 +165,18 @@ class UIComponents:
             summary_data['total_threats'],
             summary_data['high_severity'],
             summary_data['top_threat'],
-            summary_data['avg_sentiment']
+            summary_data['avg_sentiment'],
+            summary_data['surging']
         ), unsafe_allow_html=True)
 
-    def render_key_metrics(self, all_threat_data):
+    def render_key_metrics(self, all_threat_data, rollup=None):
         """Render key metrics cards"""
-        all_articles = [article for data in all_threat_data.values() for article in data['analysis']]
+        if rollup is None:
+            rollup = ThreatRollup.from_view(all_threat_data)
 
-        total_articles = sum(data['article_count'] for data in all_threat_data.values())
-        high_severity_count = sum(1 for article in all_articles if article['threat_score'] >= 7)
-        avg_score = np.mean([a['threat_score'] for a in all_articles]) if all_articles else 0
+        total_articles = rollup.total
+        high_severity_count = rollup.critical
+        avg_score = rollup.avg_score
 
         col1, col2, col3, col4 = st.columns(4)
 
@@ -110,34 +191,91 @@ class UIComponents:
                 time_str = st.session_state.last_update.strftime("%H:%M:%S")
                 st.markdown(get_metric_card_template(time_str, "Last Updated", "🕐"), unsafe_allow_html=True)
 
-    def render_critical_alerts(self, all_threat_data):
-        """Render critical threat alerts"""
+    def render_critical_alerts(self, all_threat_data, alert_index=None, min_severity=None):
+        """Render the highest scoring critical alerts across all threats
+
+        Reads the precomputed global ``alert_index`` when given; otherwise
+        merges the view's per-threat lists, which are already sorted.
+        """
         st.header("🚨 Critical Threat Alerts")
 
-        all_articles = [article for data in all_threat_data.values() for article in data['analysis']]
-        critical_threats = [a for a in all_articles if a['threat_score'] >= 7]
+        if alert_index is None:
+            alert_index = TopKIndex(UI_CONFIG['max_critical_alerts'],
+                                    {threat: data['analysis'] for threat, data in all_threat_data.items()})
+        critical_threats = alert_index.top(max(CRITICAL_SCORE, min_severity or CRITICAL_SCORE))
 
         if critical_threats:
-            for threat in critical_threats[:5]:  # Show top 5 critical
-                severity_class = get_severity_color_class(threat['threat_score'])
-                emoji = get_severity_emoji(threat['threat_score'])
-
-                # Format date
-                formatted_date = self._format_date(threat['published_date'])
-
-                st.markdown(get_alert_card_template(
-                    threat['title'],
-                    f"{threat['threat_score']:.1f}",
-                    threat['category'],
-                    threat['source'],
-                    threat['summary'],
-                    formatted_date,
-                    severity_class,
-                    emoji
-                ), unsafe_allow_html=True)
+            self.cards.render_alerts(critical_threats)
         else:
             st.info("🟢 No critical threats detected at current severity threshold.")
 
+    def render_indicators(self, indicator_index, min_severity=None):
+        """Render indicators extracted from articles at or above the severity threshold"""
+        min_severity = min_severity or 0
+        rows = []
+        for kind, value, articles in indicator_index.top(len(indicator_index)):
+            articles = [a for a in articles if a['threat_score'] >= min_severity]
+            if articles:
+                rows.append({
+                    'Type': kind.upper(),
+                    'Indicator': value,
+                    'Articles': len(articles),
+                    'Max Score': max(a['threat_score'] for a in articles),
+                    'Threats': ", ".join(sorted({a['threat_keyword'] for a in articles}))
+                })
+            if len(rows) >= UI_CONFIG['max_indicators_display']:
+                break
+
+        with st.expander(f"🧬 Extracted Indicators ({len(rows)})", expanded=False):
+            if rows:
+                st.dataframe(pd.DataFrame(rows), hide_index=True)
+            else:
+                st.info("No CVEs, IPs, domains, URLs or hashes found at current severity threshold.")
+
+    def render_history_analytics(self, sketches):
+        """Render approximate aggregates over a chosen range of the stored history"""
+        first_day, last_day = sketches.days()
+        with st.expander("🗄️ History Analytics", expanded=False):
+            if first_day is None:
+                st.info("No dated articles in the history yet.")
+                return
+
+            default_start = max(first_day, last_day - timedelta(days=29))
+            selected = st.date_input("Published between", (default_start, last_day),
+                                     min_value=first_day, max_value=last_day, key="history_range")
+            if not isinstance(selected, (tuple, list)) or len(selected) != 2:
+                st.caption("Select an end date.")
+                return
+
+            started = time.perf_counter()
+            stats = sketches.aggregate(selected[0], selected[1])
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("📰 Articles", f"{stats['articles']:,}")
+            with col2:
+                st.metric("🌐 Sources", f"≈{stats['distinct_sources']:,}")
+            with col3:
+                st.metric("🧬 Indicators", f"≈{stats['distinct_indicators']:,}")
+            with col4:
+                median = stats['score_quantiles']['p50']
+                st.metric("🎯 Median Severity", f"{median:.1f}/10" if median is not None else "—")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.dataframe(pd.DataFrame([{'Source': source, 'Articles': count, '±': error}
+                                           for source, count, error in stats['top_sources']]), hide_index=True)
+            with col2:
+                st.dataframe(pd.DataFrame([{'Category': category, 'Articles': count, '±': error}
+                                           for category, count, error in stats['categories']]), hide_index=True)
+
+            quantiles = ", ".join(f"{name} {value:.1f}" for name, value in stats['score_quantiles'].items()
+                                  if value is not None)
+            st.caption(f"Severity {quantiles}. Merged from daily sketches in {elapsed_ms:.1f} ms: distinct counts "
+                       f"±{stats['distinct_error']:.1%} (one standard error), article counts over by at most "
+                       f"the ± shown (≤ {stats['heavy_hitter_error']}).")
+
     def render_welcome_screen(self):
         """Render welcome screen when no data is available"""
         # Create welcome content using native Streamlit components instead of HTML template
@@ -2,19 +2,24 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from collections import Counter
 import pandas as pd
 import time
+from utils.rollups import ThreatRollup
+from utils.attack_tagger import get_attack_tagger
+from config.settings import ATTACK_CONFIG, TREND_CONFIG
+from assets.templates import get_surging_badges_template
 
 
 class ThreatVisualizations:
     """Threat visualization components"""
 
-    def render_threat_charts(self, all_threat_data):
+    def render_threat_charts(self, all_threat_data, rollup=None):
         """Render all threat visualization charts"""
         st.header("📈 Threat Intelligence Visualizations")
 
         all_articles = [article for data in all_threat_data.values() for article in data['analysis']]
+        if rollup is None:
+            rollup = ThreatRollup(all_articles)
 
         if not all_articles:
             st.warning("📭 No articles found matching your severity filter. Try lowering the minimum severity level.")
@@ -24,21 +29,18 @@ class ThreatVisualizations:
         timestamp = int(time.time() * 1000)
 
         # Render severity distribution chart
-        self._render_severity_distribution(all_articles, timestamp)
+        self._render_severity_distribution(rollup, timestamp)
 
         # Full width charts
         self._render_timeline_chart(all_articles, timestamp)
-        self._render_source_analysis(all_articles, timestamp)
+        self._render_source_analysis(rollup, timestamp)
+        self._render_attack_techniques(rollup, timestamp)
 
-    def _render_severity_distribution(self, all_articles, timestamp):
+    def _render_severity_distribution(self, rollup, timestamp):
         """Render severity distribution bar chart"""
-        severity_ranges = ['Low (1-3)', 'Medium (4-6)', 'High (7-8)', 'Critical (9-10)']
-        severity_counts = [
-            sum(1 for a in all_articles if 1 <= a['threat_score'] <= 3),
-            sum(1 for a in all_articles if 4 <= a['threat_score'] <= 6),
-            sum(1 for a in all_articles if 7 <= a['threat_score'] <= 8),
-            sum(1 for a in all_articles if 9 <= a['threat_score'] <= 10)
-        ]
+        distribution = rollup.severity_distribution()
+        severity_ranges = list(distribution.keys())
+        severity_counts = list(distribution.values())
 
         # Custom colors for severity levels
         colors = ['#2ECC71', '#F39C12', '#E67E22', '#E74C3C']
@@ -126,16 +128,12 @@ class ThreatVisualizations:
         else:
             st.info("📅 No timeline data available - dates not properly formatted in source data.")
 
-    def _render_source_analysis(self, all_articles, timestamp):
+    def _render_source_analysis(self, rollup, timestamp):
         """Render source analysis chart"""
         st.subheader("📰 Top Threat Intelligence Sources")
 
-        # Count articles by source
-        sources = [article['source'] for article in all_articles if article['source'] != 'Source not available']
-        source_counts = Counter(sources)
-
-        # Get top 10 sources
-        top_sources = dict(source_counts.most_common(10))
+        # Get top 10 sources from the precomputed counts
+        top_sources = rollup.top_sources(10, exclude=('Source not available',))
 
         if top_sources:
             # Create horizontal bar chart
@@ -164,4 +162,83 @@ class ThreatVisualizations:
             st.plotly_chart(fig_sources, use_container_width=True, key=f"sources_{timestamp}")
             st.markdown('</div>', unsafe_allow_html=True)
         else:
-            st.info("📰 No source data available for analysis.")
\ No newline at end of file
+            st.info("📰 No source data available for analysis.")
+
+    def _render_attack_techniques(self, rollup, timestamp):
+        """Render ATT&CK technique frequency chart, coloured by tactic"""
+        st.subheader("🧭 MITRE ATT&CK Techniques")
+
+        top_techniques = rollup.top_techniques(ATTACK_CONFIG['chart_techniques'])
+
+        if top_techniques:
+            tagger = get_attack_tagger()
+            df = pd.DataFrame([{
+                'technique': tagger.technique_label(technique_id),
+                'tactic': (tagger.tactics_for((technique_id,)) or ('Unknown',))[0],
+                'articles': count
+            } for technique_id, count in reversed(list(top_techniques.items()))])
+
+            fig_techniques = px.bar(
+                df,
+                x='articles',
+                y='technique',
+                color='tactic',
+                orientation='h',
+                text='articles',
+                title="🎯 Techniques Observed in Coverage",
+                labels={'articles': 'Number of Articles', 'technique': 'Technique', 'tactic': 'Tactic'}
+            )
+
+            fig_techniques.update_layout(
+                height=400,
+                title_font_size=16,
+                yaxis={'categoryorder': 'total ascending'},
+                margin=dict(l=250)  # Add left margin for long technique names
+            )
+
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+            st.plotly_chart(fig_techniques, use_container_width=True, key=f"attack_{timestamp}")
+            st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            st.info("🧭 No ATT&CK techniques recognised in the current articles.")
+
+    def render_trends(self, detector):
+        """Render surging badges and the anomaly timeline from the streaming detector"""
+        st.subheader("🔥 Trends & Anomalies")
+
+        surging_threats = detector.surging('threat')
+        surging_sources = detector.surging('source')
+        if surging_threats:
+            st.markdown(get_surging_badges_template("Surging threats", surging_threats), unsafe_allow_html=True)
+        if surging_sources:
+            st.markdown(get_surging_badges_template("Surging sources", surging_sources), unsafe_allow_html=True)
+        if not surging_threats and not surging_sources:
+            st.caption("No threat or source is currently above its usual daily volume.")
+
+        events = detector.anomalies()
+        if detector.newest is not None:
+            cutoff = (pd.Timestamp.fromordinal(detector.newest)
+                      - pd.Timedelta(days=TREND_CONFIG['timeline_days'])).date().isoformat()
+            events = [event for event in events if event['day'] >= cutoff]
+
+        if events:
+            df = pd.DataFrame(events)
+            df['label'] = df['series'] + ': ' + df['name']
+            fig_anomalies = px.scatter(
+                df,
+                x='day',
+                y='label',
+                size='z',
+                color='kind',
+                hover_data={'value': True, 'baseline': True, 'z': True, 'label': False},
+                title="⚡ Anomaly Timeline",
+                labels={'day': 'Day', 'label': 'Series', 'kind': 'Spike in',
+                        'value': 'Observed', 'baseline': 'Baseline', 'z': 'Deviations'}
+            )
+            fig_anomalies.update_layout(height=400, title_font_size=16, margin=dict(l=200))
+
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+            st.plotly_chart(fig_anomalies, use_container_width=True, key=f"anomalies_{int(time.time() * 1000)}")
+            st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            st.info("⚡ No volume or severity anomalies recorded yet; baselines need a few days of history.")
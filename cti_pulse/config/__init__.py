@@ -5,11 +5,29 @@ Contains configuration settings and constants
 
 from .settings import (
     API_CONFIG,
+    ASYNC_API_CONFIG,
+    FANOUT_CONFIG,
+    ADAPTIVE_FETCH_CONFIG,
+    STREAMING_CONFIG,
+    RAW_STORE_CONFIG,
+    CACHE_CONFIG,
+    HISTORY_CONFIG,
+    BACKFILL_CONFIG,
+    SERVICE_CONFIG,
+    ALERT_CONFIG,
+    CLUSTER_CONFIG,
+    ATTACK_CONFIG,
+    TREND_CONFIG,
+    SKETCH_CONFIG,
+    EMERGING_CONFIG,
+    SESSION_CONFIG,
     CYBER_THREATS,
     CYBER_KEYWORDS,
     THREAT_SCORING,
     SENTIMENT_THRESHOLDS,
+    SENTIMENT_SCORING,
     RECENCY_SCORING,
+    RECENCY_POINTS,
     HIGH_IMPACT_KEYWORDS,
     MAJOR_SECURITY_SOURCES,
     UI_CONFIG,
@@ -19,11 +37,29 @@ from .settings import (
 
 __all__ = [
     'API_CONFIG',
+    'ASYNC_API_CONFIG',
+    'FANOUT_CONFIG',
+    'ADAPTIVE_FETCH_CONFIG',
+    'STREAMING_CONFIG',
+    'RAW_STORE_CONFIG',
+    'CACHE_CONFIG',
+    'HISTORY_CONFIG',
+    'BACKFILL_CONFIG',
+    'SERVICE_CONFIG',
+    'ALERT_CONFIG',
+    'CLUSTER_CONFIG',
+    'ATTACK_CONFIG',
+    'TREND_CONFIG',
+    'SKETCH_CONFIG',
+    'EMERGING_CONFIG',
+    'SESSION_CONFIG',
     'CYBER_THREATS',
     'CYBER_KEYWORDS',
     'THREAT_SCORING',
     'SENTIMENT_THRESHOLDS',
+    'SENTIMENT_SCORING',
     'RECENCY_SCORING',
+    'RECENCY_POINTS',
     'HIGH_IMPACT_KEYWORDS',
     'MAJOR_SECURITY_SOURCES',
     'UI_CONFIG',
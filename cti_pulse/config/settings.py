@@ -10,6 +10,184 @@ API_CONFIG = {
     'max_results': 100
 }
 
+# Async API client configuration
+ASYNC_API_CONFIG = {
+    'pool_size': 100,          # Total pooled connections
+    'per_host_limit': 20,      # Concurrent requests per upstream host
+    'default_deadline': 120    # Overall deadline (seconds) for a batch of requests
+}
+
+# Synonym fan-out: query the threat name and its synonyms concurrently
+FANOUT_CONFIG = {
+    'enabled': False,          # Default for the "Synonym fan-out" sidebar toggle
+    'max_queries': 6,          # Canonical query plus up to 5 synonyms
+    'rrf_k': 60                # Reciprocal-rank fusion damping constant
+}
+
+# Adaptive articles-per-threat: fetch in escalating result sizes and stop early
+ADAPTIVE_FETCH_CONFIG = {
+    'enabled': False,          # Default for the "Adaptive fetch" sidebar toggle
+    'target_per_threat': 10,   # Stop once this many articles pass the severity filter
+    'initial_size': 10,        # First result_size requested
+    'growth': 2,               # Multiply result_size by this each step
+    'min_sample': 20,          # Articles scored before the yield projection is trusted
+    'min_expected': 1          # Stop when fewer qualifying articles are projected beyond this point
+}
+
+# Response streaming configuration
+STREAMING_CONFIG = {
+    'enabled': True,
+    'chunk_size': 65536,
+    'json_backend': 'auto',    # 'auto', 'orjson' or 'stdlib' (used when streaming is disabled)
+    'article_fields': ['title', 'summary', 'url', 'timestamp', 'highlights']
+}
+
+# Content-addressed store for raw API payloads
+RAW_STORE_CONFIG = {
+    'enabled': True,
+    'path': '.cache/raw',
+    'compresslevel': 6,
+    'max_age_days': 30,        # Payloads not written or fetched again for this long are pruned
+    'max_mb': 1024,            # Then the oldest are pruned until the store fits
+    'prune_interval': 3600     # Seconds between prunes (shared by every process on the host)
+}
+
+# Shared cache configuration
+CACHE_CONFIG = {
+    'backend': 'sqlite',                     # 'memory', 'sqlite' or 'redis'
+    'sqlite_path': '.cache/cyberpulse.db',   # Shared by every replica on the host
+    'redis_url': 'redis://localhost:6379/0', # Shared across hosts (requires redis package)
+    'local_tier': True,                      # Per-process memory copy in front of the shared backend
+    'local_ttl': 60,
+    'purge_interval': 600,                   # Seconds between deletes of expired SQLite rows
+    'api_ttl': 900,                          # Seconds to reuse an API response
+    'analysis_ttl': 3600,                    # Seconds to reuse analysed results
+    'warm_prefixes': ['api:', 'analysis:'],
+    'warm_limit': 200                        # Entries per prefix loaded on replica startup
+}
+
+# Persistent article history (used by the API service and back-fill)
+HISTORY_CONFIG = {
+    'path': '.cache/history.db',
+    'batch_size': 500                        # Articles per write transaction
+}
+
+# Bulk back-fill job configuration
+BACKFILL_CONFIG = {
+    'concurrency': 8,                        # Requests in flight at once
+    'rate_per_second': 4,                    # Request rate limit (token bucket)
+    'burst': 4,
+    'num_results': 50,                       # Articles requested per query
+    'include_synonyms': True,                # Also query every synonym of each threat
+    'max_attempts': 3,                       # Attempts per task across runs
+    'state_path': '.cache/backfill_state.json'
+}
+
+# REST/JSON API service configuration
+SERVICE_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8600,
+    'cache_ttl': 60,                         # Seconds to reuse a rendered response
+    'cache_entries': 1024,
+    'gzip_min_bytes': 1024,                  # Smaller bodies are sent uncompressed
+    'page_size': 20,
+    'max_page_size': 100,
+    'target_rps': 2000                       # Single-core load test target (cached responses)
+}
+
+# Push alerts for critical threats (see jobs/watcher.py)
+ALERT_CONFIG = {
+    'rules': [
+        # min_score is required; threats/sources/categories narrow the match
+        {'name': 'critical', 'min_score': 8},
+        {'name': 'ransomware-trusted-source', 'min_score': 7,
+         'threats': ['ransomware attack'], 'sources': ['krebs', 'bleeping', 'darkreading']}
+    ],
+    'sinks': ['stdout', 'file'],             # Any of 'stdout', 'file', 'webhook'
+    'file_path': '.cache/alerts.jsonl',
+    'webhook_url': 'http://127.0.0.1:8650/alerts',
+    'webhook_timeout': 3,
+    'rate_limit': 10,                        # Alerts per rule per window...
+    'rate_window': 60,                       # ...of this many seconds
+    'dedupe_ttl': 7 * 24 * 3600,             # Seconds before the same article can alert again
+    'poll_interval': 60,                     # Seconds between watcher fetches
+    'watch_threats': None,                   # None watches every CYBER_THREATS key
+    'num_results': 20,
+    'latency_budget': 3.0                    # Seconds from ingest to delivery
+}
+
+# Incremental campaign clustering (MinHash LSH over word shingles)
+CLUSTER_CONFIG = {
+    'enabled': True,
+    'num_perm': 72,                          # MinHash signature length
+    'bands': 24,                             # LSH bands (num_perm / bands rows each)
+    'shingle_size': 1,                       # Content words per shingle
+    'threshold': 0.3,                        # Estimated Jaccard needed to join a cluster
+    'max_bucket': 8,                         # Most recent cluster ids kept per LSH bucket
+    'member_signatures': 8,                  # Recent member signatures compared per cluster
+    'max_clusters': 50000                    # Least recently grown clusters are forgotten
+}
+
+# MITRE ATT&CK technique tagging
+ATTACK_CONFIG = {
+    'mapping_path': 'config/attack_techniques.json',  # Bundled technique/tactic/phrase mapping
+    'chart_techniques': 10                   # Techniques shown in the ATT&CK chart
+}
+
+# Streaming trend and anomaly detection on daily volume and severity
+TREND_CONFIG = {
+    'enabled': True,
+    'alpha': 0.3,                            # EWMA weight of the newest closed day
+    'z_threshold': 3.0,                      # Deviations above baseline that count as a spike
+    'min_count': 3,                          # Fewest articles in a day before it can spike
+    'warmup_days': 5,                        # Closed days needed before a series is judged
+    'lateness_days': 2,                      # Days kept open for late-arriving articles
+    'max_gap_days': 60,                      # Empty days closed one by one; longer gaps decay at once
+    'max_events': 500,                       # Anomaly timeline length
+    'state_path': '.cache/trends.json',      # Detector snapshot, replaces history rescans
+    'sync_interval': 30,                     # Seconds between history syncs on rerun
+    'timeline_days': 90                      # Days shown in the anomaly timeline
+}
+
+# Mergeable per-day sketches for long-history aggregates
+SKETCH_CONFIG = {
+    'enabled': True,
+    'hll_precision': 12,                     # HyperLogLog registers 2**p; 1.6% standard error
+    'heavy_hitters': 64,                     # Space-Saving counters; count error <= total / 64
+    'tdigest_compression': 100,              # t-digest centroids for score quantiles
+    'dedupe_capacity': 100000,               # Distinct articles per month each re-ingest filter is sized for
+    'dedupe_error_rate': 0.001,              # Re-ingest filter false-positive rate
+    'max_days': 730,                         # Daily buckets kept
+    'state_path': '.cache/sketches.json.gz', # Sketch snapshot, replaces history rescans
+    'sync_interval': 30                      # Seconds between history syncs on rerun
+}
+
+# Emerging terms in article summaries
+EMERGING_CONFIG = {
+    'enabled': True,
+    'window_days': 2,                        # Current window, newest publication days
+    'background_days': 14,                   # Days before the window used as the baseline
+    'capacity': 3000,                        # Space-Saving term counters per day
+    'min_count': 3,                          # Fewest current articles mentioning a term
+    'min_lift': 3.0,                         # Current share / background share needed
+    'max_terms': 10,                         # Terms shown in the sidebar
+    'dedupe_capacity': 20000,                # Distinct articles per day each re-ingest filter is sized for
+    'sync_interval': 30                      # Seconds between history syncs on rerun
+}
+
+# Per-session dashboard results and their memory budget
+SESSION_CONFIG = {
+    'session_budget_mb': 32,                 # Larger results are reloaded from the shared cache on each rerun
+    'total_budget_mb': 512,                  # All sessions' in-memory results; least recently used spill first
+    'spill_ttl': 6 * 3600,                   # Seconds spilled results are kept in the shared cache
+    'idle_ttl': 6 * 3600,                    # Sessions idle this long are forgotten
+    'admin_view': False,                     # Sidebar table of every session's footprint; operators only
+    'restore': True,                         # Snapshot results so a browser reload restores them
+    'snapshot_dir': '.cache/sessions',       # One Arrow IPC file per session token
+    'snapshot_ttl': 7 * 24 * 3600,           # Seconds a snapshot can still be restored
+    'snapshot_compression': 'zstd'           # Arrow IPC buffer codec ('zstd', 'lz4' or '' for none)
+}
+
 # Enhanced cyber threat keywords with severity ratings and synonyms
 CYBER_THREATS = {
     "ransomware attack": {
@@ -76,17 +254,23 @@ CYBER_KEYWORDS = {
 }
 
 # Threat scoring configuration
+# Each factor's points are multiplied by its weight before summing; the
+# defaults reproduce the original hard-coded scoring rules.
 THREAT_SCORING = {
     'base_severity_weight': 1.0,
-    'sentiment_weight': 2.0,
-    'recency_weight': 1.5,
+    'sentiment_weight': 1.0,
+    'recency_weight': 1.0,
     'keyword_weight': 1.0,
-    'source_weight': 0.5,
+    'source_weight': 1.0,
+    'default_severity': 3,     # Base severity for threats not in CYBER_THREATS
+    'keyword_points': 0.5,     # Per high impact keyword found
+    'keyword_cap': 3,          # Maximum keyword points
+    'source_points': 1,        # Boost for major security sources
     'max_score': 10,
     'min_score': 1
 }
 
-# Sentiment thresholds
+# Sentiment thresholds (compound score must be below the bound)
 SENTIMENT_THRESHOLDS = {
     'very_negative': -0.5,
     'negative': -0.1,
@@ -95,6 +279,14 @@ SENTIMENT_THRESHOLDS = {
     'positive': 0.1
 }
 
+# Sentiment points per bucket
+SENTIMENT_SCORING = {
+    'very_negative': 3,
+    'negative': 2,
+    'neutral': 1,
+    'positive': 0
+}
+
 # Recency scoring (in days)
 RECENCY_SCORING = {
     'very_recent': 7,    # Last week - score 2
@@ -103,6 +295,15 @@ RECENCY_SCORING = {
     'old': float('inf') # Older - score 0
 }
 
+# Recency points per bucket ('unknown' applies when the date is missing or invalid)
+RECENCY_POINTS = {
+    'very_recent': 2,
+    'recent': 1,
+    'moderate': 0.5,
+    'old': 0,
+    'unknown': 0.5
+}
+
 # High impact keywords for threat scoring
 HIGH_IMPACT_KEYWORDS = [
     'critical', 'widespread', 'global', 'massive', 'unprecedented',
@@ -120,6 +321,9 @@ MAJOR_SECURITY_SOURCES = [
 UI_CONFIG = {
     'max_critical_alerts': 5,
     'max_articles_display': 10,
+    'cards_per_page': 25,             # Article cards rendered per HTML block in each threat tab
+    'fragment_cache_size': 4096,      # Rendered card fragments kept per process
+    'max_indicators_display': 50,     # Rows in the extracted indicators table
     'chart_height': 400,
     'default_severity_filter': 3,
     'default_articles_per_threat': 15
@@ -0,0 +1,5 @@
+"""
+Jobs package for CyberPulse application
+Command-line batch jobs that feed the persistent history store
+Run modules directly, e.g. python -m jobs.backfill or python -m jobs.watcher
+"""
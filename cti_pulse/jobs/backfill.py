@@ -0,0 +1,283 @@
+"""
+Bulk back-fill of the history store
+
+Queries the threat API for every CYBER_THREATS keyword (and, optionally,
+each of its synonyms), scores the results with ThreatProcessor and writes
+them to the HistoryStore in batches.
+
+- Bounded parallelism: a fixed pool of workers drains one task queue.
+- Rate limiting: a token bucket caps requests per second.
+- Checkpoints: each task's outcome is recorded in a local JSON state file
+  once its articles are durably written, so a crashed or interrupted run
+  resumes where it stopped. Failed tasks are retried on the next run up to
+  BACKFILL_CONFIG['max_attempts'] times.
+
+Run from the cti_pulse directory:
+    python -m jobs.backfill [--threats "data breach,phishing campaign"] [--reset]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from config.settings import API_CONFIG, BACKFILL_CONFIG, CYBER_THREATS
+from utils.async_api_client import AsyncAPIClient, run_sync
+from utils.history_store import HistoryStore
+from utils.threat_processor import ThreatProcessor
+
+
+def build_tasks(threats=None, num_results=None, include_synonyms=None):
+    """Back-fill tasks as ``(task_id, threat, query)`` tuples
+
+    Articles found by a synonym query are scored and stored under the
+    threat keyword the synonym belongs to.
+    """
+    threats = threats or list(CYBER_THREATS)
+    num_results = num_results or BACKFILL_CONFIG['num_results']
+    if include_synonyms is None:
+        include_synonyms = BACKFILL_CONFIG['include_synonyms']
+
+    tasks = []
+    for threat in threats:
+        queries = [threat]
+        if include_synonyms:
+            queries += CYBER_THREATS.get(threat, {}).get('synonyms', [])
+        for query in dict.fromkeys(queries):
+            tasks.append((f"{threat}|{query}|{num_results}", threat, query))
+    return tasks
+
+
+class BackfillState:
+    """Per-task checkpoints persisted to a JSON file
+
+    Writes go to a temporary file that is atomically renamed over the
+    previous state, so a crash never leaves a truncated checkpoint.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or BACKFILL_CONFIG['state_path']
+        self.tasks = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.tasks = json.load(f).get('tasks', {})
+
+    def is_done(self, task_id):
+        return self.tasks.get(task_id, {}).get('status') == 'done'
+
+    def attempts(self, task_id):
+        return self.tasks.get(task_id, {}).get('attempts', 0)
+
+    def pending(self, tasks, max_attempts):
+        """Tasks not yet done and not out of attempts"""
+        return [task for task in tasks
+                if not self.is_done(task[0]) and self.attempts(task[0]) < max_attempts]
+
+    def mark_done(self, task_id, articles):
+        self.tasks[task_id] = {
+            'status': 'done',
+            'articles': articles,
+            'attempts': self.attempts(task_id) + 1,
+            'finished_at': time.time()
+        }
+
+    def mark_failed(self, task_id, error):
+        self.tasks[task_id] = {
+            'status': 'failed',
+            'error': error,
+            'attempts': self.attempts(task_id) + 1,
+            'finished_at': time.time()
+        }
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'saved_at': time.time(), 'tasks': self.tasks}, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def reset(self):
+        self.tasks = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class RateLimiter:
+    """Asyncio token bucket: at most ``rate`` acquisitions per second after a ``burst``"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = self.burst
+        self._updated = None
+        self._lock = None
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+
+        async with self._lock:
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class BackfillJob:
+    """Bounded-parallel back-fill with batched writes and checkpoints"""
+
+    def __init__(self, tasks, state=None, history=None, processor=None, client=None,
+                 concurrency=None, rate_per_second=None, burst=None, num_results=None, log=print):
+        self.tasks = tasks
+        self.state = state or BackfillState()
+        self.history = history or HistoryStore()
+        self.processor = processor or ThreatProcessor()
+        self.client = client or AsyncAPIClient()
+        self.concurrency = concurrency or BACKFILL_CONFIG['concurrency']
+        self.limiter = RateLimiter(rate_per_second or BACKFILL_CONFIG['rate_per_second'],
+                                   burst or BACKFILL_CONFIG['burst'])
+        self.num_results = num_results or BACKFILL_CONFIG['num_results']
+        self.log = log
+
+        # Articles scored but not yet written, and the tasks they came from
+        self._buffer = []
+        self._buffered_tasks = []
+
+        self.stats = {'tasks_done': 0, 'tasks_failed': 0, 'articles': 0, 'elapsed': 0.0}
+
+    async def run(self):
+        """Process every pending task; returns the run statistics"""
+        pending = self.state.pending(self.tasks, BACKFILL_CONFIG['max_attempts'])
+        skipped = len(self.tasks) - len(pending)
+        self.log(f"Back-fill: {len(pending)} tasks pending, {skipped} already checkpointed")
+
+        queue = asyncio.Queue()
+        for task in pending:
+            queue.put_nowait(task)
+
+        started = time.perf_counter()
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(min(self.concurrency, len(pending)))]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            # Only articles that reach the store are checkpointed
+            self._flush()
+            await self.client.close()
+
+        self.stats['elapsed'] = time.perf_counter() - started
+        return self.stats
+
+    async def _worker(self, queue):
+        while True:
+            task = await queue.get()
+            try:
+                await self._run_task(task)
+            except Exception as e:
+                self.state.mark_failed(task[0], f"{type(e).__name__}: {e}")
+                self.state.save()
+                self.stats['tasks_failed'] += 1
+                self.log(f"  failed: {task[1]} / {task[2]}: {e}")
+            finally:
+                queue.task_done()
+
+    async def _run_task(self, task):
+        task_id, threat, query = task
+        await self.limiter.acquire()
+
+        deadline = asyncio.get_running_loop().time() + API_CONFIG['timeout']
+        data = await self.client.get_threat_data(query, self.num_results, deadline)
+
+        if not data or 'results' not in data:
+            error = self.client.errors.get(query, "No data returned")
+            self.state.mark_failed(task_id, error)
+            self.state.save()
+            self.stats['tasks_failed'] += 1
+            self.log(f"  failed: {threat} / {query}: {error}")
+            return
+
+        # Analysis is CPU-bound; run it off the loop so other workers' requests keep flowing
+        analysis = await asyncio.to_thread(self.processor.analyze_threat_sentiment, data, threat)
+        self._buffer.extend(analysis)
+        self._buffered_tasks.append((task_id, len(analysis)))
+        if len(self._buffer) >= self.history.batch_size:
+            self._flush()
+
+    def _flush(self):
+        """Write buffered articles, then checkpoint the tasks they belong to"""
+        if not self._buffered_tasks:
+            return
+
+        written = self.history.add_articles(self._buffer)
+        for task_id, articles in self._buffered_tasks:
+            self.state.mark_done(task_id, articles)
+        self.state.save()
+
+        self.stats['articles'] += written
+        self.stats['tasks_done'] += len(self._buffered_tasks)
+        self.log(f"  wrote {written} articles from {len(self._buffered_tasks)} tasks "
+                 f"({self.stats['articles']} total)")
+
+        self._buffer = []
+        self._buffered_tasks = []
+
+
+def run_backfill(threats=None, num_results=None, include_synonyms=None, reset=False, **job_options):
+    """Run a back-fill from synchronous code; returns the run statistics"""
+    state = BackfillState()
+    if reset:
+        state.reset()
+
+    tasks = build_tasks(threats, num_results, include_synonyms)
+    job = BackfillJob(tasks, state=state, num_results=num_results, **job_options)
+    return run_sync(job.run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back-fill the CyberPulse history store")
+    parser.add_argument('--threats', help="Comma separated threat keywords (default: all CYBER_THREATS)")
+    parser.add_argument('--num-results', type=int, default=BACKFILL_CONFIG['num_results'])
+    parser.add_argument('--concurrency', type=int, default=BACKFILL_CONFIG['concurrency'])
+    parser.add_argument('--rate', type=float, default=BACKFILL_CONFIG['rate_per_second'],
+                        help="Maximum requests per second")
+    parser.add_argument('--no-synonyms', action='store_true', help="Only query the threat keywords")
+    parser.add_argument('--reset', action='store_true', help="Discard checkpoints and start over")
+    args = parser.parse_args()
+
+    threats = [t.strip() for t in args.threats.split(',') if t.strip()] if args.threats else None
+    unknown = [t for t in threats or [] if t not in CYBER_THREATS]
+    if unknown:
+        parser.error(f"Unknown threat(s): {', '.join(unknown)}")
+
+    from utils.nltk_setup import initialize_nltk
+    initialize_nltk()
+
+    stats = run_backfill(
+        threats,
+        num_results=args.num_results,
+        include_synonyms=not args.no_synonyms,
+        reset=args.reset,
+        concurrency=args.concurrency,
+        rate_per_second=args.rate
+    )
+
+    rate = stats['articles'] / stats['elapsed'] if stats['elapsed'] else 0
+    print(f"Back-fill complete: {stats['tasks_done']} tasks done, {stats['tasks_failed']} failed, "
+          f"{stats['articles']} articles in {stats['elapsed']:.1f}s ({rate:,.1f} articles/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Critical threat watcher: push alerts without opening the dashboard
+
+Polls the threat API for the watched threats every
+ALERT_CONFIG['poll_interval'] seconds, bypassing the response cache. Each
+response is scored with ThreatProcessor and recorded in the HistoryStore
+as soon as it arrives, then evaluated by the AlertEngine, which applies
+the alert rules, de-duplication and rate limits and delivers alerts to the
+configured sinks (stdout, JSON-lines file, webhook). Ingest-to-delivery
+latency is reported after every poll.
+
+Run from the cti_pulse directory:
+    python -m jobs.watcher [--once] [--sinks stdout,file,webhook]
+
+A local webhook receiver for testing:
+    python -m service.alert_receiver --port 8650
+"""
+
+import argparse
+import asyncio
+import time
+
+from config.settings import ALERT_CONFIG, CYBER_THREATS
+from utils.alerts import AlertEngine, create_sinks
+from utils.async_api_client import AsyncAPIClient
+from utils.history_store import HistoryStore
+from utils.threat_processor import ThreatProcessor
+
+
+class ThreatWatcher:
+    """Poll, score, record and alert on the watched threats"""
+
+    def __init__(self, threats=None, engine=None, processor=None, history=None, num_results=None,
+                 interval=None, log=print):
+        self.threats = threats or ALERT_CONFIG['watch_threats'] or list(CYBER_THREATS)
+        self.engine = engine or AlertEngine()
+        self.processor = processor or ThreatProcessor()
+        self.history = history or HistoryStore()
+        self.num_results = num_results or ALERT_CONFIG['num_results']
+        self.interval = interval or ALERT_CONFIG['poll_interval']
+        self.log = log
+
+    async def poll_once(self):
+        """Fetch every watched threat once, alerting on each response as it arrives"""
+        client = AsyncAPIClient(use_cache=False)
+        deadline = asyncio.get_running_loop().time() + self.interval
+        alerts = []
+
+        async def fetch(threat):
+            return threat, await client.get_threat_data(threat, self.num_results, deadline)
+
+        try:
+            for next_result in asyncio.as_completed([fetch(threat) for threat in self.threats]):
+                threat, data = await next_result
+                if not data or 'results' not in data:
+                    self.log(f"  {threat}: {client.errors.get(threat, 'no data')}")
+                    continue
+
+                ingested_at = time.time()
+                analysis = self.processor.analyze_threat_sentiment(data, threat)
+                self.history.add_articles(analysis)
+                # Sinks block (webhook POSTs), so deliver off the event loop
+                alerts.extend(await asyncio.to_thread(self.engine.process, analysis, ingested_at))
+        finally:
+            await client.close()
+        return alerts
+
+    async def run(self, once=False):
+        while True:
+            started = time.time()
+            alerts = await self.poll_once()
+
+            latency = self.engine.latency_summary()
+            latency_text = (f"latency p50 {latency['p50'] * 1000:.0f} ms, p95 {latency['p95'] * 1000:.0f} ms, "
+                            f"max {latency['max'] * 1000:.0f} ms" if latency else "no alerts yet")
+            self.log(f"Poll done in {time.time() - started:.1f}s: {len(alerts)} new alerts; "
+                     f"{self.engine.stats['duplicates']} duplicates, {self.engine.stats['rate_limited']} "
+                     f"rate-limited, {self.engine.stats['undelivered']} undelivered so far; {latency_text}")
+            if latency and not latency['within_budget']:
+                self.log(f"  Warning: alert latency exceeded the {ALERT_CONFIG['latency_budget']}s budget")
+
+            if once:
+                return
+            await asyncio.sleep(max(0, self.interval - (time.time() - started)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch threats and push critical alerts")
+    parser.add_argument('--threats', help="Comma separated threat keywords (default: ALERT_CONFIG['watch_threats'])")
+    parser.add_argument('--sinks', help="Comma separated sinks: stdout, file, webhook")
+    parser.add_argument('--interval', type=float, default=ALERT_CONFIG['poll_interval'])
+    parser.add_argument('--once', action='store_true', help="Poll once and exit")
+    args = parser.parse_args()
+
+    threats = [t.strip() for t in args.threats.split(',') if t.strip()] if args.threats else None
+    sinks = create_sinks(args.sinks.split(',')) if args.sinks else None
+
+    from utils.nltk_setup import initialize_nltk
+    initialize_nltk()
+
+    watcher = ThreatWatcher(threats, engine=AlertEngine(sinks=sinks), interval=args.interval)
+    try:
+        asyncio.run(watcher.run(once=args.once))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 import streamlit as st
 import time
+import uuid
 from datetime import datetime
 from components.ui_components import UIComponents
 from components.ai_assistant import AIAssistant
@@ -7,8 +8,23 @@ from components.visualizations import ThreatVisualizations
 from components.threat_analysis import ThreatAnalysis
 from utils.threat_processor import ThreatProcessor
 from utils.api_client import APIClient
+from utils.async_api_client import AsyncAPIClient
 from utils.nltk_setup import initialize_nltk
-from config.settings import CYBER_THREATS
+from utils.cache_backend import warm_cache
+from utils.article_index import ScoredArticleIndex
+from utils.data_processor import filter_by_severity
+from utils.rollups import ThreatRollup
+from utils.history_store import HistoryStore
+from utils.adaptive_fetch import AdaptiveFetcher
+from utils.attack_tagger import filter_by_tactics
+from utils.clustering import CampaignClusterer
+from utils.trends import TrendDetector
+from utils.sketches import HistorySketches
+from utils.emerging_terms import EmergingTerms
+from utils.session_store import SessionStore, session_results
+from utils.session_snapshot import SessionSnapshots, valid_token
+from config.settings import CYBER_THREATS, FANOUT_CONFIG, ADAPTIVE_FETCH_CONFIG, CLUSTER_CONFIG, \
+    TREND_CONFIG, SKETCH_CONFIG, EMERGING_CONFIG, SESSION_CONFIG
 from assets.styles import load_custom_css
 
 # Configure page
@@ -25,13 +41,128 @@ load_custom_css()
 # Initialize NLTK
 initialize_nltk()
 
+
+@st.cache_resource
+def get_threat_processor():
+    """One ThreatProcessor (and VADER lexicon) per process, shared by all sessions"""
+    return ThreatProcessor()
+
+
+@st.cache_resource
+def warm_shared_cache():
+    """Preload entries other replicas already cached; runs once per process"""
+    return warm_cache()
+
+
+@st.cache_resource
+def get_history_store():
+    """Persistent article history shared with the API service"""
+    return HistoryStore()
+
+
+@st.cache_resource
+def get_clusterer():
+    """Incident clusters shared by all sessions; grows as articles are fetched"""
+    return CampaignClusterer() if CLUSTER_CONFIG['enabled'] else None
+
+
+@st.cache_resource
+def get_history_sketches():
+    """Per-day history sketches, restored from their snapshot and kept in sync with history"""
+    return HistorySketches.load() if SKETCH_CONFIG['enabled'] else None
+
+
+@st.cache_resource
+def get_emerging_terms():
+    """Emerging summary terms shared by all sessions, warmed from recently ingested history"""
+    return EmergingTerms() if EMERGING_CONFIG['enabled'] else None
+
+
+@st.cache_resource
+def get_trend_detector():
+    """Streaming trend baselines, restored from their snapshot and kept in sync with history"""
+    return TrendDetector.load() if TREND_CONFIG['enabled'] else None
+
+
+@st.cache_resource
+def get_session_store():
+    """Dashboard results of every session, kept within the memory budget"""
+    return SessionStore()
+
+
+@st.cache_resource
+def get_session_snapshots():
+    """On-disk snapshots that let a reloaded page restore its dashboard"""
+    return SessionSnapshots() if SESSION_CONFIG['restore'] else None
+
+
+warm_shared_cache()
+
 # Initialize components
 ui = UIComponents()
 ai_assistant = AIAssistant()
 visualizations = ThreatVisualizations()
 threat_analysis = ThreatAnalysis()
-threat_processor = ThreatProcessor()
+threat_processor = get_threat_processor()
 api_client = APIClient()
+history_store = get_history_store()
+clusterer = get_clusterer()
+trend_detector = get_trend_detector()
+history_sketches = get_history_sketches()
+emerging_terms = get_emerging_terms()
+session_store = get_session_store()
+session_snapshots = get_session_snapshots()
+
+
+def session_token():
+    """Key of this browser session's results and snapshot
+
+    Carried in the URL (``?session=...``), so a reloaded page keeps it.
+    """
+    if 'session_token' not in st.session_state:
+        token = st.query_params.get('session')
+        st.session_state.session_token = token if valid_token(token) else uuid.uuid4().hex
+    if st.query_params.get('session') != st.session_state.session_token:
+        st.query_params['session'] = st.session_state.session_token
+    return st.session_state.session_token
+
+
+def save_snapshot(threat_data):
+    """Snapshot this session's fetched results and query for restoring after a reload"""
+    if session_snapshots is not None:
+        session_snapshots.save(session_token(), threat_data, {
+            'query_used': st.session_state.get('query_used'),
+            'severity_filter': st.session_state.severity_filter,
+            'last_update': st.session_state.last_update.isoformat()
+        })
+
+
+def restore_snapshot(results=None):
+    """Restore this session from its snapshot, with no API calls; None if it has none
+
+    A reloaded page gets its query state back, and its results too unless
+    the session store still holds them (``results``).
+    """
+    if session_snapshots is None:
+        return None
+    token = session_token()
+    if results is None:
+        snapshot = session_snapshots.load(token)
+        if snapshot is None:
+            return None
+        threat_data, state = snapshot
+        results = session_results(threat_data, state['severity_filter'])
+        session_store.put(token, results, articles=sum(len(data['index']) for data in threat_data.values()))
+    else:
+        state = session_snapshots.load_state(token)
+        if state is None:
+            return None
+
+    st.session_state.setdefault('severity_filter', state['severity_filter'])
+    st.session_state.setdefault('last_update', datetime.fromisoformat(state['last_update']))
+    if state.get('query_used'):
+        st.session_state.setdefault('query_used', state['query_used'])
+    return results
 
 
 def main():
@@ -53,14 +184,30 @@ def main():
         process_manual_query(sidebar_config)
 
     # Display results if available
-    if hasattr(st.session_state, 'threat_data'):
+    results = session_store.get(session_token())
+    # A reloaded page, or results released under the memory budget, come back from the snapshot
+    if results is None or 'last_update' not in st.session_state:
+        results = restore_snapshot(results)
+    if results is not None:
         query_info = f" (from query: '{st.session_state.query_used}')" if hasattr(st.session_state,
                                                                                   'query_used') else ""
-        st.info(f"📊 Showing cached data from {st.session_state.last_update.strftime('%H:%M:%S')}{query_info}")
-        display_dashboard()
+        st.info(f"📊 Showing cached data from {st.session_state.last_update.strftime('%H:%M:%S')}{query_info}"
+                f" — severity ≥ {get_severity_filter()}")
+        display_dashboard(results)
     else:
+        if 'last_update' in st.session_state:
+            st.warning(f"♻️ Results fetched at {st.session_state.last_update.strftime('%H:%M:%S')} were released "
+                       f"to keep the server within its memory budget. Run the query again to reload them.")
         ui.render_welcome_screen()
 
+    # Emerging terms go last in the sidebar, so they include anything just fetched
+    if emerging_terms is not None:
+        emerging_terms.sync(history_store)
+        ui.render_emerging_terms(emerging_terms)
+
+    if SESSION_CONFIG['admin_view']:
+        ui.render_session_memory(session_store, session_token())
+
 
 def process_ai_query(ai_results):
     """Process AI assistant query"""
@@ -69,10 +216,11 @@ def process_ai_query(ai_results):
 
         if matched_threats:
             ui.display_ai_response(matched_threats, ai_results['settings'])
-            if fetch_threat_intelligence(matched_threats, ai_results['settings']):
-                st.session_state.query_used = f"{ai_results['query']} (AI: severity≥{ai_results['settings']['severity_filter']}, {ai_results['settings']['articles_per_threat']} articles)"
-                st.success(
-                    f"🎉 Analysis complete! Found intelligence for {len(st.session_state.threat_data)} threat types.")
+            threat_data = fetch_threat_intelligence(matched_threats, ai_results['settings'])
+            if threat_data:
+                st.session_state.query_used = f"{ai_results['query']} (AI: {ai_results['settings']['articles_per_threat']} articles)"
+                save_snapshot(threat_data)
+                st.success(f"🎉 Analysis complete! Found intelligence for {len(threat_data)} threat types.")
         else:
             ui.display_no_threats_message()
 
@@ -83,13 +231,19 @@ def process_manual_query(config):
         st.warning("⚠️ Please select at least one threat type to monitor or use the AI assistant above.")
         return
 
-    if fetch_threat_intelligence(config['selected_threats'], config):
+    threat_data = fetch_threat_intelligence(config['selected_threats'], config)
+    if threat_data:
         st.session_state.query_used = "Manual Selection"
-        st.success(f"🎉 Successfully gathered intelligence for {len(st.session_state.threat_data)} threat types!")
+        save_snapshot(threat_data)
+        st.success(f"🎉 Successfully gathered intelligence for {len(threat_data)} threat types!")
 
 
 def fetch_threat_intelligence(threats, settings):
-    """Fetch and process threat intelligence data with progress tracking"""
+    """Fetch and process threat intelligence data with progress tracking
+
+    The results go to the session store; returns the threat data (empty if
+    nothing was found).
+    """
     st.write("🚀 Starting threat intelligence gathering...")
     all_threat_data = {}
 
@@ -109,21 +263,36 @@ def fetch_threat_intelligence(threats, settings):
         if i > 0:
             time.sleep(1)
 
-        data = api_client.get_threat_data(threat, settings['articles_per_threat'])
-
-        if data and 'results' in data:
-            analysis = threat_processor.analyze_threat_sentiment(data, threat)
-            filtered_analysis = [a for a in analysis if a['threat_score'] >= settings['severity_filter']]
+        def fetch(num_results, threat=threat):
+            if settings.get('fanout', FANOUT_CONFIG['enabled']):
+                return fetch_fanout(threat, num_results, status_container)
+            return api_client.get_threat_data(threat, num_results)
 
+        if settings.get('adaptive', ADAPTIVE_FETCH_CONFIG['enabled']):
+            analysis, raw_ref = fetch_adaptive(threat, fetch, settings, status_container)
+        else:
+            data = fetch(settings['articles_per_threat'])
+            analysis, raw_ref = None, None
+            if data and 'results' in data:
+                analysis = threat_processor.analyze_threat_sentiment(data, threat)
+                raw_ref = data.get('raw_ref')
+
+        if analysis is not None:
+            history_store.add_articles(analysis)
+            if clusterer is not None:
+                clusterer.add_many(analysis)
+
+            # Keep the full scored set; the severity filter is applied as a view
+            index = ScoredArticleIndex(analysis)
             all_threat_data[threat] = {
-                'raw_data': data,
-                'analysis': filtered_analysis,
-                'article_count': len(filtered_analysis)
+                'raw_ref': raw_ref,
+                'index': index
             }
 
             with status_container:
                 st.success(
-                    f"✅ **{threat}**: Found {len(filtered_analysis)} articles (severity >= {settings['severity_filter']})")
+                    f"✅ **{threat}**: Found {index.count_at_least(settings['severity_filter'])} articles "
+                    f"(severity >= {settings['severity_filter']}, {len(index)} scored)")
         else:
             with status_container:
                 st.error(f"❌ **{threat}**: No data found")
@@ -135,35 +304,102 @@ def fetch_threat_intelligence(threats, settings):
     progress_bar.empty()
 
     if all_threat_data:
-        st.session_state.threat_data = all_threat_data
+        if trend_detector is not None:
+            trend_detector.sync(history_store, force=True)
+        if history_sketches is not None:
+            history_sketches.sync(history_store, force=True)
+        if emerging_terms is not None:
+            emerging_terms.sync(history_store, force=True)
+        session_store.put(session_token(), session_results(all_threat_data, settings['severity_filter']),
+                          articles=sum(len(data['index']) for data in all_threat_data.values()))
+        st.session_state.severity_filter = settings['severity_filter']
         st.session_state.last_update = datetime.now()
-        return True
     else:
         st.error("❌ No threat data could be retrieved. Please check API connection.")
-        return False
+    return all_threat_data
 
 
-def display_dashboard():
-    """Display the main dashboard with all components"""
-    if not hasattr(st.session_state, 'threat_data'):
-        return
+def fetch_adaptive(threat, fetch, settings, status_container):
+    """Fetch in growing steps until enough articles pass the severity filter"""
+    fetcher = AdaptiveFetcher(fetch, threat_processor)
+    analysis, stats = fetcher.run(threat, settings['articles_per_threat'], settings['severity_filter'])
+
+    with status_container:
+        skipped = ", skipped to the ceiling" if stats['skipped_to_ceiling'] else ""
+        st.write(f"🎚️ Adaptive fetch: {stats['requests']} request(s){skipped}, {stats['fetched']} results "
+                 f"downloaded, {stats['scored']} of {stats['ceiling']} articles scored — "
+                 f"stopped: {stats['stop_reason']}")
+    return analysis, stats['raw_ref']
+
+
+def fetch_fanout(threat, num_results, status_container):
+    """Fetch a threat and its synonyms concurrently, reporting per-query hits"""
+    client = AsyncAPIClient()
+    data = client.get_threat_data_fanout_sync(threat, num_results)
+
+    with status_container:
+        if data:
+            hits = ", ".join(f"{query} ({count})" for query, count in data['fanout']['hits'].items())
+            st.write(f"🔀 Merged {len(data['results'])} unique articles from: {hits}")
+        for query, error in client.errors.items():
+            st.warning(f"⚠️ Query '{query}' failed: {error}")
+    return data
 
-    all_threat_data = st.session_state.threat_data
+
+def get_severity_filter():
+    """Current minimum severity, as last set by either severity slider or fetch"""
+    return st.session_state.get('severity_filter', 3)
+
+
+def display_dashboard(results):
+    """Display the main dashboard with all components, from this session's stored results"""
+    threat_data = results['threat_data']
+
+    # Filter the stored, already-scored articles; no network or rescoring
+    min_severity = get_severity_filter()
+    all_threat_data = filter_by_severity(threat_data, min_severity)
+
+    # Aggregates are updated with only the articles the threshold change affects
+    rollup = results['rollup'].retarget(threat_data, min_severity)
+
+    # ATT&CK tactic filter narrows the view; aggregates and alerts follow it
+    tactics = st.session_state.get('attack_tactics')
+    if tactics:
+        all_threat_data = filter_by_tactics(all_threat_data, tactics)
+        rollup = ThreatRollup.from_view(all_threat_data)
+
+    # New history rows are folded into the trend baselines, never rescanned
+    if trend_detector is not None:
+        trend_detector.sync(history_store)
 
     # Executive Summary
-    ui.render_executive_summary(all_threat_data)
+    ui.render_executive_summary(all_threat_data, rollup, trend_detector)
 
     # Key Metrics
-    ui.render_key_metrics(all_threat_data)
+    ui.render_key_metrics(all_threat_data, rollup)
 
     # Visualizations
-    visualizations.render_threat_charts(all_threat_data)
+    visualizations.render_threat_charts(all_threat_data, rollup)
+
+    # Trends
+    if trend_detector is not None:
+        visualizations.render_trends(trend_detector)
+
+    # Critical Alerts: global top K maintained at ingest, O(K) to render
+    # The global index ignores the tactic filter, so merge the filtered lists instead
+    alert_index = None if tactics else results['alert_index']
+    ui.render_critical_alerts(all_threat_data, alert_index, min_severity)
+
+    # Indicators extracted inline at fetch, de-duplicated across threats
+    ui.render_indicators(results['indicator_index'], min_severity)
 
-    # Critical Alerts
-    ui.render_critical_alerts(all_threat_data)
+    # Long-range aggregates come from merged daily sketches, not the article rows
+    if history_sketches is not None:
+        history_sketches.sync(history_store)
+        ui.render_history_analytics(history_sketches)
 
     # Detailed Analysis
-    threat_analysis.render_detailed_analysis(all_threat_data)
+    threat_analysis.render_detailed_analysis(all_threat_data, rollup, clusterer)
 
 
 if __name__ == "__main__":
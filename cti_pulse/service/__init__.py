@@ -0,0 +1,5 @@
+"""
+Service package for CyberPulse application
+REST/JSON API exposing the threat pipeline to other tools
+Run modules directly, e.g. python -m service.api_server
+"""
@@ -0,0 +1,67 @@
+"""
+Minimal local webhook receiver for CyberPulse alerts
+
+Accepts the JSON alerts POSTed by the watcher's webhook sink, prints each
+one with its end-to-end latency (receive time minus ingest time) and
+appends it to an optional JSON-lines file.
+
+Run from the cti_pulse directory:
+    python -m service.alert_receiver --port 8650 [--output received.jsonl]
+"""
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class AlertReceiverHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        received_at = time.time()
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            alert = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._reply(400)
+            return
+
+        latency = received_at - float(alert.get('ingested_at', received_at))
+        print(f"[{alert.get('rule')}] {alert.get('threat_score')} {alert.get('title')} "
+              f"(ingest -> receive {latency * 1000:.0f} ms)", flush=True)
+        if self.server.output:
+            alert['received_at'] = received_at
+            with open(self.server.output, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(alert) + '\n')
+        self._reply(204)
+
+    def _reply(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local webhook receiver for CyberPulse alerts")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8650)
+    parser.add_argument('--output', help="Append received alerts to this JSON-lines file")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), AlertReceiverHandler)
+    server.output = args.output
+    print(f"Receiving alerts on http://{args.host}:{args.port}/alerts")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
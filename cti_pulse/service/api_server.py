@@ -0,0 +1,430 @@
+"""
+REST/JSON API service for the CyberPulse threat pipeline
+
+Serves the same core the Streamlit dashboard uses (ThreatProcessor,
+ScoredArticleIndex, ThreatRollup, HistoryStore) over plain HTTP/1.1 with
+keep-alive, so SOC tooling can read scores without scraping the UI.
+
+Endpoints (all GET, JSON):
+    /api/health
+    /api/terms?q=<natural language query>
+    /api/threats?threat=<keyword>&n=20&min_severity=1&page=1&page_size=20
+    /api/aggregates?threats=<kw,kw>&n=20&min_severity=1
+    /api/history?threat=<keyword>&min_score=&since=<epoch>&page=1&page_size=20
+    /api/history/stats?since=<YYYY-MM-DD>&until=<YYYY-MM-DD>&top=10
+
+Rendered responses are cached for SERVICE_CONFIG['cache_ttl'] seconds,
+carry a strong ETag (If-None-Match gives 304) and are gzip-compressed when
+the client accepts it. List endpoints return a pagination envelope.
+
+Run from the cti_pulse directory:
+    python -m service.api_server --port 8600
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from config.settings import CYBER_THREATS, SERVICE_CONFIG
+from utils.async_api_client import AsyncAPIClient
+from utils.threat_processor import ThreatProcessor
+from utils.article_index import ScoredArticleIndex
+from utils.history_store import HistoryStore
+from utils.sketches import HistorySketches
+from utils.rollups import ThreatRollup
+from utils.data_processor import generate_executive_summary
+from utils.single_flight import SingleFlight
+
+ARTICLE_FIELDS = (
+    'article_id',
+    'title',
+    'url',
+    'source',
+    'published_date',
+    'threat_keyword',
+    'category',
+    'threat_score',
+    'sentiment_compound',
+    'sentiment_neg',
+    'highlights'
+)
+
+
+class ServiceError(Exception):
+    """Request error reported to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(params, name, default, low=None, high=None):
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ServiceError(400, f"'{name}' must be an integer")
+    if low is not None and value < low:
+        raise ServiceError(400, f"'{name}' must be >= {low}")
+    if high is not None and value > high:
+        raise ServiceError(400, f"'{name}' must be <= {high}")
+    return value
+
+
+def _float_param(params, name, default=None):
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ServiceError(400, f"'{name}' must be a number")
+
+
+def _date_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ServiceError(400, f"'{name}' must be a YYYY-MM-DD date")
+
+
+def _page_params(params):
+    page = _int_param(params, 'page', 1, low=1)
+    page_size = _int_param(params, 'page_size', SERVICE_CONFIG['page_size'], low=1,
+                           high=SERVICE_CONFIG['max_page_size'])
+    return page, page_size
+
+
+def paginate(items, total, page, page_size):
+    """Pagination envelope for one page of ``items`` out of ``total``"""
+    return {
+        'items': items,
+        'page': page,
+        'page_size': page_size,
+        'total': total,
+        'pages': math.ceil(total / page_size) if total else 0
+    }
+
+
+def serialize_article(article):
+    """JSON-safe view of a ThreatArticle"""
+    record = {field: article.get(field) for field in ARTICLE_FIELDS}
+    record['highlights'] = list(record['highlights'] or ())
+    return record
+
+
+class ThreatService:
+    """Transport-independent implementation of the API endpoints
+
+    Each method takes the parsed query parameters and returns a JSON-ready
+    dict, raising ServiceError for bad input.
+    """
+
+    def __init__(self, processor=None, history=None, sketches=None):
+        self.processor = processor or ThreatProcessor()
+        self.history = history or HistoryStore()
+        self.sketches = sketches or HistorySketches.load()
+
+    def health(self, params):
+        return {'status': 'ok', 'time': time.time()}
+
+    def terms(self, params):
+        query = params.get('q', '').strip()
+        if not query:
+            raise ServiceError(400, "'q' is required")
+        return {'query': query, 'terms': self.processor.extract_cybersecurity_terms(query)}
+
+    def scored_threats(self, threats, num_results):
+        """Fetch, score and record several threats; returns ({threat: index}, errors)"""
+        client = AsyncAPIClient()
+        responses = client.get_many_sync(threats, num_results)
+
+        indexes = {}
+        for threat, data in responses.items():
+            if data and 'results' in data:
+                analysis = self.processor.analyze_threat_sentiment(data, threat)
+                self.history.add_articles(analysis)
+                indexes[threat] = {'raw_ref': data.get('raw_ref'), 'index': ScoredArticleIndex(analysis)}
+        return indexes, dict(client.errors)
+
+    def threats(self, params):
+        threat = params.get('threat', '').strip().lower()
+        if not threat:
+            raise ServiceError(400, "'threat' is required")
+        num_results = _int_param(params, 'n', 20, low=1, high=100)
+        min_severity = _float_param(params, 'min_severity', 1)
+        page, page_size = _page_params(params)
+
+        indexes, errors = self.scored_threats([threat], num_results)
+        if threat not in indexes:
+            raise ServiceError(502, errors.get(threat, "No data returned by the threat API"))
+
+        index = indexes[threat]['index']
+        total = index.count_at_least(min_severity)
+        start = (page - 1) * page_size
+        items = [serialize_article(a) for a in index.at_least(min_severity)[start:start + page_size]]
+
+        response = paginate(items, total, page, page_size)
+        response.update({
+            'threat': threat,
+            'category': CYBER_THREATS.get(threat, {}).get('category', 'Unknown'),
+            'min_severity': min_severity,
+            'scored_count': len(index)
+        })
+        return response
+
+    def aggregates(self, params):
+        threats = [t.strip().lower() for t in params.get('threats', '').split(',') if t.strip()]
+        threats = threats or list(CYBER_THREATS)
+        num_results = _int_param(params, 'n', 20, low=1, high=100)
+        min_severity = _float_param(params, 'min_severity', 1)
+
+        indexes, errors = self.scored_threats(threats, num_results)
+        rollup = ThreatRollup.from_threat_data(indexes, min_severity)
+
+        per_threat = {}
+        for threat in indexes:
+            avg_score, avg_sentiment = rollup.threat_averages(threat)
+            per_threat[threat] = {
+                'article_count': rollup.threat_counts.get(threat, 0),
+                'avg_score': avg_score,
+                'avg_sentiment': avg_sentiment
+            }
+
+        return {
+            'min_severity': min_severity,
+            'summary': generate_executive_summary(None, rollup),
+            'critical': rollup.critical,
+            'avg_score': rollup.avg_score,
+            'severity_distribution': rollup.severity_distribution(),
+            'category_distribution': dict(rollup.category_distribution()),
+            'top_sources': rollup.top_sources(10),
+            'threats': per_threat,
+            'errors': errors
+        }
+
+    def history_page(self, params):
+        threat = params.get('threat', '').strip().lower() or None
+        min_score = _float_param(params, 'min_score')
+        since = _float_param(params, 'since')
+        page, page_size = _page_params(params)
+
+        total = self.history.count(threat, since, min_score)
+        items = self.history.query(threat, since, min_score, limit=page_size, offset=(page - 1) * page_size)
+        return paginate(items, total, page, page_size)
+
+    def history_stats(self, params):
+        since = _date_param(params, 'since')
+        until = _date_param(params, 'until')
+        top_n = _int_param(params, 'top', 10, low=1, high=50)
+        if since and until and since > until:
+            raise ServiceError(400, "'since' must not be after 'until'")
+
+        self.sketches.sync(self.history)
+        stats = self.sketches.aggregate(since, until, top_n)
+        return {
+            'since': since.isoformat() if since else None,
+            'until': until.isoformat() if until else None,
+            'articles': stats['articles'],
+            'distinct_sources': stats['distinct_sources'],
+            'distinct_indicators': stats['distinct_indicators'],
+            'top_sources': [{'source': source, 'count': count, 'max_overcount': error}
+                            for source, count, error in stats['top_sources']],
+            'category_distribution': {category: count for category, count, _ in stats['categories']},
+            'threat_counts': {threat: count for threat, count, _ in stats['threats']},
+            'score_quantiles': stats['score_quantiles'],
+            'error_bounds': {
+                'distinct_relative_std_error': stats['distinct_error'],
+                'count_max_overcount': stats['heavy_hitter_error']
+            }
+        }
+
+
+class CachedResponse:
+    """Rendered response body with its ETag and lazily built gzip copy"""
+
+    __slots__ = ('status', 'body', 'etag', 'expires_at', '_gzipped')
+
+    def __init__(self, status, body, ttl):
+        self.status = status
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.expires_at = time.monotonic() + ttl
+        self._gzipped = None
+
+    @property
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+class ResponseCache:
+    """Thread-safe LRU of rendered responses with a fixed TTL"""
+
+    def __init__(self, max_entries=None, ttl=None):
+        self.max_entries = max_entries or SERVICE_CONFIG['cache_entries']
+        self.ttl = ttl if ttl is not None else SERVICE_CONFIG['cache_ttl']
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, status, body):
+        entry = CachedResponse(status, body, self.ttl)
+        if status == 200 and self.ttl > 0:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+
+class ThreatAPIHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler routing to ThreatService"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'CyberPulseAPI/1.0'
+
+    routes = {
+        '/api/health': 'health',
+        '/api/terms': 'terms',
+        '/api/threats': 'threats',
+        '/api/aggregates': 'aggregates',
+        '/api/history': 'history_page',
+        '/api/history/stats': 'history_stats'
+    }
+    uncached = {'/api/health'}
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        method = self.routes.get(url.path.rstrip('/') or '/')
+        if method is None:
+            self._send(CachedResponse(404, self._json({'error': f"Unknown endpoint: {url.path}"}), 0))
+            return
+
+        params = dict(parse_qsl(url.query))
+        key = f"{url.path}?{urlencode(sorted(params.items()))}"
+        cache = self.server.response_cache
+
+        entry = cache.get(key)
+        if entry is None:
+            # Concurrent misses for the same URL share one computation
+            entry, _ = self.server.in_flight.do(key, 0, lambda: self._render(key, method, params, url.path))
+        self._send(entry)
+
+    def _render(self, key, method, params, path):
+        try:
+            status, payload = 200, getattr(self.server.service, method)(params)
+        except ServiceError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            self.log_error("Unhandled error for %s: %r", key, e)
+            status, payload = 500, {'error': 'Internal server error'}
+
+        body = self._json(payload)
+        if path in self.uncached:
+            return CachedResponse(status, body, 0)
+        return self.server.response_cache.put(key, status, body)
+
+    def _json(self, payload):
+        return json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+
+    def _send(self, entry):
+        if entry.status == 200 and self.headers.get('If-None-Match') == entry.etag:
+            self.send_response(304)
+            self.send_header('ETag', entry.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = entry.body
+        compress = (len(body) >= SERVICE_CONFIG['gzip_min_bytes']
+                    and 'gzip' in self.headers.get('Accept-Encoding', ''))
+        if compress:
+            body = entry.gzipped
+
+        self.send_response(entry.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if entry.status == 200:
+            self.send_header('ETag', entry.etag)
+            self.send_header('Cache-Control', f"max-age={self.server.response_cache.ttl}")
+        self.send_header('Vary', 'Accept-Encoding')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ThreatAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service=None, verbose=False):
+        super().__init__(address, ThreatAPIHandler)
+        self.service = service or ThreatService()
+        self.response_cache = ResponseCache()
+        self.in_flight = SingleFlight()
+        self.verbose = verbose
+
+
+def create_server(host=None, port=None, service=None, verbose=False):
+    """Create (but do not start) the API server"""
+    host = host or SERVICE_CONFIG['host']
+    port = SERVICE_CONFIG['port'] if port is None else port
+    return ThreatAPIServer((host, port), service, verbose)
+
+
+def serve(host=None, port=None, verbose=False):
+    """Run the API server until interrupted"""
+    from utils.nltk_setup import initialize_nltk
+    initialize_nltk()
+
+    server = create_server(host, port, verbose=verbose)
+    print(f"CyberPulse API listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CyberPulse REST/JSON API service")
+    parser.add_argument('--host', default=SERVICE_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=SERVICE_CONFIG['port'])
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.verbose)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,25 +4,29 @@ Contains utility functions and helper classes
 """
 
 from .api_client import APIClient
+from .async_api_client import AsyncAPIClient
 from .threat_processor import ThreatProcessor
 from .data_processor import (
     generate_executive_summary,
     process_timeline_data,
     get_category_distribution,
     get_severity_distribution,
-    get_source_analysis
+    get_source_analysis,
+    filter_by_severity
 )
 from .nltk_setup import initialize_nltk, download_nltk_data
 from .chatbot_utils import generate_chatbot_response
 
 __all__ = [
     'APIClient',
+    'AsyncAPIClient',
     'ThreatProcessor',
     'generate_executive_summary',
     'process_timeline_data',
     'get_category_distribution',
     'get_severity_distribution',
     'get_source_analysis',
+    'filter_by_severity',
     'initialize_nltk',
     'download_nltk_data',
     'generate_chatbot_response'
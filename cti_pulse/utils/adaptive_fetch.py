@@ -0,0 +1,116 @@
+from config.settings import ADAPTIVE_FETCH_CONFIG
+from utils.result_fusion import result_key
+
+
+class AdaptiveFetcher:
+    """Fetch a threat in escalating result sizes until enough articles qualify
+
+    The search API has no offset parameter, so each step requests a larger
+    ``result_size`` (``initial_size``, then times ``growth``) up to the
+    user's articles-per-threat ceiling. Only articles not seen in earlier
+    steps are scored, but every step downloads the earlier ones again, so
+    once the qualifying share so far projects the next step falling short
+    of ``target``, the fetcher skips straight to the ceiling. Fetching
+    stops as soon as:
+
+    - ``target`` articles score at or above the severity threshold,
+    - no article for the threat can reach the threshold at all,
+    - the API returned fewer results than asked for (nothing left), or
+    - at least ``min_sample`` articles have been scored and the observed
+      share of qualifying articles projects fewer than ``min_expected``
+      more among the articles still below the ceiling.
+
+    Downloaded results (``stats['fetched']``) are at most the initial step
+    plus the ceiling when the yield is low from the start. At worst, when
+    every step projects reaching the target and then misses it, they add
+    up to the whole geometric series: about ``(1 + growth / (growth - 1))``
+    times the ceiling (250 results for a ceiling of 100 with the defaults),
+    against 100 for a single request.
+    """
+
+    def __init__(self, fetch, processor, target=None, initial_size=None, growth=None,
+                 min_sample=None, min_expected=None):
+        self.fetch = fetch
+        self.processor = processor
+        self.target = target or ADAPTIVE_FETCH_CONFIG['target_per_threat']
+        self.initial_size = initial_size or ADAPTIVE_FETCH_CONFIG['initial_size']
+        self.growth = growth or ADAPTIVE_FETCH_CONFIG['growth']
+        self.min_sample = ADAPTIVE_FETCH_CONFIG['min_sample'] if min_sample is None else min_sample
+        self.min_expected = ADAPTIVE_FETCH_CONFIG['min_expected'] if min_expected is None else min_expected
+
+    def expected_remaining(self, qualifying, scored, max_results):
+        """Projected qualifying articles among the ones not fetched yet
+
+        Uses the smoothed qualifying share so far, ``(q + 0.5) / (n + 1)``,
+        so a run of zero hits still leaves a small non-zero estimate.
+        """
+        return (qualifying + 0.5) / (scored + 1) * max(0, max_results - scored)
+
+    def reaches_target(self, qualifying, scored, size, target):
+        """Whether a step of ``size`` results is projected to bring ``target`` qualifying articles
+
+        Skipping ahead when it is not is never wrong about results, only
+        about cost, so unlike stopping early it does not wait for
+        ``min_sample``.
+        """
+        return qualifying + self.expected_remaining(qualifying, scored, size) >= target
+
+    def run(self, threat_keyword, max_results, min_severity):
+        """Returns ``(analysis, stats)`` or ``(None, stats)`` if the first request fails"""
+        stats = {'requests': 0, 'fetched': 0, 'scored': 0, 'qualifying': 0,
+                 'ceiling': max_results, 'skipped_to_ceiling': False, 'stop_reason': None, 'raw_ref': None}
+
+        if self.processor.scoring_model.max_possible_score(threat_keyword) < min_severity:
+            stats['stop_reason'] = 'threshold unreachable'
+            return [], stats
+
+        target = min(self.target, max_results)
+        analysis = []
+        seen = set()
+        size = min(self.initial_size, max_results)
+
+        while True:
+            data = self.fetch(size)
+            stats['requests'] += 1
+            if not data or 'results' not in data:
+                stats['stop_reason'] = 'request failed'
+                if not analysis:
+                    return None, stats
+                break
+
+            results = data['results']
+            stats['fetched'] += len(results)
+            stats['raw_ref'] = data.get('raw_ref')
+
+            new_indices = []
+            for index, article in enumerate(results):
+                key = result_key(article)
+                if key not in seen:
+                    seen.add(key)
+                    new_indices.append(index)
+
+            scored = self.processor.analyze_results_at(data, threat_keyword, new_indices)
+            new_qualifying = sum(1 for article in scored if article['threat_score'] >= min_severity)
+            analysis.extend(scored)
+            stats['scored'] += len(scored)
+            stats['qualifying'] += new_qualifying
+
+            if stats['qualifying'] >= target:
+                stats['stop_reason'] = 'target reached'
+            elif len(results) < size:
+                stats['stop_reason'] = 'results exhausted'
+            elif size >= max_results:
+                stats['stop_reason'] = 'ceiling reached'
+            elif (stats['scored'] >= self.min_sample and
+                  self.expected_remaining(stats['qualifying'], stats['scored'], max_results) < self.min_expected):
+                stats['stop_reason'] = 'low yield'
+
+            if stats['stop_reason']:
+                break
+            size = min(max_results, max(size + 1, int(size * self.growth)))
+            if size < max_results and not self.reaches_target(stats['qualifying'], stats['scored'], size, target):
+                size = max_results
+                stats['skipped_to_ceiling'] = True
+
+        analysis.sort(key=lambda article: article['threat_score'], reverse=True)
+        return analysis, stats
@@ -0,0 +1,208 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import requests
+
+from config.settings import ALERT_CONFIG
+from utils.cache_backend import ObjectCache, get_cache
+
+
+class AlertRule:
+    """Match analysed articles by score threshold, threat and source
+
+    ``threats`` and ``categories`` match exactly; ``sources`` match as
+    substrings of the article's source domain (like the scoring model's
+    source credibility check). Empty filters match everything.
+    """
+
+    def __init__(self, name, min_score, threats=None, sources=None, categories=None):
+        self.name = name
+        self.min_score = min_score
+        self.threats = set(threats or ())
+        self.sources = tuple(s.lower() for s in sources or ())
+        self.categories = set(categories or ())
+
+    @classmethod
+    def from_config(cls, rule):
+        return cls(rule['name'], rule['min_score'], rule.get('threats'), rule.get('sources'),
+                   rule.get('categories'))
+
+    def matches(self, article):
+        if article['threat_score'] < self.min_score:
+            return False
+        if self.threats and article['threat_keyword'] not in self.threats:
+            return False
+        if self.categories and article['category'] not in self.categories:
+            return False
+        if self.sources:
+            source = article['source'].lower()
+            if not any(s in source for s in self.sources):
+                return False
+        return True
+
+
+class StdoutSink:
+    def send(self, alert):
+        print(f"[ALERT {alert['rule']}] {alert['threat_score']:.1f} {alert['threat_keyword']}: "
+              f"{alert['title']} ({alert['source']}) {alert['url']}", file=sys.stdout, flush=True)
+
+
+class FileSink:
+    """Append alerts as JSON lines"""
+
+    def __init__(self, path=None):
+        self.path = path or ALERT_CONFIG['file_path']
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def send(self, alert):
+        line = json.dumps(alert, default=str) + '\n'
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+class WebhookSink:
+    """POST each alert as JSON to a receiver"""
+
+    def __init__(self, url=None, timeout=None):
+        self.url = url or ALERT_CONFIG['webhook_url']
+        self.timeout = timeout or ALERT_CONFIG['webhook_timeout']
+        self.session = requests.Session()
+
+    def send(self, alert):
+        response = self.session.post(self.url, data=json.dumps(alert, default=str),
+                                     headers={'Content-Type': 'application/json'}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+SINKS = {
+    'stdout': StdoutSink,
+    'file': FileSink,
+    'webhook': WebhookSink
+}
+
+
+def create_sinks(names=None):
+    """Instantiate sinks by name ('stdout', 'file', 'webhook')"""
+    sinks = []
+    for name in names or ALERT_CONFIG['sinks']:
+        if name not in SINKS:
+            raise ValueError(f"Unknown alert sink: {name}")
+        sinks.append(SINKS[name]())
+    return sinks
+
+
+class AlertEngine:
+    """Evaluate newly ingested articles against alert rules and deliver alerts
+
+    Each (rule, article) pair alerts once: delivered keys are remembered in
+    the shared cache backend for ``dedupe_ttl`` seconds, so restarts and
+    other watcher replicas do not repeat alerts. An alert no sink accepted
+    is not remembered, so it is retried on the next poll. Each rule may fire at most
+    ``rate_limit`` times per ``rate_window`` seconds; suppressed matches are
+    counted. Ingest-to-delivery latency is recorded for every alert.
+    """
+
+    def __init__(self, rules=None, sinks=None, rate_limit=None, rate_window=None, dedupe_ttl=None):
+        self.rules = rules if rules is not None else [AlertRule.from_config(r) for r in ALERT_CONFIG['rules']]
+        self.sinks = sinks if sinks is not None else create_sinks()
+        self.rate_limit = rate_limit or ALERT_CONFIG['rate_limit']
+        self.rate_window = rate_window or ALERT_CONFIG['rate_window']
+        self.dedupe_ttl = dedupe_ttl or ALERT_CONFIG['dedupe_ttl']
+        self.delivered = ObjectCache(get_cache(), 'alerts')
+
+        self._fired = {rule.name: deque() for rule in self.rules}
+        self.latencies = deque(maxlen=1000)
+        self.stats = {'evaluated': 0, 'alerts': 0, 'duplicates': 0, 'rate_limited': 0, 'sink_errors': 0,
+                      'undelivered': 0}
+
+    def _allow(self, rule, now):
+        """Sliding-window rate limit per rule"""
+        fired = self._fired[rule.name]
+        while fired and fired[0] <= now - self.rate_window:
+            fired.popleft()
+        if len(fired) >= self.rate_limit:
+            return False
+        fired.append(now)
+        return True
+
+    def process(self, articles, ingested_at=None):
+        """Evaluate a batch of analysed articles; returns the alerts delivered"""
+        ingested_at = ingested_at or time.time()
+        alerts = []
+
+        for article in articles:
+            self.stats['evaluated'] += 1
+            for rule in self.rules:
+                if not rule.matches(article):
+                    continue
+
+                key = f"{rule.name}:{article['threat_keyword']}:{article['article_id']}"
+                if self.delivered.get(key) is not None:
+                    self.stats['duplicates'] += 1
+                    continue
+                if not self._allow(rule, time.time()):
+                    self.stats['rate_limited'] += 1
+                    continue
+
+                alert = self._deliver(rule, article, ingested_at)
+                if alert is None:
+                    # Every sink failed: free the rate-limit slot and retry on the next poll
+                    self._fired[rule.name].pop()
+                    self.stats['undelivered'] += 1
+                    continue
+                self.delivered.set(key, alert['alerted_at'], ttl=self.dedupe_ttl)
+                alerts.append(alert)
+        return alerts
+
+    def _deliver(self, rule, article, ingested_at):
+        """Send an alert to every sink; returns it, or None if no sink accepted it"""
+        alert = {
+            'rule': rule.name,
+            'article_id': article['article_id'],
+            'title': article['title'],
+            'url': article['url'],
+            'source': article['source'],
+            'threat_keyword': article['threat_keyword'],
+            'category': article['category'],
+            'threat_score': article['threat_score'],
+            'published_date': article['published_date'],
+            'ingested_at': ingested_at
+        }
+        alert['alerted_at'] = time.time()
+
+        delivered = False
+        for sink in self.sinks:
+            try:
+                sink.send(alert)
+                delivered = True
+            except Exception as e:
+                self.stats['sink_errors'] += 1
+                print(f"Alert sink {type(sink).__name__} failed: {e}", file=sys.stderr)
+        if not delivered:
+            return None
+
+        latency = time.time() - ingested_at
+        alert['latency'] = latency
+        self.latencies.append(latency)
+        self.stats['alerts'] += 1
+        return alert
+
+    def latency_summary(self):
+        """p50/p95/max ingest-to-delivery latency in seconds, or None"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return {
+            'count': len(ordered),
+            'p50': ordered[len(ordered) // 2],
+            'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            'max': ordered[-1],
+            'within_budget': ordered[-1] <= ALERT_CONFIG['latency_budget']
+        }
@@ -1,45 +1,181 @@
 import requests
 import json
+import codecs
+import copy
+import hashlib
 import streamlit as st
-from config.settings import API_CONFIG
+from config.settings import API_CONFIG, STREAMING_CONFIG, RAW_STORE_CONFIG, CACHE_CONFIG
+from utils.cache_backend import ObjectCache, get_cache
+from utils.json_stream import StreamingArrayParser, get_json_loads
+from utils.raw_store import RawPayloadStore
+from utils.single_flight import SingleFlight
+
+
+def build_threat_payload(threat_keyword, num_results=20, max_results=None):
+    """Build the search request body shared by the sync and async clients"""
+    if max_results is None:
+        max_results = API_CONFIG['max_results']
+
+    return {
+        "query_text": threat_keyword,
+        "result_size": min(num_results, max_results),
+        "include_highlights": True,
+        "include_smart_tags": True
+    }
+
+
+def build_headers(api_key=None):
+    """Build the request headers shared by the sync and async clients"""
+    return {
+        "Content-Type": "application/json",
+        "x-api-key": api_key if api_key is not None else API_CONFIG['key']
+    }
+
+
+def response_cache_key(api_url, payload):
+    """Cache key for a search request, shared by the sync and async clients"""
+    return hashlib.sha256(f"{api_url}|{json.dumps(payload, sort_keys=True)}".encode()).hexdigest()
+
+
+def slim_article(article):
+    """Keep only the article fields the analysis pipeline reads"""
+    return {field: article[field] for field in STREAMING_CONFIG['article_fields'] if field in article}
+
+
+class ThreatResponseReader:
+    """Incrementally decode a search response body
+
+    Chunks of the HTTP body are pushed in with ``feed``; the ``results``
+    array is stream-parsed and each article is slimmed as soon as it is
+    complete. The untouched body is written to the raw payload store and
+    its content address returned as ``raw_ref`` so the full payload can be
+    loaded lazily later.
+    """
+
+    def __init__(self, raw_store=None):
+        self._parser = StreamingArrayParser('results', item_hook=slim_article)
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._writer = raw_store.writer() if raw_store is not None else None
+        self._results = []
+
+    def feed(self, chunk):
+        if self._writer is not None:
+            self._writer.write(chunk)
+        self._results.extend(self._parser.feed(self._text_decoder.decode(chunk)))
+
+    def finish(self):
+        """Return the decoded response: top-level fields, slim results and raw_ref"""
+        try:
+            self._results.extend(self._parser.feed(self._text_decoder.decode(b'', final=True)))
+            self._results.extend(self._parser.close())
+        except ValueError:
+            self.abort()
+            raise
+
+        data = dict(self._parser.meta)
+        if self._parser.found_array:
+            data['results'] = self._results
+        data['raw_ref'] = self._writer.commit() if self._writer is not None else None
+        return data
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+
+
+def read_threat_response(body, raw_store=None):
+    """Decode a fully buffered response body with the configured JSON backend"""
+    data = get_json_loads()(body)
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        data['results'] = [slim_article(article) for article in data['results']]
+    if isinstance(data, dict):
+        data['raw_ref'] = raw_store.put(body) if raw_store is not None else None
+    return data
+
+
+def get_raw_store():
+    """Get the raw payload store, or None when it is disabled"""
+    if not RAW_STORE_CONFIG['enabled']:
+        return None
+    return RawPayloadStore()
+
+
+def slice_response(data, num_results):
+    """Copy of a response trimmed to its first ``num_results`` results"""
+    if not data or len(data.get('results', [])) <= num_results:
+        return data
+    sliced = dict(data)
+    sliced['results'] = data['results'][:num_results]
+    return sliced
 
 
 class APIClient:
     """API client for threat intelligence data"""
 
+    # Shared by every client in the process so concurrent sessions coalesce
+    _in_flight = SingleFlight()
+
     def __init__(self):
         self.api_url = API_CONFIG['url']
         self.api_key = API_CONFIG['key']
         self.timeout = API_CONFIG['timeout']
         self.max_results = API_CONFIG['max_results']
 
-        self.headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.api_key
-        }
+        self.headers = build_headers(self.api_key)
+        self.raw_store = get_raw_store()
+        self.response_cache = ObjectCache(get_cache(), 'api')
 
     def get_threat_data(self, threat_keyword, num_results=20):
-        """Get threat intelligence data for a specific keyword - with proper error handling"""
-        payload = {
-            "query_text": threat_keyword,
-            "result_size": min(num_results, self.max_results),
-            "include_highlights": True,
-            "include_smart_tags": True
-        }
+        """Get threat intelligence data for a specific keyword - with proper error handling
+
+        Responses are shared with other processes through the cache backend.
+        Identical requests already in flight (from any session) are joined
+        rather than re-sent; a smaller request is served by slicing a larger
+        in-flight response.
+        """
+        payload = build_threat_payload(threat_keyword, num_results, self.max_results)
+        result_size = payload['result_size']
+
+        cache_key = response_cache_key(self.api_url, payload)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            st.write(f"⚡ Using cached data for: {threat_keyword}")
+            return cached
 
+        def fetch_and_cache():
+            data = self._fetch(threat_keyword, payload)
+            if data is not None:
+                self.response_cache.set(cache_key, data, ttl=CACHE_CONFIG['api_ttl'])
+            return data
+
+        # Everything except result_size identifies the query
+        flight_key = (self.api_url, json.dumps({k: v for k, v in payload.items() if k != 'result_size'},
+                                               sort_keys=True))
+        # Each joining session gets its own copy, so no caller can change another's results
+        data, shared = self._in_flight.do(flight_key, result_size, fetch_and_cache, share=copy.deepcopy)
+
+        if shared:
+            st.write(f"🔗 Joined in-flight request for: {threat_keyword}")
+            return slice_response(data, result_size)
+        return data
+
+    def _fetch(self, threat_keyword, payload):
+        """Send one search request"""
         try:
             st.write(f"🔍 Fetching data for: {threat_keyword}")
             response = requests.post(
                 self.api_url,
                 headers=self.headers,
                 data=json.dumps(payload),
-                timeout=self.timeout
+                timeout=self.timeout,
+                stream=STREAMING_CONFIG['enabled']
             )
 
             st.write(f"Status code: {response.status_code}")
 
             if response.status_code == 200:
-                data = response.json()
+                data = self._read_response(response)
                 st.write(f"✅ Successfully fetched data for {threat_keyword}")
                 return data
             else:
@@ -53,6 +189,31 @@ class APIClient:
         except requests.exceptions.RequestException as e:
             st.error(f"❌ Network error for {threat_keyword}: {str(e)}")
             return None
+        except ValueError as e:
+            st.error(f"❌ Invalid response for {threat_keyword}: {str(e)}")
+            return None
+
+    def _read_response(self, response):
+        """Decode a successful response, streaming the body when enabled"""
+        if not STREAMING_CONFIG['enabled']:
+            return read_threat_response(response.content, self.raw_store)
+
+        reader = ThreatResponseReader(self.raw_store)
+        try:
+            for chunk in response.iter_content(chunk_size=STREAMING_CONFIG['chunk_size']):
+                reader.feed(chunk)
+        except BaseException:
+            reader.abort()
+            raise
+        finally:
+            response.close()
+        return reader.finish()
+
+    def load_raw_response(self, raw_ref):
+        """Load the full, unslimmed response for ``raw_ref`` from the raw store"""
+        if self.raw_store is None or not raw_ref:
+            return None
+        return self.raw_store.get_json(raw_ref)
 
     def test_connection(self):
         """Test API connection"""
@@ -0,0 +1,116 @@
+import bisect
+import heapq
+import itertools
+
+
+class ScoredArticleIndex:
+    """Articles kept sorted by threat score, highest first
+
+    Holds the full scored set for one threat so severity filters become
+    views: each threshold lookup is a binary search over the sorted scores
+    and returns a slice, with no rescoring or refetching. Articles with equal
+    scores keep their insertion order.
+    """
+
+    def __init__(self, articles=()):
+        self._articles = sorted(articles, key=lambda a: a['threat_score'], reverse=True)
+        self._neg_scores = [-a['threat_score'] for a in self._articles]
+
+    def __len__(self):
+        return len(self._articles)
+
+    def __iter__(self):
+        return iter(self._articles)
+
+    def add(self, article):
+        """Insert an article, keeping score order"""
+        position = bisect.bisect_right(self._neg_scores, -article['threat_score'])
+        self._neg_scores.insert(position, -article['threat_score'])
+        self._articles.insert(position, article)
+
+    def count_at_least(self, threshold):
+        """Number of articles scoring >= threshold"""
+        return bisect.bisect_right(self._neg_scores, -threshold)
+
+    def at_least(self, threshold):
+        """Articles scoring >= threshold, highest first"""
+        return self._articles[:self.count_at_least(threshold)]
+
+    def between(self, low, high):
+        """Articles with low <= score < high, highest first"""
+        return self._articles[self.count_at_least(high):self.count_at_least(low)]
+
+    def top(self, k):
+        """The k highest scoring articles"""
+        return self._articles[:k]
+
+    def max_score(self):
+        return self._articles[0]['threat_score'] if self._articles else None
+
+
+class TopKIndex:
+    """Global top-K articles across threats, highest score first
+
+    Each threat's articles live in a ScoredArticleIndex (already sorted), so
+    the global top K is a lazy ``heapq.merge`` over the per-threat lists that
+    stops after K articles, rather than a sort of every article. ``set_threat`` replaces one
+    threat's articles (e.g. on refresh) and ``add`` ingests a single
+    article; both keep the top-K list current, and reads are O(K).
+    Articles are de-duplicated by ``article_id`` across threats.
+    """
+
+    def __init__(self, k, sources=None):
+        self.k = k
+        self._sources = dict(sources or {})
+        self._top = []
+        self._rebuild()
+
+    @classmethod
+    def from_threat_data(cls, threat_data, k):
+        """Build from stored threat data (entries with an ``'index'``)"""
+        return cls(k, {threat: data['index'] for threat, data in threat_data.items()})
+
+    def _rebuild(self):
+        merged = heapq.merge(*self._sources.values(),
+                             key=lambda a: a['threat_score'], reverse=True)
+        self._top = []
+        seen = set()
+        for article in merged:
+            if article['article_id'] in seen:
+                continue
+            seen.add(article['article_id'])
+            self._top.append(article)
+            if len(self._top) == self.k:
+                break
+
+    def set_threat(self, threat, index):
+        """Replace a threat's articles"""
+        self._sources[threat] = index
+        self._rebuild()
+
+    def remove_threat(self, threat):
+        if self._sources.pop(threat, None) is not None:
+            self._rebuild()
+
+    def add(self, threat, article):
+        """Ingest one article into its threat's index and the top K"""
+        index = self._sources.setdefault(threat, ScoredArticleIndex())
+        index.add(article)
+
+        score = article['threat_score']
+        if len(self._top) == self.k and score <= self._top[-1]['threat_score']:
+            return
+        if any(a['article_id'] == article['article_id'] for a in self._top):
+            return
+        position = bisect.bisect_right([-a['threat_score'] for a in self._top], -score)
+        self._top.insert(position, article)
+        del self._top[self.k:]
+
+    def top(self, min_score=None):
+        """Top-K articles scoring >= min_score, highest first"""
+        if min_score is None:
+            return list(self._top)
+        return list(itertools.takewhile(lambda a: a['threat_score'] >= min_score, self._top))
+
+    def __len__(self):
+        return len(self._top)
@@ -0,0 +1,157 @@
+import sys
+
+import numpy as np
+
+from utils.raw_store import RawPayloadStore
+from utils.tokens import get_vocabulary
+
+
+def _intern(value):
+    """Intern repeated strings; anything else (e.g. a null from an old record) is kept as is"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class ThreatArticle:
+    """Compact record for one analysed article
+
+    Stored in each session's dashboard results instead of a dict per
+    article. Repeated strings (source, category, threat keyword) are
+    interned, and the raw API article is not kept at all: ``raw_ref`` and
+    ``raw_index`` point into the content-addressed raw payload store and
+    ``raw_article`` loads it on demand.
+
+    The summary's token IDs in the shared vocabulary are kept as packed
+    int32 bytes (``token_ids``); ``clean_summary`` is decoded from them on
+    access. They are process-local, so pickling drops them and they are
+    encoded again from the summary on first use.
+
+    Supports read-only mapping access (``article['title']``,
+    ``article.get('highlights')``) so existing dashboard code is unchanged.
+    """
+
+    __slots__ = (
+        'title',
+        'summary',
+        'url',
+        'sentiment_compound',
+        'sentiment_neg',
+        'published_date',
+        'source',
+        'highlights',
+        'threat_keyword',
+        'category',
+        'threat_score',
+        'raw_ref',
+        'raw_index',
+        'indicators',
+        'techniques',
+        'tokens'
+    )
+
+    def __init__(self, title, summary, url, sentiment_compound, sentiment_neg, published_date,
+                 source, highlights, threat_keyword, category, threat_score, raw_ref=None, raw_index=None,
+                 indicators=(), techniques=(), token_ids=None):
+        self.title = title
+        self.summary = summary
+        self.url = url
+        self.sentiment_compound = sentiment_compound
+        self.sentiment_neg = sentiment_neg
+        self.published_date = _intern(published_date)
+        self.source = _intern(source)
+        self.highlights = tuple(highlights)
+        self.threat_keyword = _intern(threat_keyword)
+        self.category = _intern(category)
+        self.threat_score = threat_score
+        self.raw_ref = raw_ref
+        self.raw_index = raw_index
+        self.indicators = tuple(indicators)
+        self.techniques = tuple(_intern(technique) for technique in techniques)
+        self.tokens = token_ids.astype(np.int32).tobytes() if token_ids is not None else None
+
+    @classmethod
+    def from_analysis(cls, analysis_item, raw_ref=None, raw_index=None):
+        """Build a record from an analysis dict produced by ThreatProcessor"""
+        return cls(
+            analysis_item['title'],
+            analysis_item['summary'],
+            analysis_item.get('url', ''),
+            analysis_item['sentiment_compound'],
+            analysis_item['sentiment_neg'],
+            analysis_item['published_date'],
+            analysis_item['source'],
+            analysis_item.get('highlights') or (),
+            analysis_item['threat_keyword'],
+            analysis_item['category'],
+            analysis_item['threat_score'],
+            raw_ref,
+            raw_index,
+            analysis_item.get('indicators') or (),
+            analysis_item.get('techniques') or (),
+            analysis_item.get('token_ids')
+        )
+
+    @property
+    def article_id(self):
+        """Stable identifier for the article"""
+        return self.url or self.title
+
+    @property
+    def token_ids(self):
+        """Token IDs of the summary, encoded on first use if not stored"""
+        if self.tokens is None:
+            self.tokens = get_vocabulary().encode(self.summary).tobytes()
+        return np.frombuffer(self.tokens, dtype=np.int32)
+
+    @property
+    def clean_summary(self):
+        return get_vocabulary().decode(self.token_ids)
+
+    @property
+    def raw_article(self):
+        """Load the raw API article from the payload store, or None"""
+        if self.raw_ref is None or self.raw_index is None:
+            return None
+        payload = RawPayloadStore().get_json(self.raw_ref)
+        if not payload or self.raw_index >= len(payload.get('results', [])):
+            return None
+        return payload['results'][self.raw_index]
+
+    # Mapping-style access used throughout the dashboard components
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ or key in ('article_id', 'token_ids', 'clean_summary', 'raw_article')
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        """Plain dict of the stored fields"""
+        return {field: getattr(self, field) for field in self.__slots__ if field != 'tokens'}
+
+    def __getstate__(self):
+        # Token IDs only mean something to this process's vocabulary
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):    # (None, slots) as pickled by earlier versions
+            state = state[1]
+        for field, value in state.items():
+            setattr(self, field, value)
+        self.tokens = None
+
+    def __repr__(self):
+        return f"ThreatArticle({self.title!r}, score={self.threat_score})"
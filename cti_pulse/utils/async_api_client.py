@@ -0,0 +1,259 @@
+import asyncio
+import json
+import threading
+from urllib.parse import urlparse
+
+import aiohttp
+
+from config.settings import API_CONFIG, ASYNC_API_CONFIG, STREAMING_CONFIG, CACHE_CONFIG
+from utils.api_client import (
+    build_threat_payload,
+    build_headers,
+    get_raw_store,
+    read_threat_response,
+    response_cache_key,
+    ThreatResponseReader
+)
+from utils.cache_backend import ObjectCache, get_cache
+from utils.result_fusion import fanout_queries, reciprocal_rank_fusion
+
+
+class AsyncAPIClient:
+    """Asyncio-based API client for threat intelligence data
+
+    Uses the same request payload and response handling as ``APIClient`` but
+    multiplexes many requests on one event loop over a pooled connector.
+    Unlike ``APIClient`` it does not write to Streamlit, so it is safe to use
+    from background jobs; failures are recorded in ``self.errors``.
+    """
+
+    def __init__(self, pool_size=None, per_host_limit=None, use_cache=True):
+        self.api_url = API_CONFIG['url']
+        self.api_key = API_CONFIG['key']
+        self.timeout = API_CONFIG['timeout']
+        self.max_results = API_CONFIG['max_results']
+        self.pool_size = pool_size or ASYNC_API_CONFIG['pool_size']
+        self.per_host_limit = per_host_limit or ASYNC_API_CONFIG['per_host_limit']
+
+        self.headers = build_headers(self.api_key)
+        self.raw_store = get_raw_store()
+        self.response_cache = ObjectCache(get_cache(), 'api')
+        self.use_cache = use_cache
+        self.errors = {}
+
+        self._session = None
+        self._host_semaphores = {}
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_session(self):
+        """Create the pooled HTTP session on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.per_host_limit)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        return self._session
+
+    async def close(self):
+        """Close the pooled session and release its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        # Semaphores are bound to the loop they were first used on
+        self._host_semaphores = {}
+
+    def _host_semaphore(self, url):
+        """Get the concurrency limiter for the host serving ``url``"""
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    def _remaining(self, deadline):
+        """Seconds left before ``deadline`` (a loop.time() value), capped at the request timeout"""
+        if deadline is None:
+            return self.timeout
+        return min(self.timeout, deadline - asyncio.get_running_loop().time())
+
+    async def get_threat_data(self, threat_keyword, num_results=20, deadline=None):
+        """Get threat intelligence data for a keyword, or None on failure
+
+        ``deadline`` is an absolute ``loop.time()`` value shared by every
+        request in a batch; time spent waiting for a connection slot counts
+        against it. Cancellation is propagated to the caller.
+        """
+        remaining = self._remaining(deadline)
+        if remaining <= 0:
+            self.errors[threat_keyword] = "Deadline exceeded before request was sent"
+            return None
+
+        try:
+            return await asyncio.wait_for(self._request(threat_keyword, num_results), timeout=remaining)
+        except asyncio.TimeoutError:
+            self.errors[threat_keyword] = "Timeout"
+            return None
+        except aiohttp.ClientError as e:
+            self.errors[threat_keyword] = f"Network error: {str(e)}"
+            return None
+        except ValueError as e:
+            self.errors[threat_keyword] = f"Invalid response: {str(e)}"
+            return None
+
+    async def _request(self, threat_keyword, num_results):
+        """Send one search request under the per-host limit, using the shared response cache
+
+        With ``use_cache=False`` cached responses are not read (callers that
+        need fresh data, such as the alert watcher), but fresh responses are
+        still cached for everyone else.
+        """
+        payload = build_threat_payload(threat_keyword, num_results, self.max_results)
+        cache_key = response_cache_key(self.api_url, payload)
+        if self.use_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        data = await self._post(threat_keyword, payload)
+        if data is not None:
+            self.response_cache.set(cache_key, data, ttl=CACHE_CONFIG['api_ttl'])
+        return data
+
+    async def _post(self, threat_keyword, payload):
+        session = await self._get_session()
+
+        async with self._host_semaphore(self.api_url):
+            async with session.post(self.api_url, data=json.dumps(payload)) as response:
+                if response.status == 200:
+                    self.errors.pop(threat_keyword, None)
+                    return await self._read_response(response)
+
+                text = await response.text()
+                self.errors[threat_keyword] = f"API Error {response.status}: {text[:200]}"
+                return None
+
+    async def _read_response(self, response):
+        """Decode a successful response, streaming the body when enabled"""
+        # Decoding, gzip and the raw store's disk writes run in a worker thread, off the event loop
+        if not STREAMING_CONFIG['enabled']:
+            return await asyncio.to_thread(read_threat_response, await response.read(), self.raw_store)
+
+        reader = await asyncio.to_thread(ThreatResponseReader, self.raw_store)
+        try:
+            async for chunk in response.content.iter_chunked(STREAMING_CONFIG['chunk_size']):
+                await asyncio.to_thread(reader.feed, chunk)
+        except BaseException:
+            reader.abort()
+            raise
+        return await asyncio.to_thread(reader.finish)
+
+    async def get_many(self, threat_keywords, num_results=20, deadline_seconds=None):
+        """Fetch several keywords concurrently under one overall deadline
+
+        Returns a dict mapping each keyword to its response (or None).
+        """
+        if deadline_seconds is None:
+            deadline_seconds = ASYNC_API_CONFIG['default_deadline']
+        deadline = asyncio.get_running_loop().time() + deadline_seconds
+
+        keywords = list(dict.fromkeys(threat_keywords))
+        results = await asyncio.gather(
+            *(self.get_threat_data(keyword, num_results, deadline) for keyword in keywords)
+        )
+        return dict(zip(keywords, results))
+
+    async def get_threat_data_fanout(self, threat_keyword, num_results=20, deadline_seconds=None):
+        """Query a threat and its synonyms concurrently and merge the results
+
+        Every query runs under one shared deadline, so the fan-out costs
+        about as long as the slowest single query. Results are de-duplicated
+        by URL and ranked with reciprocal-rank fusion; the top
+        ``num_results`` are returned in the same shape as
+        ``get_threat_data`` plus a ``'fanout'`` entry with per-query hits.
+        Returns None only if every query fails.
+        """
+        queries = fanout_queries(threat_keyword)
+        responses = await self.get_many(queries, num_results, deadline_seconds)
+
+        ranked_lists = {query: data['results'] for query, data in responses.items()
+                        if data and isinstance(data.get('results'), list)}
+        if not ranked_lists:
+            return None
+
+        merged = reciprocal_rank_fusion(ranked_lists, limit=num_results)
+        results = []
+        for article, fused_score, matched_queries in merged:
+            article = dict(article)
+            article['rrf_score'] = fused_score
+            article['matched_queries'] = matched_queries
+            results.append(article)
+
+        data = {
+            'total': len(results),
+            'results': results,
+            'fanout': {
+                'queries': queries,
+                'hits': {query: len(hits) for query, hits in ranked_lists.items()},
+                'failed': [query for query in queries if query not in ranked_lists]
+            }
+        }
+        # Store the merged list so raw_ref/raw_index resolve to these results
+        data['raw_ref'] = await asyncio.to_thread(self.raw_store.put_json, data) if self.raw_store is not None else None
+        return data
+
+    # Sync facade for existing (non-async) callers
+
+    def get_threat_data_sync(self, threat_keyword, num_results=20):
+        """Blocking equivalent of ``get_threat_data``"""
+        return self.get_many_sync([threat_keyword], num_results)[threat_keyword]
+
+    def get_many_sync(self, threat_keywords, num_results=20, deadline_seconds=None):
+        """Blocking equivalent of ``get_many``"""
+        async def _run():
+            try:
+                return await self.get_many(threat_keywords, num_results, deadline_seconds)
+            finally:
+                await self.close()
+
+        return run_sync(_run())
+
+    def get_threat_data_fanout_sync(self, threat_keyword, num_results=20, deadline_seconds=None):
+        """Blocking equivalent of ``get_threat_data_fanout``"""
+        async def _run():
+            try:
+                return await self.get_threat_data_fanout(threat_keyword, num_results, deadline_seconds)
+            finally:
+                await self.close()
+
+        return run_sync(_run())
+
+
+def run_sync(coro):
+    """Run a coroutine to completion from synchronous code
+
+    Falls back to a helper thread when the calling thread already has a
+    running event loop (e.g. inside a notebook).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def _target():
+        try:
+            result['value'] = asyncio.run(coro)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=_target, daemon=True)
+    thread.start()
+    thread.join()
+
+    if 'error' in result:
+        raise result['error']
+    return result['value']
@@ -0,0 +1,170 @@
+import json
+import re
+import threading
+
+from config.settings import ATTACK_CONFIG
+
+# Phrases and article text are split into the same lower-case word tokens,
+# so "pass-the-hash", "Pass the hash" and "pass the hash" all match and a
+# phrase never matches inside a longer word ("rat" in "pirate").
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return _WORD_RE.findall(text.lower())
+
+
+class AhoCorasick:
+    """Word-level Aho-Corasick automaton
+
+    Matches every pattern (a sequence of words) in one left-to-right pass
+    over a token list. Each step is amortised O(1) regardless of how many
+    patterns were compiled in, so tagging cost depends only on the length
+    of the text. Words not in any pattern reset straight to the root.
+    """
+
+    def __init__(self, patterns):
+        """Compile ``(words, value)`` pairs; ``words`` is a sequence of tokens"""
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self.vocabulary = set()
+
+        for words, value in patterns:
+            state = 0
+            for word in words:
+                self.vocabulary.add(word)
+                next_state = self._goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][word] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            if value not in self._output[state]:
+                self._output[state] += (value,)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        # Breadth-first, so a state's failure target is final before its children's
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for word, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit matches that end at the failure target (suffix patterns)
+                self._output[child] += tuple(v for v in self._output[self._fail[child]]
+                                             if v not in self._output[child])
+
+    def __len__(self):
+        return len(self._goto)
+
+    def search(self, words):
+        """Yield the value of every pattern occurrence in ``words``"""
+        goto, fail, output, vocabulary = self._goto, self._fail, self._output, self.vocabulary
+        state = 0
+        for word in words:
+            if word not in vocabulary:
+                state = 0
+                continue
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if output[state]:
+                yield from output[state]
+
+
+class AttackTagger:
+    """Tag article text with MITRE ATT&CK techniques from a local mapping
+
+    The mapping (``config/attack_techniques.json``) lists techniques with
+    their tactics and the phrases news coverage uses for them; all phrases
+    are compiled into a single AhoCorasick automaton.
+    """
+
+    def __init__(self, mapping):
+        self.source = mapping.get('source', '')
+        self.tactics = dict(mapping['tactics'])
+        self.techniques = {}
+        patterns = []
+        for technique in mapping['techniques']:
+            self.techniques[technique['id']] = {
+                'name': technique['name'],
+                'tactics': tuple(self.tactics[tactic] for tactic in technique['tactics'])
+            }
+            for phrase in technique['phrases']:
+                words = tokenize(phrase)
+                if words:
+                    patterns.append((words, technique['id']))
+
+        self.pattern_count = len(patterns)
+        self.automaton = AhoCorasick(patterns)
+
+    @classmethod
+    def from_file(cls, path=None):
+        with open(path or ATTACK_CONFIG['mapping_path'], encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def tag(self, *texts):
+        """Technique ids found in the texts, in order of first match"""
+        found = {}
+        for text in texts:
+            if text:
+                for technique_id in self.automaton.search(tokenize(text)):
+                    found.setdefault(technique_id, None)
+        return tuple(found)
+
+    def tag_article(self, article):
+        """Technique ids from an article's title, summary and highlights"""
+        return self.tag(article.get('title', ''), article.get('summary', ''),
+                        *(article.get('highlights') or ()))
+
+    def technique_label(self, technique_id):
+        """``'T1486 Data Encrypted for Impact'``"""
+        technique = self.techniques.get(technique_id)
+        return f"{technique_id} {technique['name']}" if technique else technique_id
+
+    def tactics_for(self, technique_ids):
+        """Distinct tactic names covered by the given techniques"""
+        tactics = {}
+        for technique_id in technique_ids:
+            for tactic in self.techniques.get(technique_id, {}).get('tactics', ()):
+                tactics.setdefault(tactic, None)
+        return tuple(tactics)
+
+    def tactic_names(self):
+        """Tactic names in kill-chain order"""
+        return list(self.tactics.values())
+
+
+_tagger = None
+_tagger_lock = threading.Lock()
+
+
+def get_attack_tagger():
+    """Process-wide tagger, compiled from the mapping file on first use"""
+    global _tagger
+    with _tagger_lock:
+        if _tagger is None:
+            _tagger = AttackTagger.from_file()
+        return _tagger
+
+
+def filter_by_tactics(all_threat_data, tactics):
+    """Narrow a dashboard view to articles tagged with any of the given tactics"""
+    if not tactics:
+        return all_threat_data
+    tagger = get_attack_tagger()
+    wanted = set(tactics)
+    view = {}
+    for threat, data in all_threat_data.items():
+        analysis = [article for article in data['analysis']
+                    if wanted.intersection(tagger.tactics_for(article.get('techniques') or ()))]
+        view[threat] = dict(data, analysis=analysis, article_count=len(analysis))
+    return view
@@ -0,0 +1,270 @@
+import fnmatch
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from config.settings import CACHE_CONFIG
+
+
+class CacheBackend(ABC):
+    """Key/value cache interface
+
+    Method names and signatures follow redis-py (``get``, ``set`` with
+    ``ex``, ``delete``, ``exists``, ``keys``, ``mget``) so a ``redis.Redis``
+    client can be used directly; the in-memory and SQLite classes are
+    local stand-ins. Keys are strings and values are bytes.
+    """
+
+    @abstractmethod
+    def get(self, name):
+        ...
+
+    @abstractmethod
+    def set(self, name, value, ex=None):
+        ...
+
+    @abstractmethod
+    def delete(self, *names):
+        ...
+
+    def exists(self, *names):
+        return sum(1 for name in names if self.get(name) is not None)
+
+    @abstractmethod
+    def keys(self, pattern='*'):
+        ...
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+
+class MemoryCache(CacheBackend):
+    """Thread-safe in-process cache with per-key expiry"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[name]
+                return None
+            return value
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._data[name] = (value, time.time() + ex if ex else None)
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(1 for name in names if self._data.pop(name, None) is not None)
+
+    def keys(self, pattern='*'):
+        now = time.time()
+        with self._lock:
+            return [key for key, (_, expires_at) in self._data.items()
+                    if (expires_at is None or expires_at > now) and fnmatch.fnmatchcase(key, pattern)]
+
+
+class SQLiteCache(CacheBackend):
+    """Cache in a shared SQLite file, safe across processes on one host
+
+    Uses WAL journaling so readers in other Streamlit replicas are not
+    blocked by writers. Each thread gets its own connection. Expired rows
+    are deleted when the cache is opened and then by ``set()`` at most
+    every ``purge_interval`` seconds, so entries nobody reads again do
+    not pile up in the file.
+    """
+
+    def __init__(self, path=None, purge_interval=None):
+        self.path = path or CACHE_CONFIG['sqlite_path']
+        self.purge_interval = purge_interval or CACHE_CONFIG['purge_interval']
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_updated ON cache (updated_at)")
+        conn.commit()
+        self.purge_expired()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, name):
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (name, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, name, value, ex=None):
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?)",
+            (name, sqlite3.Binary(value), now + ex if ex else None, now)
+        )
+        conn.commit()
+        if now - self._purged_at >= self.purge_interval:
+            self.purge_expired()
+        return True
+
+    def delete(self, *names):
+        conn = self._conn()
+        deleted = conn.executemany("DELETE FROM cache WHERE key = ?", [(name,) for name in names]).rowcount
+        conn.commit()
+        return deleted
+
+    def keys(self, pattern='*'):
+        """Matching keys, most recently written first (GLOB matches Redis patterns)"""
+        rows = self._conn().execute(
+            "SELECT key FROM cache WHERE key GLOB ? AND (expires_at IS NULL OR expires_at > ?) "
+            "ORDER BY updated_at DESC",
+            (pattern, time.time())
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def purge_expired(self):
+        """Delete expired rows; returns how many"""
+        self._purged_at = time.time()
+        conn = self._conn()
+        purged = conn.execute("DELETE FROM cache WHERE expires_at <= ?", (self._purged_at,)).rowcount
+        conn.commit()
+        return purged
+
+
+class TieredCache(CacheBackend):
+    """Per-process memory tier in front of a shared backend
+
+    Reads are served from memory when possible; misses fall through to the
+    shared backend and are copied into memory for ``local_ttl`` seconds.
+    Writes go to both tiers.
+    """
+
+    def __init__(self, shared, local_ttl=None):
+        self.shared = shared
+        self.local = MemoryCache()
+        self.local_ttl = local_ttl or CACHE_CONFIG['local_ttl']
+
+    def get(self, name):
+        value = self.local.get(name)
+        if value is None:
+            value = self.shared.get(name)
+            if value is not None:
+                self.local.set(name, value, ex=self.local_ttl)
+        return value
+
+    def set(self, name, value, ex=None):
+        self.local.set(name, value, ex=min(ex, self.local_ttl) if ex else self.local_ttl)
+        return self.shared.set(name, value, ex=ex)
+
+    def delete(self, *names):
+        self.local.delete(*names)
+        return self.shared.delete(*names)
+
+    def keys(self, pattern='*'):
+        return self.shared.keys(pattern)
+
+    def warm(self, prefixes, limit):
+        """Copy up to ``limit`` entries per key prefix from the shared tier into memory"""
+        warmed = 0
+        for prefix in prefixes:
+            keys = list(self.shared.keys(f"{prefix}*"))[:limit]
+            for key, value in zip(keys, self.shared.mget(keys) if keys else []):
+                if isinstance(key, bytes):  # redis-py returns bytes keys
+                    key = key.decode('utf-8')
+                if value is not None:
+                    self.local.set(key, value, ex=self.local_ttl)
+                    warmed += 1
+        return warmed
+
+
+class ObjectCache:
+    """Pickling wrapper storing Python objects in a cache backend
+
+    Only use with backends shared between trusted CyberPulse processes:
+    values are unpickled on read.
+    """
+
+    def __init__(self, backend, namespace):
+        self.backend = backend
+        self.namespace = namespace
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def get(self, key):
+        value = self.backend.get(self._key(key))
+        return pickle.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        return self.backend.set(self._key(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), ex=ttl)
+
+    def delete(self, key):
+        return self.backend.delete(self._key(key))
+
+
+def create_cache_backend(backend=None):
+    """Create the backend named in CACHE_CONFIG ('memory', 'sqlite' or 'redis')"""
+    backend = backend or CACHE_CONFIG['backend']
+
+    if backend == 'memory':
+        return MemoryCache()
+    if backend == 'sqlite':
+        shared = SQLiteCache()
+    elif backend == 'redis':
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("The 'redis' cache backend requires the redis package: pip install redis")
+        shared = redis.Redis.from_url(CACHE_CONFIG['redis_url'])
+    else:
+        raise ValueError(f"Unknown cache backend: {backend}")
+
+    return TieredCache(shared) if CACHE_CONFIG['local_tier'] else shared
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache backend"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = create_cache_backend()
+        return _cache
+
+
+def warm_cache():
+    """Preload recent shared entries into this process's memory tier
+
+    Called once when a replica starts so its first requests are served
+    from entries other replicas already fetched and analysed.
+    """
+    cache = get_cache()
+    if not isinstance(cache, TieredCache):
+        return 0
+    return cache.warm(CACHE_CONFIG['warm_prefixes'], CACHE_CONFIG['warm_limit'])
@@ -0,0 +1,219 @@
+import threading
+import zlib
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from config.settings import CLUSTER_CONFIG
+from utils.tokens import article_tokens, get_vocabulary, is_term
+
+# Universal hashing modulo a Mersenne prime; a < 2**31 and shingle hashes
+# < 2**32 keep a * x + b inside uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+class Cluster:
+    """One incident or campaign: articles whose text is near-duplicate"""
+
+    __slots__ = ('cluster_id', 'article_ids', 'signatures', '_member_keys', '_member_signatures',
+                 '_signature_count')
+
+    def __init__(self, cluster_id, member_signatures):
+        self.cluster_id = cluster_id
+        self.article_ids = []
+        # Ring buffer of the most recent member signatures, one row each; grown
+        # a row at a time, as most clusters only ever have one member
+        self.signatures = None
+        # Band keys of the same members, so the cluster can be taken out of
+        # buckets no stored member hashes to any more
+        self._member_keys = deque()
+        self._member_signatures = member_signatures
+        self._signature_count = 0
+
+    def __len__(self):
+        return len(self.article_ids)
+
+    def add_signature(self, signature, keys):
+        """Store a member's signature and band keys; returns the keys no stored member has any more"""
+        self._member_keys.append(tuple(keys))
+        released = []
+        if len(self._member_keys) > self._member_signatures:
+            oldest = self._member_keys.popleft()
+            kept = self.band_keys()
+            released = [key for key in oldest if key not in kept]
+
+        if self.signatures is None:
+            self.signatures = signature[None, :].copy()
+        elif len(self.signatures) < self._member_signatures:
+            self.signatures = np.vstack((self.signatures, signature))
+        else:
+            self.signatures[self._signature_count % self._member_signatures] = signature
+        self._signature_count += 1
+        return released
+
+    def band_keys(self):
+        """LSH bucket keys of the stored member signatures"""
+        return set().union(*self._member_keys)
+
+    def similarity(self, signature):
+        """Estimated Jaccard similarity to the closest stored member"""
+        if self.signatures is None:
+            return 0.0
+        return (self.signatures == signature).sum(axis=1).max() / signature.size
+
+
+class CampaignClusterer:
+    """Incremental near-duplicate clustering with MinHash LSH
+
+    Each article is reduced to a MinHash signature of its word shingles.
+    Signatures are split into bands and bucketed by hashing each band.
+    A new article is compared only with clusters that share a bucket with
+    it, then either joins the most similar one (estimated Jaccard at least
+    ``threshold``) or starts a new cluster. The per-article cost depends on
+    the signature size and the bounded bucket length, not on the number of
+    articles or clusters seen so far. Nothing is ever re-clustered.
+
+    Shared by every session in the process, so access is locked.
+    """
+
+    def __init__(self, num_perm=None, bands=None, shingle_size=None, threshold=None, max_bucket=None,
+                 max_clusters=None, member_signatures=None, seed=1):
+        self.num_perm = num_perm or CLUSTER_CONFIG['num_perm']
+        self.bands = bands or CLUSTER_CONFIG['bands']
+        if self.num_perm % self.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.rows = self.num_perm // self.bands
+        self.shingle_size = shingle_size or CLUSTER_CONFIG['shingle_size']
+        self.threshold = threshold or CLUSTER_CONFIG['threshold']
+        self.max_bucket = max_bucket or CLUSTER_CONFIG['max_bucket']
+        self.max_clusters = max_clusters or CLUSTER_CONFIG['max_clusters']
+        self.member_signatures = member_signatures or CLUSTER_CONFIG['member_signatures']
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), self.num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, int(_PRIME), self.num_perm, dtype=np.uint64)[:, None]
+
+        self._buckets = {}
+        self._clusters = OrderedDict()
+        self._assignments = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.stats = {'articles': 0, 'candidates': 0, 'joined': 0}
+
+    def shingles(self, token_ids):
+        """Stable 32-bit hashes of the distinct content-word n-grams of a token ID array"""
+        vocabulary = get_vocabulary()
+        token_ids = token_ids[vocabulary.column('term', is_term, bool)[token_ids]]
+        if self.shingle_size == 1:
+            crc32 = vocabulary.column('crc32', lambda word: zlib.crc32(word.encode()), np.uint64)
+            return crc32[np.unique(token_ids)]
+        words = [vocabulary.words[token] for token in token_ids.tolist()]
+        n = min(self.shingle_size, len(words))
+        grams = {' '.join(words[i:i + n]) for i in range(len(words) - n + 1)}
+        return np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, token_ids):
+        """MinHash signature (``num_perm`` values), or None for text without content words"""
+        shingles = self.shingles(token_ids)
+        if not shingles.size:
+            return None
+        return ((self._a * shingles[None, :] + self._b) % _PRIME).min(axis=1)
+
+    def _band_keys(self, signature):
+        """One int per band (a hash of the band's rows); a collision only adds a candidate"""
+        rows = self.rows
+        return [hash((band, signature[band * rows:(band + 1) * rows].tobytes())) for band in range(self.bands)]
+
+    def add(self, article):
+        """Assign an article to a cluster, returning the cluster id (idempotent)"""
+        article_id = article['article_id']
+        with self._lock:
+            cluster_id = self._assignments.get(article_id)
+            if cluster_id is not None and cluster_id in self._clusters:
+                return cluster_id
+
+        title_ids = get_vocabulary().encode(article.get('title', ''))
+        signature = self.signature(np.concatenate((title_ids, article_tokens(article))))
+
+        with self._lock:
+            self.stats['articles'] += 1
+            cluster = None
+            keys = self._band_keys(signature) if signature is not None else []
+
+            # Candidate clusters share at least one band bucket
+            candidates = {cid for key in keys for cid in self._buckets.get(key, ()) if cid in self._clusters}
+            self.stats['candidates'] += len(candidates)
+            best = 0.0
+            for cid in candidates:
+                score = self._clusters[cid].similarity(signature)
+                if score >= self.threshold and score > best:
+                    best, cluster = score, self._clusters[cid]
+
+            if cluster is None:
+                cluster = self._new_cluster()
+            else:
+                self.stats['joined'] += 1
+                self._clusters.move_to_end(cluster.cluster_id)
+
+            cluster.article_ids.append(article_id)
+            self._assignments[article_id] = cluster.cluster_id
+            if signature is None:
+                return cluster.cluster_id
+
+            # The cluster stays in the buckets of its stored member signatures only
+            for key in cluster.add_signature(signature, keys):
+                self._unbucket(key, cluster.cluster_id)
+            for key in keys:
+                # Tuples, as most buckets only ever hold one cluster; newest max_bucket ids kept
+                bucket = self._buckets.get(key, ())
+                if cluster.cluster_id not in bucket:
+                    self._buckets[key] = (bucket + (cluster.cluster_id,))[-self.max_bucket:]
+            return cluster.cluster_id
+
+    def _unbucket(self, key, cluster_id):
+        """Take a cluster out of an LSH bucket, dropping the bucket once empty"""
+        bucket = self._buckets.get(key, ())
+        if cluster_id in bucket:
+            bucket = tuple(cid for cid in bucket if cid != cluster_id)
+            if bucket:
+                self._buckets[key] = bucket
+            else:
+                del self._buckets[key]
+
+    def _new_cluster(self):
+        cluster = Cluster(self._next_id, self.member_signatures)
+        self._next_id += 1
+        self._clusters[cluster.cluster_id] = cluster
+
+        # Forget the least recently grown clusters, with their assignments and bucket entries
+        while len(self._clusters) > self.max_clusters:
+            _, evicted = self._clusters.popitem(last=False)
+            for article_id in evicted.article_ids:
+                self._assignments.pop(article_id, None)
+            for key in evicted.band_keys():
+                self._unbucket(key, evicted.cluster_id)
+        return cluster
+
+    def add_many(self, articles):
+        for article in articles:
+            self.add(article)
+
+    def cluster_of(self, article_id):
+        with self._lock:
+            return self._clusters.get(self._assignments.get(article_id))
+
+    def group(self, articles):
+        """Group articles by cluster, keeping the order of each group's first article
+
+        Articles not seen before are assigned first, so a view can always
+        be grouped. Returns ``[(cluster, [articles...]), ...]``.
+        """
+        groups = OrderedDict()
+        for article in articles:
+            cluster_id = self.add(article)
+            groups.setdefault(cluster_id, []).append(article)
+        with self._lock:
+            return [(self._clusters.get(cluster_id), members) for cluster_id, members in groups.items()]
+
+    def __len__(self):
+        return len(self._clusters)
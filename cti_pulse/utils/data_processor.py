@@ -1,26 +1,24 @@
-import numpy as np
-from collections import Counter
+from utils.rollups import ThreatRollup
 
 
-def generate_executive_summary(all_threat_data):
-    """Generate executive summary data"""
-    total_threats = sum(len(data['analysis']) for data in all_threat_data.values())
-    high_severity = sum(1 for data in all_threat_data.values()
-                        for article in data['analysis'] if article['threat_score'] >= 6)
+def generate_executive_summary(all_threat_data, rollup=None, trend_detector=None):
+    """Generate executive summary data
 
-    # Find trending threats
-    threat_counts = {threat: len(data['analysis']) for threat, data in all_threat_data.items()}
-    top_threat = max(threat_counts, key=threat_counts.get) if threat_counts else "None"
-
-    # Average sentiment
-    all_articles = [article for data in all_threat_data.values() for article in data['analysis']]
-    avg_sentiment = np.mean([a['sentiment_compound'] for a in all_articles]) if all_articles else 0
+    Reads the precomputed ``rollup`` when given; otherwise builds one from
+    the view in a single pass. With a ``trend_detector``, threats whose
+    current volume is spiking against their own baseline are listed as
+    surging, strongest first.
+    """
+    if rollup is None:
+        rollup = ThreatRollup.from_view(all_threat_data)
 
+    surging = trend_detector.surging('threat') if trend_detector is not None else {}
     return {
-        'total_threats': total_threats,
-        'high_severity': high_severity,
-        'top_threat': top_threat,
-        'avg_sentiment': avg_sentiment
+        'total_threats': rollup.total,
+        'high_severity': rollup.high_severity,
+        'top_threat': rollup.top_threat,
+        'avg_sentiment': rollup.avg_sentiment,
+        'surging': sorted(surging, key=lambda name: surging[name]['z'], reverse=True)
     }
 
 
@@ -50,22 +48,32 @@ def process_timeline_data(all_articles):
 
 def get_category_distribution(all_articles):
     """Get threat category distribution"""
-    categories = [article['category'] for article in all_articles]
-    return Counter(categories)
+    return ThreatRollup(all_articles).category_distribution()
 
 
 def get_severity_distribution(all_articles):
     """Get severity level distribution"""
-    return {
-        'Low (1-3)': sum(1 for a in all_articles if 1 <= a['threat_score'] <= 3),
-        'Medium (4-6)': sum(1 for a in all_articles if 4 <= a['threat_score'] <= 6),
-        'High (7-8)': sum(1 for a in all_articles if 7 <= a['threat_score'] <= 8),
-        'Critical (9-10)': sum(1 for a in all_articles if 9 <= a['threat_score'] <= 10)
-    }
+    return ThreatRollup(all_articles).severity_distribution()
 
 
 def get_source_analysis(all_articles, top_n=10):
     """Get top sources analysis"""
-    sources = [article['source'] for article in all_articles]
-    source_counts = Counter(sources)
-    return dict(source_counts.most_common(top_n))
\ No newline at end of file
+    return ThreatRollup(all_articles).top_sources(top_n)
+
+
+def filter_by_severity(threat_data, min_severity):
+    """Build the dashboard view of stored threat data at a severity threshold
+
+    ``threat_data`` maps each threat to its stored entry holding a
+    ScoredArticleIndex under ``'index'``; the view has the ``'analysis'``
+    and ``'article_count'`` keys the dashboard components read.
+    """
+    view = {}
+    for threat, data in threat_data.items():
+        analysis = data['index'].at_least(min_severity)
+        view[threat] = {
+            'analysis': analysis,
+            'article_count': len(analysis),
+            'total_count': len(data['index'])
+        }
+    return view
@@ -0,0 +1,196 @@
+import math
+import threading
+import time
+from collections import Counter
+from datetime import date
+
+from config.settings import EMERGING_CONFIG
+from utils.sketches import BloomFilter, SpaceSaving
+from utils.tokens import get_vocabulary, is_term
+from utils.trends import day_number, is_future
+
+# History columns the extractor reads
+TERM_COLUMNS = ('article_id', 'threat_keyword', 'summary', 'published_date')
+
+
+def summary_terms(summary):
+    """Distinct candidate terms of a summary: cleaned words minus stopwords"""
+    vocabulary = get_vocabulary()
+    token_ids = set(vocabulary.encode(summary or '').tolist())
+    term = vocabulary.column('term', is_term, bool)
+    return {vocabulary.words[token] for token in token_ids if term[token]}
+
+
+class DayTerms:
+    """Space-Saving counts of the articles mentioning each term on one day
+
+    Also remembers which threats each tracked term appeared under, for
+    terms still held by the summary; entries for evicted terms are pruned.
+    """
+
+    __slots__ = ('articles', 'terms', 'threats')
+
+    def __init__(self, capacity):
+        self.articles = 0
+        self.terms = SpaceSaving(capacity)
+        self.threats = {}
+
+    def add(self, terms, threat):
+        self.articles += 1
+        tracked = self.terms.counts
+        for term in terms:
+            self.terms.add(term)
+            if term in tracked:
+                self.threats.setdefault(term, Counter())[threat] += 1
+        if len(self.threats) > 2 * self.terms.capacity:
+            self.threats = {term: threats for term, threats in self.threats.items() if term in tracked}
+
+
+class EmergingTerms:
+    """Windowed heavy-hitter terms in summaries, scored against a background window
+
+    Each publication day keeps a Space-Saving summary of how many articles
+    mention each term. The current window (the newest ``window_days``) and
+    the background (the ``background_days`` before it) are merged on
+    demand. A term is emerging when its guaranteed share of current
+    articles (count minus Space-Saving error) is ``min_lift`` times its
+    largest possible share of background articles. Memory is bounded by
+    the number of days kept times ``capacity`` counters.
+
+    Using bounds on both sides means eviction noise never looks like a
+    new term. The price is resolution: a term can only be confirmed once
+    it is in roughly ``min_lift * terms per summary / capacity`` of the
+    current articles (about 5% with 50-word summaries).
+
+    Re-ingested articles are skipped with one Bloom filter per day, dropped
+    with the day's counts. Articles dated more than a day in the future
+    are ignored: a bad date would otherwise become the newest day and
+    expire every real one.
+
+    Follows the HistoryStore like TrendDetector, starting from articles
+    ingested within the last window and background, so no snapshot is
+    needed.
+    """
+
+    def __init__(self, window_days=None, background_days=None, capacity=None, min_count=None, min_lift=None):
+        self.window_days = window_days or EMERGING_CONFIG['window_days']
+        self.background_days = background_days or EMERGING_CONFIG['background_days']
+        self.capacity = capacity or EMERGING_CONFIG['capacity']
+        self.min_count = min_count or EMERGING_CONFIG['min_count']
+        self.min_lift = min_lift or EMERGING_CONFIG['min_lift']
+
+        self.days = {}
+        self.newest = None
+        self.seen = {}           # day -> Bloom filter of the day's (threat, article id)
+        self.mark = None
+        self.stats = {'articles': 0, 'duplicates': 0, 'expired': 0, 'future': 0}
+        self._result = (None, None)    # (articles counted, emerging terms) of the last query
+        self._synced_at = 0.0
+        self._lock = threading.RLock()
+
+    def add(self, article):
+        """Count the distinct terms of one article's summary on its publication day"""
+        day = day_number(article.get('published_date'))
+        if day is None:
+            return
+        with self._lock:
+            if is_future(day):
+                self.stats['future'] += 1
+                return
+            if self.newest is not None and day <= self.newest - self.window_days - self.background_days:
+                self.stats['expired'] += 1
+                return
+            seen = self.seen.get(day)
+            if seen is None:
+                seen = self.seen[day] = BloomFilter(EMERGING_CONFIG['dedupe_capacity'])
+            if seen.add(f"{article['threat_keyword']}\x1f{article['article_id']}"):
+                self.stats['duplicates'] += 1
+                return
+
+            bucket = self.days.get(day)
+            if bucket is None:
+                bucket = self.days[day] = DayTerms(self.capacity)
+            bucket.add(summary_terms(article.get('summary')), article['threat_keyword'])
+            self.stats['articles'] += 1
+
+            if self.newest is None or day > self.newest:
+                self.newest = day
+                cutoff = day - self.window_days - self.background_days
+                for old in [old for old in self.days if old <= cutoff]:
+                    del self.days[old]
+                for old in [old for old in self.seen if old <= cutoff]:
+                    del self.seen[old]
+
+    def sync(self, history_store, force=False, interval=None):
+        """Count articles ingested since the last sync; returns the number read"""
+        interval = EMERGING_CONFIG['sync_interval'] if interval is None else interval
+        with self._lock:
+            if not force and time.time() - self._synced_at < interval:
+                return 0
+            self._synced_at = time.time()
+            if self.mark is None:
+                self.mark = history_store.mark_at(time.time() - (self.window_days + self.background_days) * 86400)
+
+            consumed = 0
+            while True:
+                rows = history_store.ingested_since(self.mark, columns=TERM_COLUMNS)
+                if not rows:
+                    return consumed
+                for row in rows:
+                    self.add(row)
+                consumed += len(rows)
+                self.mark = rows[-1]['rowid']
+
+    def emerging(self, n=None):
+        """Top ``n`` emerging terms, strongest first
+
+        Each entry has the term, its article count in the current window
+        and in the background (both upper bounds), the lift between the
+        two shares and the threats it appeared under most.
+        """
+        n = n or EMERGING_CONFIG['max_terms']
+        with self._lock:
+            if self.newest is None:
+                return []
+            counted, results = self._result
+            if counted == self.stats['articles']:
+                return results[:n]
+            window_start = self.newest - self.window_days + 1
+            current = [bucket for day, bucket in self.days.items() if day >= window_start]
+            background = [bucket for day, bucket in self.days.items() if day < window_start]
+            current_terms = SpaceSaving.merged([bucket.terms for bucket in current], self.capacity)
+            background_terms = SpaceSaving.merged([bucket.terms for bucket in background], self.capacity)
+            current_articles = sum(bucket.articles for bucket in current)
+            background_articles = sum(bucket.articles for bucket in background)
+            threats = {}
+            for bucket in current:
+                for term, counts in bucket.threats.items():
+                    threats.setdefault(term, Counter()).update(counts)
+            counted = self.stats['articles']
+
+        results = []
+        floor = background_terms.min_count()
+        for term, count, error in current_terms.top():
+            guaranteed = count - error
+            if guaranteed < self.min_count:
+                continue
+            background_count = background_terms.counts.get(term, floor)
+            lift = (guaranteed / current_articles) / ((background_count + 1) / (background_articles + 1))
+            if lift >= self.min_lift:
+                results.append({
+                    'term': term,
+                    'count': count,
+                    'background': background_count,
+                    'lift': round(lift, 1),
+                    'threats': [threat for threat, _ in threats.get(term, Counter()).most_common(2)],
+                    'score': guaranteed * math.log(lift)
+                })
+        results.sort(key=lambda entry: entry['score'], reverse=True)
+        self._result = (counted, results)
+        return results[:n]
+
+    def window(self):
+        """First and last day of the current window, as dates"""
+        if self.newest is None:
+            return None, None
+        return date.fromordinal(self.newest - self.window_days + 1), date.fromordinal(self.newest)
@@ -0,0 +1,160 @@
+import os
+import sqlite3
+import threading
+import time
+
+from config.settings import HISTORY_CONFIG
+
+HISTORY_FIELDS = (
+    'article_id',
+    'threat_keyword',
+    'category',
+    'source',
+    'title',
+    'summary',
+    'url',
+    'published_date',
+    'threat_score',
+    'sentiment_compound',
+    'sentiment_neg',
+    'raw_ref',
+    'raw_index'
+)
+
+
+class HistoryStore:
+    """Persistent SQLite history of analysed articles
+
+    One row per (threat keyword, article id); writing an article again
+    replaces its row, so repeated fetches and back-fills are idempotent.
+    Every write takes a rowid above all existing ones, so rowids follow
+    commit order and incremental consumers read the table as a log.
+    Like the SQLite cache backend it uses WAL journaling and one connection
+    per thread, so the dashboard, API service and back-fill job can share
+    the file.
+    """
+
+    def __init__(self, path=None, batch_size=None):
+        self.path = path or HISTORY_CONFIG['path']
+        self.batch_size = batch_size or HISTORY_CONFIG['batch_size']
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "article_id TEXT NOT NULL, threat_keyword TEXT NOT NULL, category TEXT, source TEXT, "
+            "title TEXT, summary TEXT, url TEXT, published_date TEXT, threat_score REAL, "
+            "sentiment_compound REAL, sentiment_neg REAL, raw_ref TEXT, raw_index INTEGER, "
+            "ingested_at REAL NOT NULL, PRIMARY KEY (threat_keyword, article_id))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS articles_ingested ON articles (ingested_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS articles_score ON articles (threat_score)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def add_articles(self, articles):
+        """Upsert analysed articles in batches, returning the number written"""
+        conn = self._conn()
+        now = time.time()
+        written = 0
+        batch = []
+        placeholders = ', '.join('?' for _ in range(len(HISTORY_FIELDS) + 1))
+        # An explicit rowid: a replaced row that held the highest rowid would otherwise get it back
+        sql = (f"INSERT OR REPLACE INTO articles (rowid, {', '.join(HISTORY_FIELDS)}, ingested_at) "
+               f"VALUES ((SELECT IFNULL(MAX(rowid), 0) + 1 FROM articles), {placeholders})")
+
+        for article in articles:
+            batch.append(tuple(article.get(field) for field in HISTORY_FIELDS) + (now,))
+            if len(batch) >= self.batch_size:
+                written += self._write(conn, sql, batch)
+                batch = []
+        if batch:
+            written += self._write(conn, sql, batch)
+        return written
+
+    def _write(self, conn, sql, rows):
+        with conn:
+            conn.executemany(sql, rows)
+        return len(rows)
+
+    def _where(self, threat=None, since=None, min_score=None):
+        clauses, params = [], []
+        if threat:
+            clauses.append("threat_keyword = ?")
+            params.append(threat)
+        if since is not None:
+            clauses.append("ingested_at >= ?")
+            params.append(since)
+        if min_score is not None:
+            clauses.append("threat_score >= ?")
+            params.append(min_score)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, threat=None, since=None, min_score=None, limit=20, offset=0):
+        """Stored articles, most recently ingested first, as plain dicts"""
+        where, params = self._where(threat, since, min_score)
+        rows = self._conn().execute(
+            f"SELECT * FROM articles{where} ORDER BY ingested_at DESC, threat_score DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, threat=None, since=None, min_score=None):
+        where, params = self._where(threat, since, min_score)
+        return self._conn().execute(f"SELECT COUNT(*) FROM articles{where}", params).fetchone()[0]
+
+    def threat_counts(self):
+        """Stored article count per threat keyword"""
+        rows = self._conn().execute(
+            "SELECT threat_keyword, COUNT(*) FROM articles GROUP BY threat_keyword"
+        ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def ingested_since(self, mark=0, limit=None, columns=HISTORY_FIELDS):
+        """Rows written after ``mark``, oldest first
+
+        ``mark`` is the rowid of the last row a consumer processed (returned
+        with every row), so incremental consumers can follow the store like
+        a log, in pages, without rescanning it. Re-ingested articles appear
+        again with a new rowid. Rowids, unlike the writers' ``ingested_at``
+        clocks, only ever grow in commit order, so no row is skipped.
+        """
+        rows = self._conn().execute(
+            f"SELECT {', '.join(columns)}, ingested_at, rowid FROM articles "
+            f"WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (mark, limit or self.batch_size)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def mark_at(self, timestamp):
+        """Mark from which ``ingested_since`` returns rows ingested since about ``timestamp``"""
+        row = self._conn().execute(
+            "SELECT MIN(rowid) - 1 FROM articles WHERE ingested_at >= ?", (timestamp,)
+        ).fetchone()
+        if row[0] is not None:
+            return row[0]
+        return self._conn().execute("SELECT IFNULL(MAX(rowid), 0) FROM articles").fetchone()[0]
+
+    def scan_by_published(self, columns=HISTORY_FIELDS):
+        """Iterate every stored row in publication order, fetched in batches"""
+        cursor = self._conn().execute(
+            f"SELECT {', '.join(columns)}, ingested_at, rowid FROM articles ORDER BY published_date"
+        )
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
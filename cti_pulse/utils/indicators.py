@@ -0,0 +1,212 @@
+import re
+from collections import defaultdict
+from datetime import datetime
+
+# One precompiled alternation so each article's text is scanned once.
+# Each branch is anchored on word boundaries and accepts common defanged
+# forms (hxxp://, example[.]com, 1.2.3[.]4); matches are validated and
+# refanged afterwards. Case is spelled out in the classes rather than set
+# with re.IGNORECASE, which case-folds every compared character and
+# doubled the cost of the scan.
+_DOT = r"(?:\.|\[\.\]|\(\.\))"
+_INDICATOR_RE = re.compile(
+    rf"""
+    (?P<url>\b[hH](?:[tT][tT]|[xX][xX])[pP][sS]?(?::|\[:\])//[^\s<>"'`]+)
+    |(?P<cve>\b[cC][vV][eE]-\d{{4}}-\d{{4,7}}\b)
+    |(?P<ipv4>(?<![\w.])(?:\d{{1,3}}{_DOT}){{3}}\d{{1,3}}(?!\w|\.\d|\[\.))
+    |(?P<hash>\b(?:[0-9a-fA-F]{{64}}|[0-9a-fA-F]{{40}}|[0-9a-fA-F]{{32}})\b)
+    |(?P<domain>\b(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{{0,61}}[a-zA-Z0-9])?{_DOT})+[a-zA-Z]{{2,24}}\b)
+    """,
+    re.VERBOSE | re.ASCII
+)
+
+# Every indicator sits inside one whitespace-delimited token containing a
+# digit, dot, bracket or colon. This pattern starts with a character class,
+# so the regex engine skips plain prose in C; only the (de-duplicated)
+# candidate tokens are handed to the full alternation. The class is ASCII
+# ([0-9], not \d): testing each character against the Unicode digit
+# category doubled the cost of the scan.
+_CANDIDATE_RE = re.compile(r"[0-9.\[(:]\S*")
+
+INDICATOR_TYPES = ('cve', 'ipv4', 'domain', 'url', 'md5', 'sha1', 'sha256')
+
+_HASH_TYPES = {32: 'md5', 40: 'sha1', 64: 'sha256'}
+
+# Dotted words that look like domains but are file names or code
+_NOT_TLDS = frozenset((
+    'exe', 'dll', 'sys', 'js', 'ts', 'py', 'php', 'asp', 'aspx', 'jsp', 'html', 'htm', 'css', 'json', 'xml',
+    'yml', 'yaml', 'txt', 'log', 'csv', 'pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'rtf', 'zip', 'rar',
+    'gz', 'tar', 'tgz', 'bz', 'xz', 'iso', 'img', 'msi', 'lnk', 'bat', 'cmd', 'ps', 'vbs', 'sh', 'jar', 'apk',
+    'bin', 'dat', 'tmp', 'png', 'jpg', 'jpeg', 'gif', 'svg', 'mp', 'so', 'ko', 'conf', 'cfg', 'ini', 'db', 'sql',
+    'md', 'rs', 'go', 'rb', 'pl', 'java', 'class'
+))
+
+# Generic TLDs accepted on domains that are not defanged (any two-letter
+# country code is accepted too). Prose split on a missing space, such as
+# "the attack.then", does not end in one of these; reserved and overlay
+# names are included because reports use them.
+_GENERIC_TLDS = frozenset((
+    'com', 'net', 'org', 'edu', 'gov', 'mil', 'int', 'arpa', 'info', 'biz', 'name', 'pro', 'mobi', 'aero',
+    'asia', 'cat', 'coop', 'jobs', 'museum', 'tel', 'travel', 'xxx', 'post', 'app', 'dev', 'xyz', 'top',
+    'online', 'site', 'club', 'shop', 'store', 'tech', 'live', 'life', 'world', 'today', 'space', 'website',
+    'cloud', 'icu', 'vip', 'work', 'link', 'click', 'download', 'zip', 'mov', 'win', 'bid', 'loan', 'men',
+    'date', 'party', 'review', 'stream', 'trade', 'racing', 'science', 'cricket', 'faith', 'accountant',
+    'buzz', 'fun', 'host', 'press', 'cyou', 'monster', 'rest', 'bar', 'lol', 'best', 'uno', 'wang', 'ink',
+    'red', 'blue', 'pink', 'kim', 'ltd', 'llc', 'inc', 'company', 'group', 'email', 'network', 'systems',
+    'services', 'solutions', 'support', 'security', 'news', 'media', 'blog', 'wiki', 'page', 'digital',
+    'agency', 'center', 'global', 'expert', 'guru', 'money', 'finance', 'bank', 'capital', 'one', 'xin',
+    'google', 'amazon', 'microsoft', 'apple', 'onion', 'example', 'test', 'invalid', 'localhost', 'local',
+    'internal', 'lan', 'corp', 'home'
+))
+
+_MIN_CVE_YEAR = 1999
+
+
+def refang(value):
+    """Undo common defanging: hxxp -> http, [.] -> ., [:] -> :"""
+    return (value.replace('[.]', '.').replace('(.)', '.').replace('[:]', ':')
+            .replace('hxxp', 'http').replace('HXXP', 'HTTP'))
+
+
+def _valid_ipv4(value):
+    octets = value.split('.')
+    return all(len(o) <= 3 and int(o) <= 255 and (o == '0' or not o.startswith('0')) for o in octets) \
+        and octets[0] != '0'
+
+
+def _valid_domain(value):
+    labels = value.split('.')
+    tld = labels[-1]
+    return len(labels) >= 2 and tld.isalpha() and tld not in _NOT_TLDS and len(value) <= 253
+
+
+def _plausible_domain(original):
+    """Whether a domain as written (not defanged) is likely a domain rather than prose
+
+    A capitalised TLD in mixed case is a sentence boundary after a
+    missing space ("attack.The"); otherwise the TLD must be a country
+    code or a known generic TLD.
+    """
+    tld = original.rsplit('.', 1)[1]
+    if tld[0].isupper() and not original.isupper():
+        return False
+    tld = tld.lower()
+    return len(tld) == 2 or tld in _GENERIC_TLDS
+
+
+def _valid_hash(value):
+    # Reject long runs of digits only or letters only (numbers, words)
+    return not value.isdigit() and not value.isalpha()
+
+
+def _candidate_text(text):
+    """Distinct tokens of ``text`` that could hold an indicator, space-joined"""
+    rfind = text.rfind
+    tokens = [text[rfind(' ', 0, start) + 1:end] for start, end in map(re.Match.span, _CANDIDATE_RE.finditer(text))]
+    return ' '.join(dict.fromkeys(tokens))
+
+
+def extract_indicators(*texts):
+    """Extract validated, de-duplicated indicators from article text
+
+    Returns a tuple of ``(type, value)`` pairs in order of first
+    appearance. Types are CVE ids (upper-cased), IPv4 addresses, domains,
+    URLs and MD5/SHA1/SHA256 hashes (lower-cased). Domains that are only
+    the host of an extracted URL are not reported separately. Domains
+    that are not defanged must also look like one as written (see
+    ``_plausible_domain``); defanging marks an indicator explicitly.
+    """
+    found = {}
+    url_hosts = set()
+    max_cve_year = datetime.now().year + 1
+
+    for match in _INDICATOR_RE.finditer(_candidate_text(' '.join(filter(None, texts)))):
+        kind = match.lastgroup
+        value = match.group(kind)
+
+        if kind == 'url':
+            value = refang(value).rstrip('.,;:!?)]}')
+            host = value.split('//', 1)[1].split('/', 1)[0].split(':', 1)[0].lower()
+            url_hosts.add(host)
+        elif kind == 'cve':
+            value = value.upper()
+            if not _MIN_CVE_YEAR <= int(value[4:8]) <= max_cve_year:
+                continue
+        elif kind == 'ipv4':
+            value = refang(value)
+            if not _valid_ipv4(value):
+                continue
+        elif kind == 'hash':
+            value = value.lower()
+            if not _valid_hash(value):
+                continue
+            kind = _HASH_TYPES[len(value)]
+        else:
+            defanged = '[' in value or '(' in value
+            if not defanged and not _plausible_domain(value):
+                continue
+            value = refang(value).lower()
+            if not _valid_domain(value):
+                continue
+
+        found.setdefault((kind, value), None)
+
+    return tuple(key for key in found if not (key[0] == 'domain' and key[1] in url_hosts))
+
+
+def extract_article_indicators(article):
+    """Indicators from an article's title, summary and highlights
+
+    Highlights are usually excerpts of the summary; those are not scanned
+    a second time.
+    """
+    summary = article.get('summary') or ''
+    return extract_indicators(article.get('title', ''), summary,
+                              *(text for text in article.get('highlights') or () if text not in summary))
+
+
+class IndicatorIndex:
+    """De-duplicated indicators linked back to the articles that mention them"""
+
+    def __init__(self, articles=()):
+        self._articles = defaultdict(dict)
+        for article in articles:
+            self.add(article)
+
+    @classmethod
+    def from_threat_data(cls, threat_data):
+        """Build from stored threat data (entries with an ``'index'``)"""
+        index = cls()
+        for data in threat_data.values():
+            for article in data['index']:
+                index.add(article)
+        return index
+
+    def add(self, article):
+        for indicator in article.get('indicators') or ():
+            # Keyed by article id so the same article under two threats counts once
+            self._articles[indicator].setdefault(article['article_id'], article)
+
+    def __len__(self):
+        return len(self._articles)
+
+    def __contains__(self, indicator):
+        return indicator in self._articles
+
+    def articles_for(self, indicator):
+        """Articles mentioning an indicator, given as ``(type, value)``"""
+        return list(self._articles.get(indicator, {}).values())
+
+    def of_type(self, kind):
+        return [indicator for indicator in self._articles if indicator[0] == kind]
+
+    def type_counts(self):
+        counts = defaultdict(int)
+        for kind, _ in self._articles:
+            counts[kind] += 1
+        return dict(counts)
+
+    def top(self, n=20):
+        """Indicators mentioned by the most articles: ``(type, value, articles)``"""
+        ranked = sorted(self._articles.items(), key=lambda item: len(item[1]), reverse=True)[:n]
+        return [(kind, value, list(articles.values())) for (kind, value), articles in ranked]
@@ -0,0 +1,165 @@
+import json
+import re
+
+try:
+    import orjson
+except ImportError:  # Optional faster backend
+    orjson = None
+
+from config.settings import STREAMING_CONFIG
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters a number can continue with, up to the end of the buffer
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+_NEED_MORE = object()
+
+
+def get_json_loads(backend=None):
+    """Get the JSON decode function for the configured backend
+
+    ``'auto'`` picks orjson when it is installed and falls back to the
+    standard library otherwise.
+    """
+    backend = backend or STREAMING_CONFIG['json_backend']
+    if backend in ('auto', 'orjson') and orjson is not None:
+        return orjson.loads
+    if backend == 'orjson':
+        raise ImportError("orjson backend requested but orjson is not installed")
+    return json.loads
+
+
+class StreamingArrayParser:
+    """Incremental parser for a JSON object holding one large array
+
+    Text is pushed in with ``feed`` as it arrives from the network and every
+    element of ``array_key`` is returned as soon as it is complete, so the
+    full document is never held in memory. Other top-level members are kept
+    in ``self.meta``. ``item_hook`` is applied to each element before it is
+    returned, which lets callers drop fields they do not need early.
+    """
+
+    def __init__(self, array_key='results', item_hook=None):
+        self.array_key = array_key
+        self.item_hook = item_hook
+        self.meta = {}
+        self.found_array = False
+
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key = None
+
+    def feed(self, text):
+        """Add decoded text and return the array elements completed by it"""
+        self._buffer += text
+        items = self._process(final=False)
+        self._compact()
+        return items
+
+    def close(self):
+        """Flush the remaining input; raises ValueError on a truncated document"""
+        items = self._process(final=True)
+        self._skip_whitespace()
+        if self._state != 'done' or self._pos != len(self._buffer):
+            raise ValueError(f"Incomplete or invalid JSON document (state: {self._state})")
+        return items
+
+    def _compact(self):
+        """Drop consumed input so the buffer only holds the pending element"""
+        if self._pos > 65536:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+    def _skip_whitespace(self):
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+
+    def _peek(self):
+        self._skip_whitespace()
+        if self._pos < len(self._buffer):
+            return self._buffer[self._pos]
+        return None
+
+    def _decode_value(self, final):
+        """Decode one JSON value at the cursor, or return _NEED_MORE"""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _NEED_MORE
+
+        # A value followed only by number characters may be a number still
+        # growing: "12" out of "12." or "1e" + "5" in the next chunk
+        if not final and _NUMBER_TAIL.match(self._buffer, end):
+            return _NEED_MORE
+
+        self._pos = end
+        return value
+
+    def _process(self, final):
+        items = []
+
+        while True:
+            char = self._peek()
+            if char is None:
+                return items
+
+            if self._state == 'start':
+                if char != '{':
+                    raise ValueError("Expected a JSON object")
+                self._pos += 1
+                self._state = 'key'
+
+            elif self._state in ('key', 'after_value'):
+                if char == '}':
+                    self._pos += 1
+                    self._state = 'done'
+                elif self._state == 'after_value' and char == ',':
+                    self._pos += 1
+                    self._state = 'key'
+                elif self._state == 'key' and char == '"':
+                    key = self._decode_value(final)
+                    if key is _NEED_MORE:
+                        return items
+                    self._key = key
+                    self._state = 'colon'
+                else:
+                    raise ValueError(f"Unexpected character {char!r} in object")
+
+            elif self._state == 'colon':
+                if char != ':':
+                    raise ValueError("Expected ':' after object key")
+                self._pos += 1
+                self._state = 'value'
+
+            elif self._state == 'value':
+                if self._key == self.array_key and char == '[':
+                    self._pos += 1
+                    self.found_array = True
+                    self._state = 'item'
+                else:
+                    value = self._decode_value(final)
+                    if value is _NEED_MORE:
+                        return items
+                    self.meta[self._key] = value
+                    self._state = 'after_value'
+
+            elif self._state in ('item', 'after_item'):
+                if char == ']':
+                    self._pos += 1
+                    self._state = 'after_value'
+                elif self._state == 'after_item' and char == ',':
+                    self._pos += 1
+                    self._state = 'item'
+                elif self._state == 'item':
+                    item = self._decode_value(final)
+                    if item is _NEED_MORE:
+                        return items
+                    items.append(self.item_hook(item) if self.item_hook else item)
+                    self._state = 'after_item'
+                else:
+                    raise ValueError(f"Unexpected character {char!r} in array")
+
+            else:  # done
+                raise ValueError("Unexpected data after JSON document")
@@ -0,0 +1,152 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from config.settings import RAW_STORE_CONFIG
+
+
+class RawPayloadWriter:
+    """Streams one payload to disk while hashing it"""
+
+    def __init__(self, store):
+        self.store = store
+        self.digest = None
+        self._hash = hashlib.sha256()
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.root, suffix='.tmp')
+        self._file = gzip.GzipFile(fileobj=os.fdopen(fd, 'wb'), mode='wb', compresslevel=store.compresslevel)
+
+    def write(self, chunk):
+        self._hash.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self):
+        """Finish the payload and return its content address"""
+        self._close_file()
+        self.digest = self._hash.hexdigest()
+        path = self.store.path_for(self.digest)
+
+        if os.path.exists(path):
+            os.remove(self._tmp_path)
+            try:
+                os.utime(path)   # Stored again: it is recent as far as pruning goes
+            except FileNotFoundError:
+                pass
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self._tmp_path, path)
+        self.store.prune_if_due()
+        return self.digest
+
+    def abort(self):
+        """Discard a partially written payload"""
+        self._close_file()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def _close_file(self):
+        fileobj = self._file.fileobj
+        self._file.close()
+        fileobj.close()
+
+
+class RawPayloadStore:
+    """Content-addressed on-disk store for raw API payloads
+
+    Payloads are gzip-compressed and keyed by the SHA-256 of their
+    uncompressed bytes, so identical payloads are stored once and the key
+    can be shared between processes on the same host.
+
+    Writes prune the store at most every ``prune_interval`` seconds: first
+    payloads not written again for ``max_age_days``, then the oldest until
+    the store fits in ``max_mb``. The time of the last prune is the mtime
+    of a marker file, so processes sharing the store take turns. Articles
+    whose payload was pruned simply have no raw article to show.
+    """
+
+    def __init__(self, root=None, compresslevel=None, max_age_days=None, max_mb=None, prune_interval=None):
+        self.root = root or RAW_STORE_CONFIG['path']
+        self.compresslevel = compresslevel or RAW_STORE_CONFIG['compresslevel']
+        self.max_age = (max_age_days or RAW_STORE_CONFIG['max_age_days']) * 86400
+        self.max_bytes = (max_mb or RAW_STORE_CONFIG['max_mb']) * 1024 * 1024
+        self.prune_interval = prune_interval or RAW_STORE_CONFIG['prune_interval']
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, digest):
+        """Get the file path for a content address"""
+        return os.path.join(self.root, digest[:2], f"{digest[2:]}.gz")
+
+    def writer(self):
+        """Open a streaming writer; call ``commit()`` to get the address"""
+        return RawPayloadWriter(self)
+
+    def put(self, data):
+        """Store bytes and return their content address"""
+        writer = self.writer()
+        writer.write(data)
+        return writer.commit()
+
+    def put_json(self, obj):
+        """Store a JSON-serialisable object and return its content address"""
+        return self.put(json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8'))
+
+    def exists(self, digest):
+        return bool(digest) and os.path.exists(self.path_for(digest))
+
+    def get(self, digest):
+        """Load stored bytes, or None if the address is unknown"""
+        if not self.exists(digest):
+            return None
+        try:
+            with gzip.open(self.path_for(digest), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:   # Pruned in the meantime
+            return None
+
+    def get_json(self, digest):
+        """Load a stored JSON payload, or None if the address is unknown"""
+        data = self.get(digest)
+        return json.loads(data) if data is not None else None
+
+    def prune_if_due(self):
+        """Prune unless this or another process did so within ``prune_interval``"""
+        marker = os.path.join(self.root, '.pruned')
+        try:
+            if time.time() - os.path.getmtime(marker) < self.prune_interval:
+                return 0
+        except FileNotFoundError:
+            pass
+        with open(marker, 'a'):
+            os.utime(marker)
+        return self.prune()
+
+    def prune(self):
+        """Remove payloads past ``max_age_days``, then the oldest beyond ``max_mb``; returns how many"""
+        payloads = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if not name.endswith('.gz'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    info = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                payloads.append((info.st_mtime, info.st_size, path))
+
+        payloads.sort()
+        cutoff = time.time() - self.max_age
+        total = sum(size for _, size, _ in payloads)
+        removed = 0
+        for mtime, size, path in payloads:
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return removed
@@ -0,0 +1,56 @@
+from urllib.parse import urlsplit
+
+from config.settings import CYBER_THREATS, FANOUT_CONFIG
+
+
+def fanout_queries(threat_keyword, max_queries=None):
+    """Canonical threat keyword followed by its synonyms, de-duplicated"""
+    max_queries = max_queries or FANOUT_CONFIG['max_queries']
+    synonyms = CYBER_THREATS.get(threat_keyword, {}).get('synonyms', [])
+    return list(dict.fromkeys([threat_keyword] + list(synonyms)))[:max_queries]
+
+
+def result_key(article):
+    """De-duplication key: the normalised URL, falling back to the title"""
+    url = article.get('url') or ''
+    if not url:
+        return ('title', (article.get('title') or '').strip().lower())
+
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return ('url', host + parts.path.rstrip('/') + (f"?{parts.query}" if parts.query else ''))
+
+
+def reciprocal_rank_fusion(ranked_lists, k=None, limit=None):
+    """Merge ranked result lists with reciprocal-rank fusion
+
+    ``ranked_lists`` maps each query to its results, best first. An article
+    found by several queries is kept once (first occurrence) and scores
+    ``sum(1 / (k + rank))`` over the lists it appears in, so articles ranked
+    well by many queries rise to the top. Returns up to ``limit``
+    ``(article, fused_score, queries)`` tuples, best first; ties keep the
+    order of first appearance.
+    """
+    k = FANOUT_CONFIG['rrf_k'] if k is None else k
+    fused = {}
+
+    for query, results in ranked_lists.items():
+        seen = set()
+        for rank, article in enumerate(results, start=1):
+            key = result_key(article)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            entry = fused.get(key)
+            if entry is None:
+                fused[key] = entry = [article, 0.0, []]
+            entry[1] += 1.0 / (k + rank)
+            entry[2].append(query)
+
+    merged = sorted(fused.values(), key=lambda entry: entry[1], reverse=True)
+    if limit is not None:
+        merged = merged[:limit]
+    return [tuple(entry) for entry in merged]
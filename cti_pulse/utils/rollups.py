@@ -0,0 +1,163 @@
+import heapq
+from collections import Counter
+
+# Severity distribution buckets: (label, low, high), both inclusive
+SEVERITY_BUCKETS = [
+    ('Low (1-3)', 1, 3),
+    ('Medium (4-6)', 4, 6),
+    ('High (7-8)', 7, 8),
+    ('Critical (9-10)', 9, 10)
+]
+
+HIGH_SEVERITY_SCORE = 6
+CRITICAL_SCORE = 7
+
+
+class ThreatRollup:
+    """Dashboard aggregates maintained incrementally as articles come and go
+
+    Holds counts, sums and per-threat/category/source tallies so every
+    summary widget reads precomputed values instead of walking all articles.
+    ``add``/``remove`` update in O(1); ``retarget`` moves the rollup to a new
+    severity threshold by applying only the articles between the old and
+    new thresholds.
+    """
+
+    def __init__(self, articles=(), min_severity=None):
+        self.min_severity = min_severity
+        self.total = 0
+        self.score_sum = 0.0
+        self.sentiment_sum = 0.0
+        self.high_severity = 0
+        self.critical = 0
+        self.bucket_counts = {label: 0 for label, _, _ in SEVERITY_BUCKETS}
+        self.threat_counts = {}
+        self.threat_score_sums = {}
+        self.threat_sentiment_sums = {}
+        self.category_counts = Counter()
+        self.source_counts = Counter()
+        self.technique_counts = Counter()
+        self._top_sources = {}
+
+        for article in articles:
+            self.add(article)
+
+    @classmethod
+    def from_threat_data(cls, threat_data, min_severity):
+        """Build a rollup of stored threat data (entries with an ``'index'``) at a threshold"""
+        rollup = cls(min_severity=min_severity)
+        for threat, data in threat_data.items():
+            rollup.add_threat(threat)
+            for article in data['index'].at_least(min_severity):
+                rollup.add(article)
+        return rollup
+
+    @classmethod
+    def from_view(cls, all_threat_data):
+        """Build a rollup from a dashboard view (entries with an ``'analysis'`` list)"""
+        rollup = cls()
+        for threat, data in all_threat_data.items():
+            rollup.add_threat(threat)
+            for article in data['analysis']:
+                rollup.add(article)
+        return rollup
+
+    def add_threat(self, threat):
+        """Register a threat so it is reported even with no articles"""
+        self.threat_counts.setdefault(threat, 0)
+        self.threat_score_sums.setdefault(threat, 0.0)
+        self.threat_sentiment_sums.setdefault(threat, 0.0)
+
+    def add(self, article, sign=1):
+        """Add an article (or remove it with ``sign=-1``)"""
+        score = article['threat_score']
+        threat = article['threat_keyword']
+
+        self.total += sign
+        self.score_sum += sign * score
+        self.sentiment_sum += sign * article['sentiment_compound']
+        if score >= HIGH_SEVERITY_SCORE:
+            self.high_severity += sign
+        if score >= CRITICAL_SCORE:
+            self.critical += sign
+        for label, low, high in SEVERITY_BUCKETS:
+            if low <= score <= high:
+                self.bucket_counts[label] += sign
+                break
+
+        self.add_threat(threat)
+        self.threat_counts[threat] += sign
+        self.threat_score_sums[threat] += sign * score
+        self.threat_sentiment_sums[threat] += sign * article['sentiment_compound']
+
+        self._count(self.category_counts, article['category'], sign)
+        self._count(self.source_counts, article['source'], sign)
+        for technique in article.get('techniques') or ():
+            self._count(self.technique_counts, technique, sign)
+        self._top_sources = {}
+
+    def remove(self, article):
+        self.add(article, sign=-1)
+
+    def _count(self, counter, key, sign):
+        counter[key] += sign
+        if counter[key] <= 0:
+            del counter[key]
+
+    def retarget(self, threat_data, min_severity):
+        """Move the rollup to a new threshold by applying only the deltas"""
+        if self.min_severity is None or min_severity == self.min_severity:
+            self.min_severity = min_severity
+            return self
+
+        for data in threat_data.values():
+            index = data['index']
+            if min_severity < self.min_severity:
+                for article in index.between(min_severity, self.min_severity):
+                    self.add(article)
+            else:
+                for article in index.between(self.min_severity, min_severity):
+                    self.remove(article)
+
+        self.min_severity = min_severity
+        return self
+
+    # Read-only summaries
+
+    @property
+    def avg_score(self):
+        return self.score_sum / self.total if self.total else 0
+
+    @property
+    def avg_sentiment(self):
+        return self.sentiment_sum / self.total if self.total else 0
+
+    @property
+    def top_threat(self):
+        """Threat with the most articles (first registered wins ties)"""
+        return max(self.threat_counts, key=self.threat_counts.get) if self.threat_counts else "None"
+
+    def threat_averages(self, threat):
+        """(avg score, avg sentiment) for one threat"""
+        count = self.threat_counts.get(threat, 0)
+        if not count:
+            return 0, 0
+        return self.threat_score_sums[threat] / count, self.threat_sentiment_sums[threat] / count
+
+    def severity_distribution(self):
+        return dict(self.bucket_counts)
+
+    def category_distribution(self):
+        return Counter(self.category_counts)
+
+    def top_techniques(self, n=10):
+        """Top-n ATT&CK technique ids by tagged article count"""
+        return dict(self.technique_counts.most_common(n))
+
+    def top_sources(self, n=10, exclude=()):
+        """Top-n sources by article count, memoised until the next change"""
+        key = (n, tuple(exclude))
+        if key not in self._top_sources:
+            candidates = ((source, count) for source, count in self.source_counts.items() if source not in exclude)
+            self._top_sources[key] = dict(heapq.nlargest(n, candidates, key=lambda item: item[1]))
+        return self._top_sources[key]
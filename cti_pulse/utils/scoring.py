@@ -0,0 +1,173 @@
+import numpy as np
+from datetime import datetime
+from config.settings import (
+    CYBER_THREATS,
+    THREAT_SCORING,
+    SENTIMENT_THRESHOLDS,
+    SENTIMENT_SCORING,
+    RECENCY_SCORING,
+    RECENCY_POINTS,
+    HIGH_IMPACT_KEYWORDS,
+    MAJOR_SECURITY_SOURCES
+)
+from utils.tokens import article_tokens, get_vocabulary, segment_or
+
+
+def days_since(published_date):
+    """Whole days since ``published_date``, or None if it is missing or invalid"""
+    try:
+        if published_date == 'Date not available':
+            return None
+        if 'T' in published_date:
+            pub_date = datetime.fromisoformat(published_date.replace('Z', '+00:00'))
+        else:
+            pub_date = datetime.strptime(published_date[:10], '%Y-%m-%d')
+        return (datetime.now(pub_date.tzinfo) - pub_date).days
+    except Exception:
+        return None
+
+
+class ScoringModel:
+    """Threat scoring model compiled from the scoring configuration
+
+    ``THREAT_SCORING``, ``SENTIMENT_THRESHOLDS``/``SENTIMENT_SCORING`` and
+    ``RECENCY_SCORING``/``RECENCY_POINTS`` are compiled once into lookup
+    tables and sorted bucket boundaries; ``score_batch`` then buckets a whole
+    batch of articles with ``np.searchsorted``. Weights can be tuned in
+    settings without code changes.
+    """
+
+    def __init__(self, threat_scoring=None, sentiment_thresholds=None, sentiment_scoring=None,
+                 recency_scoring=None, recency_points=None, threats=None):
+        scoring = threat_scoring or THREAT_SCORING
+        sentiment_thresholds = sentiment_thresholds or SENTIMENT_THRESHOLDS
+        sentiment_scoring = sentiment_scoring or SENTIMENT_SCORING
+        recency_scoring = recency_scoring or RECENCY_SCORING
+        recency_points = recency_points or RECENCY_POINTS
+        threats = threats or CYBER_THREATS
+
+        # Base severity lookup table
+        base_weight = scoring['base_severity_weight']
+        self.default_severity = scoring['default_severity'] * base_weight
+        self.severity_table = {
+            name: info.get('severity', scoring['default_severity']) * base_weight
+            for name, info in threats.items()
+        }
+
+        # Sentiment buckets: compound < bound falls in that bucket
+        self.sentiment_bounds = np.array([
+            sentiment_thresholds['very_negative'],
+            sentiment_thresholds['negative'],
+            sentiment_thresholds['neutral_high']
+        ], dtype=float)
+        self.sentiment_points = np.array([
+            sentiment_scoring['very_negative'],
+            sentiment_scoring['negative'],
+            sentiment_scoring['neutral'],
+            sentiment_scoring['positive']
+        ], dtype=float) * scoring['sentiment_weight']
+
+        # Recency buckets: days <= bound falls in that bucket
+        buckets = sorted((days, name) for name, days in recency_scoring.items() if days != float('inf'))
+        self.recency_bounds = np.array([days for days, _ in buckets], dtype=float)
+        self.recency_points = np.array(
+            [recency_points[name] for _, name in buckets] + [recency_points['old']], dtype=float
+        ) * scoring['recency_weight']
+        self.unknown_recency = recency_points['unknown'] * scoring['recency_weight']
+
+        # Keyword and source factors
+        self.keywords = tuple(HIGH_IMPACT_KEYWORDS)
+        self.keyword_points = scoring['keyword_points']
+        self.keyword_cap = scoring['keyword_cap']
+        self.keyword_weight = scoring['keyword_weight']
+        self.sources = tuple(MAJOR_SECURITY_SOURCES)
+        self.source_points = scoring['source_points'] * scoring['source_weight']
+        self._source_boosts = {}
+
+        self.min_score = scoring['min_score']
+        self.max_score = scoring['max_score']
+
+    def base_severity(self, threat_keyword):
+        return self.severity_table.get(threat_keyword, self.default_severity)
+
+    def source_boost(self, source):
+        """Memoised credibility boost for a source"""
+        boost = self._source_boosts.get(source)
+        if boost is None:
+            source_lower = source.lower()
+            boost = self.source_points if any(s in source_lower for s in self.sources) else 0.0
+            self._source_boosts[source] = boost
+        return boost
+
+    def keyword_counts(self, token_arrays):
+        """Number of distinct high-impact keywords in each token ID array
+
+        A keyword counts when it occurs inside any word, as the substring
+        scan of the cleaned summary did: each word's keyword hits are a
+        bitmask column of the shared vocabulary, OR-ed per article.
+        """
+        keywords = self.keywords
+        hits = get_vocabulary().column(
+            'high_impact_keywords',
+            lambda word: sum(1 << bit for bit, keyword in enumerate(keywords) if keyword in word), np.int64)
+        offsets = np.zeros(len(token_arrays) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(tokens) for tokens in token_arrays])
+        masks = segment_or(hits[np.concatenate(token_arrays)], offsets) if token_arrays else np.zeros(0, np.int64)
+        return sum((masks >> bit) & 1 for bit in range(len(keywords))).astype(float)
+
+    def sentiment_scores(self, compounds):
+        """Sentiment points for an array of compound scores"""
+        return self.sentiment_points[np.searchsorted(self.sentiment_bounds, compounds, side='right')]
+
+    def recency_scores(self, days_old):
+        """Recency points for an array of ages in days (NaN = unknown)"""
+        days_old = np.asarray(days_old, dtype=float)
+        unknown = np.isnan(days_old)
+        buckets = np.searchsorted(self.recency_bounds, np.where(unknown, 0, days_old), side='left')
+        return np.where(unknown, self.unknown_recency, self.recency_points[buckets])
+
+    def recency_score(self, published_date):
+        days = days_since(published_date)
+        return float(self.recency_scores([np.nan if days is None else days])[0])
+
+    def max_possible_score(self, threat_keyword):
+        """Highest score any article for this threat can reach"""
+        best = (self.base_severity(threat_keyword)
+                + self.sentiment_points.max()
+                + max(self.recency_points.max(), self.unknown_recency)
+                + self.keyword_cap * self.keyword_weight
+                + self.source_points)
+        return float(min(max(best, self.min_score), self.max_score))
+
+    def score_batch(self, articles, threat_keyword):
+        """Score a batch of analysed articles for one threat keyword
+
+        Each article needs ``sentiment_compound``, ``published_date``,
+        ``source`` and ``token_ids`` (or ``summary``, encoded if the token
+        IDs are missing). Returns a float array.
+        """
+        if not articles:
+            return np.zeros(0)
+
+        compounds = np.fromiter((a['sentiment_compound'] for a in articles), dtype=float, count=len(articles))
+        days_old = np.fromiter(
+            (np.nan if d is None else d for d in (days_since(a['published_date']) for a in articles)),
+            dtype=float, count=len(articles)
+        )
+        keyword_counts = self.keyword_counts([article_tokens(a) for a in articles])
+        source_boosts = np.fromiter((self.source_boost(a['source']) for a in articles),
+                                    dtype=float, count=len(articles))
+
+        keyword_scores = np.minimum(keyword_counts * self.keyword_points, self.keyword_cap) * self.keyword_weight
+
+        scores = (self.base_severity(threat_keyword)
+                  + self.sentiment_scores(compounds)
+                  + self.recency_scores(days_old)
+                  + keyword_scores
+                  + source_boosts)
+
+        return np.clip(scores, self.min_score, self.max_score)
+
+    def score(self, article, threat_keyword):
+        """Score a single analysed article"""
+        return float(self.score_batch([article], threat_keyword)[0])
@@ -0,0 +1,198 @@
+import numpy as np
+from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+from utils.tokens import get_vocabulary
+
+
+class BatchSentimentAnalyzer:
+    """VADER polarity scores for a whole batch of texts with NumPy
+
+    Equivalent to NLTK's ``SentimentIntensityAnalyzer.polarity_scores`` on
+    text that has been through ``clean_text`` (lowercase words, no
+    punctuation). That is what the processor feeds VADER, so punctuation
+    emphasis and emoticon handling never apply and are not replicated.
+    Capitalisation is tracked per token, so mixed-case text without
+    punctuation scores the same as VADER too.
+
+    Works on token IDs of the shared vocabulary. Each word's lexicon
+    valence, booster scalar, negation flag and case are vocabulary columns,
+    computed once per distinct word. The booster, negation, "never
+    so/this", idiom, "least", "but" and ALL-CAPS rules are then applied as
+    array operations over every lexicon word of the batch. As in NLTK, a
+    repeated token takes the valence computed at its first position in the
+    text.
+    """
+
+    def __init__(self, vocabulary=None):
+        self.lexicon = SentimentIntensityAnalyzer().lexicon
+        self.constants = VaderConstants()
+        self.vocabulary = vocabulary or get_vocabulary()
+
+        words = self.vocabulary
+        self._never, self._so, self._this = words.id('never'), words.id('so'), words.id('this')
+        self._kind, self._of = words.id('kind'), words.id('of')
+        self._least, self._but = words.id('least'), words.id('but')
+        self._at_very = np.array([words.id('at'), words.id('very')])
+        self._idioms = {tuple(words.id(word) for word in phrase.split()): value
+                        for phrase, value in self.constants.SPECIAL_CASE_IDIOMS.items()}
+        self._booster_bigrams = {tuple(words.id(word) for word in phrase.split()): self.constants.B_DECR
+                                 for phrase in self.constants.BOOSTER_DICT if ' ' in phrase}
+
+    def _columns(self):
+        """Per-token lexicon properties, extended to any words added since the last batch"""
+        lexicon, constants, vocabulary = self.lexicon, self.constants, self.vocabulary
+        # First, as it adds the lower-case form of capitalised words
+        self._lower = vocabulary.column('lower', lambda word: vocabulary.id(word.lower()), np.int32)
+        self._valence = vocabulary.column('vader_valence', lambda word: lexicon.get(word.lower(), 0.0), float)
+        self._in_lexicon = vocabulary.column('vader_in_lexicon', lambda word: word.lower() in lexicon, bool)
+        self._booster = vocabulary.column('vader_booster',
+                                          lambda word: constants.BOOSTER_DICT.get(word.lower(), 0.0), float)
+        self._negation = vocabulary.column(
+            'vader_negation', lambda word: word.lower() in constants.NEGATE or "n't" in word.lower(), bool)
+        self._upper = vocabulary.column('upper', str.isupper, bool)
+        self._keep = vocabulary.column('vader_keep', lambda word: len(word) > 1, bool)
+
+    def score(self, texts):
+        """Polarity scores of every text, as arrays keyed like ``polarity_scores``
+
+        The texts are only split on whitespace, as VADER does; pass text
+        through ``clean_text`` first to score it as the processor does.
+        """
+        return self.score_tokens(*self.vocabulary.encode_batch(texts, clean=False))
+
+    def score_tokens(self, ids, offsets):
+        """Polarity scores of every text of an ``encode_batch`` result"""
+        self._columns()
+        c = self.constants
+
+        # Single characters are dropped, as VADER does before applying any rule
+        lengths = np.diff(offsets)
+        doc = np.repeat(np.arange(len(lengths)), lengths)
+        keep = self._keep[ids]
+        ids, doc = ids[keep], doc[keep]
+        lengths = np.bincount(doc, minlength=len(lengths))
+        pos = np.arange(len(ids)) - (np.cumsum(lengths) - lengths)[doc]
+        count = len(lengths)
+
+        # Only lexicon words carry valence; everything else scores 0
+        sel = np.flatnonzero(self._in_lexicon[ids])
+        sel_ids, sel_doc, sel_pos = ids[sel], doc[sel], pos[sel]
+        sel_end = lengths[sel_doc]
+        shifts = {}
+
+        def before(k):
+            """ID of the token k places before each selected token (after, if k < 0); 0 outside the text"""
+            if k not in shifts:
+                valid = (sel_pos >= k) & (sel_pos - k < sel_end)
+                shifts[k] = np.where(valid, ids[np.clip(sel - k, 0, len(ids) - 1)], 0)
+            return shifts[k]
+
+        def phrase_value(table, start, length):
+            """Value of the phrase covering offsets start..start+length-1 of each selected token, NaN if none"""
+            values = np.full(len(sel), np.nan)
+            for key, value in table.items():
+                if len(key) == length:
+                    hit = np.ones(len(sel), dtype=bool)
+                    for offset, token in enumerate(key, start):
+                        hit &= before(-offset) == token
+                    values[hit] = value
+            return values
+
+        # ALL-CAPS emphasis counts only when some, but not all, tokens are capitalised
+        upper = self._upper[ids]
+        if upper.any():
+            capitals = np.bincount(doc, weights=upper, minlength=count)
+            cap_diff = (capitals > 0) & (capitals < lengths)
+        else:
+            cap_diff = np.zeros(count, dtype=bool)
+        sel_cap_diff = cap_diff[sel_doc]
+
+        valence = self._valence[sel_ids]
+        caps = self._upper[sel_ids] & sel_cap_diff
+        valence = np.where(caps, np.where(valence > 0, valence + c.C_INCR, valence - c.C_INCR), valence)
+
+        for start_i, dampen in enumerate((1.0, 0.95, 0.9)):
+            previous = before(start_i + 1)
+            applies = (sel_pos > start_i) & ~self._in_lexicon[previous]
+
+            # Boosters and dampeners up to three words back, weaker with distance
+            scalar = np.where(valence < 0, -self._booster[previous], self._booster[previous])
+            booster_caps = (self._booster[previous] != 0) & self._upper[previous] & sel_cap_diff
+            scalar = np.where(booster_caps, np.where(valence > 0, scalar + c.C_INCR, scalar - c.C_INCR), scalar)
+            valence = np.where(applies, valence + scalar * dampen, valence)
+
+            # Negation, with "never so/this" intensifying instead
+            if start_i == 0:
+                factor = np.where(self._negation[previous], c.N_SCALAR, 1.0)
+            elif start_i == 1:
+                never = (before(2) == self._never) & np.isin(before(1), (self._so, self._this))
+                factor = np.where(never, 1.5, np.where(self._negation[previous], c.N_SCALAR, 1.0))
+            else:
+                never = ((before(3) == self._never) & np.isin(before(2), (self._so, self._this))) | \
+                        np.isin(before(1), (self._so, self._this))
+                factor = np.where(never, 1.25, np.where(self._negation[previous], c.N_SCALAR, 1.0))
+            valence = np.where(applies, valence * factor, valence)
+
+            # Idioms around the word, then "kind of"-style dampening bigrams
+            if start_i == 2:
+                idiom = np.full(len(sel), np.nan)
+                for start, length in ((-1, 2), (-2, 3), (-2, 2), (-3, 3), (-3, 2)):
+                    idiom = np.where(np.isnan(idiom), phrase_value(self._idioms, start, length), idiom)
+                for start, length in ((0, 2), (0, 3)):
+                    following = phrase_value(self._idioms, start, length)
+                    idiom = np.where(np.isnan(following), idiom, following)
+                bigram = ~np.isnan(phrase_value(self._booster_bigrams, -3, 2)) | \
+                         ~np.isnan(phrase_value(self._booster_bigrams, -2, 2))
+                idiom_valence = np.where(np.isnan(idiom), valence, idiom)
+                idiom_valence = np.where(bigram, idiom_valence + c.B_DECR, idiom_valence)
+                valence = np.where(applies, idiom_valence, valence)
+
+        # "least" negates unless it is "at least" or "very least"
+        previous = before(1)
+        least = (sel_pos > 0) & (self._lower[previous] == self._least) & ~self._in_lexicon[previous]
+        least &= ~((sel_pos > 1) & np.isin(self._lower[before(2)], self._at_very))
+        valence = np.where(least, valence * c.N_SCALAR, valence)
+
+        # Boosters and the "kind" of "kind of" score 0 themselves
+        skip = (self._booster[sel_ids] != 0) | \
+               ((self._lower[sel_ids] == self._kind) & (self._lower[before(-1)] == self._of))
+        valence = np.where(skip, 0.0, valence)
+
+        # A repeated token takes the valence of its first position in the text
+        keys = sel_doc.astype(np.int64) * len(self.vocabulary) + sel_ids
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        sentiments = valence[first][inverse.ravel()]
+
+        # Words before the first "but" count half, words after it one and a half
+        is_but = self._lower[ids] == self._but
+        but_at = np.full(count, len(ids))
+        np.minimum.at(but_at, doc[is_but], pos[is_but])
+        if is_but.any():
+            sel_but = but_at[sel_doc]
+            has_but = sel_but < len(ids)
+            sentiments = np.where(has_but & (sel_pos < sel_but), sentiments * 0.5,
+                                  np.where(has_but & (sel_pos > sel_but), sentiments * 1.5, sentiments))
+
+        return self._summarise(sentiments, sel_doc, lengths)
+
+    def _summarise(self, sentiments, sel_doc, lengths):
+        """Compound, negative, neutral and positive proportions per text"""
+        count = len(lengths)
+        total = np.bincount(sel_doc, weights=sentiments, minlength=count)
+        pos_sum = np.bincount(sel_doc, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=count)
+        neg_sum = np.bincount(sel_doc, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=count)
+        neutral = lengths - np.bincount(sel_doc, weights=sentiments != 0, minlength=count)
+
+        weight = pos_sum + np.abs(neg_sum) + neutral
+        scored = lengths > 0
+        weight = np.where(scored, weight, 1.0)
+        return {
+            'neg': np.where(scored, np.round(np.abs(neg_sum / weight), 3), 0.0),
+            'neu': np.where(scored, np.round(np.abs(neutral / weight), 3), 0.0),
+            'pos': np.where(scored, np.round(np.abs(pos_sum / weight), 3), 0.0),
+            'compound': np.round(total / np.sqrt(total * total + 15), 4)
+        }
+
+    def polarity_scores(self, text):
+        """Scores of a single text, as a dict like VADER's"""
+        return {key: float(values[0]) for key, values in self.score([text]).items()}
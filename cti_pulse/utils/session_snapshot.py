@@ -0,0 +1,170 @@
+import json
+import os
+import re
+import time
+
+import pyarrow as pa
+
+from config.settings import SESSION_CONFIG
+from utils.article_index import ScoredArticleIndex
+from utils.article_record import ThreatArticle
+
+# Session tokens are uuid4 hex; anything else in the URL is ignored
+TOKEN_RE = re.compile(r"[0-9a-f]{32}")
+
+# ThreatArticle constructor arguments, in order; token IDs are process-local and not stored
+FIELDS = (
+    ('title', pa.string()),
+    ('summary', pa.string()),
+    ('url', pa.string()),
+    ('sentiment_compound', pa.float64()),
+    ('sentiment_neg', pa.float64()),
+    ('published_date', pa.string()),
+    ('source', pa.string()),
+    ('highlights', pa.list_(pa.string())),
+    ('threat_keyword', pa.string()),
+    ('category', pa.string()),
+    ('threat_score', pa.float64()),
+    ('raw_ref', pa.string()),
+    ('raw_index', pa.int32()),
+    ('indicators', pa.list_(pa.list_(pa.string()))),
+    ('techniques', pa.list_(pa.string()))
+)
+# Low-cardinality columns, dictionary encoded
+DICTIONARY_FIELDS = {'threat', 'published_date', 'source', 'threat_keyword', 'category', 'raw_ref'}
+METADATA_KEY = b'cyberpulse'
+VERSION = 1
+
+
+def valid_token(token):
+    return isinstance(token, str) and TOKEN_RE.fullmatch(token) is not None
+
+
+class SessionSnapshots:
+    """Per-session dashboard snapshots that survive browser reloads
+
+    A session's fetched articles are written, after each fetch, as one
+    Arrow IPC file named by the session token the URL carries
+    (``?session=...``). One row per article, columns are the ThreatArticle
+    fields; the threat each article was fetched for, the payload store
+    references and the query state go in the schema metadata.
+
+    Restoring memory-maps the file, so reading it costs no parsing beyond
+    turning the columns into records. Column buffers are compressed with
+    ``snapshot_compression`` (zstd by default, decompressed straight from
+    the mapped pages); with it off they are used in place, at about five
+    times the size. The scores, sentiment,
+    indicators and ATT&CK tags are all stored, so nothing is fetched or
+    analysed again; only the indexes are rebuilt. Snapshots older than
+    ``snapshot_ttl`` are ignored and purged.
+
+    Anyone holding a session's URL can restore its dashboard: the token is
+    the only key.
+    """
+
+    def __init__(self, directory=None, ttl=None, compression=None):
+        self.directory = directory or SESSION_CONFIG['snapshot_dir']
+        self.ttl = ttl or SESSION_CONFIG['snapshot_ttl']
+        self.schema = pa.schema([('threat', pa.string())] + list(FIELDS))
+        compression = compression if compression is not None else SESSION_CONFIG['snapshot_compression']
+        if compression and not pa.Codec.is_available(compression):
+            compression = None
+        self.write_options = pa.ipc.IpcWriteOptions(compression=compression or None)
+
+    def _path(self, token):
+        return os.path.join(self.directory, f"{token}.arrow") if valid_token(token) else None
+
+    def save(self, token, threat_data, state=None):
+        """Atomically write a session's threat data and JSON-able ``state``; returns the file size"""
+        path = self._path(token)
+        if path is None:
+            raise ValueError(f"Invalid session token: {token!r}")
+
+        columns = {name: [] for name in self.schema.names}
+        for threat, data in threat_data.items():
+            for article in data['index']:
+                columns['threat'].append(threat)
+                for name, _ in FIELDS:
+                    columns[name].append(article[name])
+        metadata = {
+            'version': VERSION,
+            'saved_at': time.time(),
+            'threats': {threat: data.get('raw_ref') for threat, data in threat_data.items()},
+            'state': state or {}
+        }
+        arrays = []
+        for field in self.schema:
+            array = pa.array(columns[field.name], type=field.type)
+            arrays.append(array.dictionary_encode() if field.name in DICTIONARY_FIELDS else array)
+        table = pa.Table.from_arrays(arrays, names=self.schema.names)
+        table = table.replace_schema_metadata({METADATA_KEY: json.dumps(metadata)})
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.purge_expired()
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema, options=self.write_options) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def _current(self, token):
+        """Path of a session's snapshot, or None if it has none or it has expired"""
+        path = self._path(token)
+        if path is None or not os.path.exists(path):
+            return None
+        if time.time() - os.path.getmtime(path) > self.ttl:
+            os.remove(path)
+            return None
+        return path
+
+    def load_state(self, token):
+        """Only the ``state`` saved with a session's snapshot (the schema is read, not the articles)"""
+        path = self._current(token)
+        if path is None:
+            return None
+        with pa.memory_map(path) as source:
+            metadata = json.loads(pa.ipc.open_file(source).schema.metadata[METADATA_KEY])
+        return metadata['state'] if metadata.get('version') == VERSION else None
+
+    def load(self, token):
+        """``(threat_data, state)`` from a session's snapshot, or None if it has none"""
+        path = self._current(token)
+        if path is None:
+            return None
+
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+            metadata = json.loads(table.schema.metadata[METADATA_KEY])
+            if metadata.get('version') != VERSION:
+                return None
+            threats = table.column('threat').to_pylist()
+            rows = zip(*(table.column(name).to_pylist() for name, _ in FIELDS))
+
+            articles = {threat: [] for threat in metadata['threats']}
+            for threat, row in zip(threats, rows):
+                record = ThreatArticle(*row)
+                record.indicators = tuple(map(tuple, record.indicators))
+                articles[threat].append(record)
+
+        threat_data = {threat: {'raw_ref': raw_ref, 'index': ScoredArticleIndex(articles[threat])}
+                       for threat, raw_ref in metadata['threats'].items()}
+        return threat_data, metadata['state']
+
+    def delete(self, token):
+        path = self._path(token)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def purge_expired(self):
+        """Remove snapshots older than the TTL; returns how many"""
+        if not os.path.isdir(self.directory):
+            return 0
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith('.arrow') and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        return removed
@@ -0,0 +1,215 @@
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from config.settings import SESSION_CONFIG, UI_CONFIG
+from utils.article_index import TopKIndex
+from utils.cache_backend import MemoryCache, ObjectCache, get_cache
+from utils.indicators import IndicatorIndex
+from utils.rollups import ThreatRollup
+
+MB = 1024 * 1024
+
+_CONTAINERS = (list, tuple, set, frozenset, deque)
+_SKIP = (type, type(sys), type(len), type(lambda: None))
+_slot_names = {}
+
+
+def _slots(cls):
+    """Every ``__slots__`` name declared along a class's MRO (memoised)"""
+    names = _slot_names.get(cls)
+    if names is None:
+        names = _slot_names[cls] = tuple(name for klass in cls.__mro__
+                                         for name in getattr(klass, '__slots__', ()) if name != '__weakref__')
+    return names
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes held by an object graph, counting shared objects once
+
+    Follows containers, instance ``__dict__`` and ``__slots__``; NumPy
+    arrays count their buffer. Pass the same ``seen`` set to several calls
+    to attribute objects shared between them to the first.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SKIP):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float)):
+            continue
+        if isinstance(item, np.ndarray):
+            if item.base is not None:
+                stack.append(item.base)
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, _CONTAINERS):
+            stack.extend(item)
+        else:
+            attributes = getattr(item, '__dict__', None)
+            if attributes is not None:
+                stack.append(attributes)
+            stack.extend(getattr(item, name) for name in _slots(type(item)) if hasattr(item, name))
+    return total
+
+
+def session_results(threat_data, severity_filter):
+    """A session's dashboard results: its threat data and the indexes built from it"""
+    return {
+        'threat_data': threat_data,
+        'rollup': ThreatRollup.from_threat_data(threat_data, severity_filter),
+        'alert_index': TopKIndex.from_threat_data(threat_data, UI_CONFIG['max_critical_alerts']),
+        'indicator_index': IndicatorIndex.from_threat_data(threat_data)
+    }
+
+
+def default_spill_backend():
+    """Shared tier of the process cache, or None when there is nothing to spill to
+
+    Spilled results go straight to the shared tier, skipping the
+    per-process memory tier; spilling into the 'memory' backend would free
+    nothing.
+    """
+    cache = get_cache()
+    shared = getattr(cache, 'shared', cache)
+    return None if isinstance(shared, MemoryCache) else shared
+
+
+class _Entry:
+    __slots__ = ('results', 'size', 'articles', 'state', 'touched')
+
+    def __init__(self, results, size, articles):
+        self.results = results
+        self.size = size
+        self.articles = articles
+        self.state = 'memory'
+        self.touched = time.time()
+
+
+class SessionStore:
+    """Dashboard results of every session in the process, under a memory budget
+
+    The threat data of each session and the indexes built from it are
+    kept here, keyed by the session's token, instead of in
+    ``st.session_state``, so that one place accounts for and bounds them.
+    An entry's footprint (deep size, articles shared between its indexes
+    counted once) is measured when it is stored.
+
+    - Results larger than the per-session budget are spilled to the shared
+      cache at once, and loaded for each rerun rather than kept in memory.
+    - When the results held in memory exceed the total budget, the least
+      recently used sessions are spilled until they fit, and loaded back
+      whole when that session next reruns.
+    - With no shared tier to spill to ('memory' cache backend), or once the
+      shared cache has dropped the entry, results are evicted and the
+      session has to fetch again.
+
+    Sessions idle for ``idle_ttl`` seconds are forgotten. Shared by every
+    session in the process, so access is locked.
+    """
+
+    def __init__(self, session_budget_mb=None, total_budget_mb=None, backend=None, spill_ttl=None, idle_ttl=None):
+        self.session_budget = int((session_budget_mb or SESSION_CONFIG['session_budget_mb']) * MB)
+        self.total_budget = int((total_budget_mb or SESSION_CONFIG['total_budget_mb']) * MB)
+        self.spill_ttl = spill_ttl or SESSION_CONFIG['spill_ttl']
+        self.idle_ttl = idle_ttl or SESSION_CONFIG['idle_ttl']
+        backend = backend if backend is not None else default_spill_backend()
+        self.cache = ObjectCache(backend, 'session') if backend is not None else None
+
+        self._entries = OrderedDict()   # token -> _Entry, least recently used first
+        self._lock = threading.RLock()
+        self.stats = {'stored': 0, 'spilled': 0, 'reloaded': 0, 'evicted': 0}
+
+    def put(self, token, results, articles=0):
+        """Store a session's results, replacing any it had; returns their footprint in bytes"""
+        size = deep_sizeof(results)
+        with self._lock:
+            self._forget(token)
+            entry = self._entries[token] = _Entry(results, size, articles)
+            self.stats['stored'] += 1
+            if size > self.session_budget:
+                self._spill(token, entry)
+            self._enforce(keep=token)
+            return size
+
+    def get(self, token):
+        """A session's results, loaded back if spilled; None if it has none or they were evicted"""
+        with self._lock:
+            self._forget_idle()
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            entry.touched = time.time()
+            self._entries.move_to_end(token)
+            if entry.state != 'spilled':
+                return entry.results
+
+            try:
+                results = self.cache.get(token)
+            except Exception:
+                results = None
+            if results is None:
+                entry.state = 'evicted'
+                self.stats['evicted'] += 1
+                return None
+            self.stats['reloaded'] += 1
+            if entry.size <= self.session_budget:
+                entry.results, entry.state = results, 'memory'
+                self._enforce(keep=token)
+            return results
+
+    def _spill(self, token, entry):
+        """Move an entry's results to the shared cache, or evict them if that fails"""
+        entry.state = 'evicted'
+        if self.cache is not None:
+            try:
+                self.cache.set(token, entry.results, ttl=self.spill_ttl)
+                entry.state = 'spilled'
+            except Exception:
+                pass
+        self.stats['spilled' if entry.state == 'spilled' else 'evicted'] += 1
+        entry.results = None
+
+    def _enforce(self, keep):
+        """Spill least recently used results until those in memory fit the total budget"""
+        resident = self.resident_bytes()
+        for token, entry in list(self._entries.items()):
+            if resident <= self.total_budget:
+                break
+            if token != keep and entry.state == 'memory':
+                self._spill(token, entry)
+                resident -= entry.size
+
+    def _forget(self, token):
+        entry = self._entries.pop(token, None)
+        if entry is not None and entry.state == 'spilled':
+            try:
+                self.cache.delete(token)
+            except Exception:
+                pass
+
+    def _forget_idle(self):
+        cutoff = time.time() - self.idle_ttl
+        for token in [token for token, entry in self._entries.items() if entry.touched < cutoff]:
+            self._forget(token)
+
+    def resident_bytes(self):
+        """Footprint of the results currently held in memory"""
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values() if entry.state == 'memory')
+
+    def sessions(self):
+        """Per-session footprint, largest first: token, bytes, articles, state and idle seconds"""
+        now = time.time()
+        with self._lock:
+            rows = [{'token': token, 'bytes': entry.size, 'articles': entry.articles, 'state': entry.state,
+                     'idle': now - entry.touched} for token, entry in self._entries.items()]
+        return sorted(rows, key=lambda row: row['bytes'], reverse=True)
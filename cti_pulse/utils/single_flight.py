@@ -0,0 +1,80 @@
+import threading
+
+
+class _Call:
+    """One in-flight call that other threads can wait on"""
+
+    def __init__(self, size):
+        self.size = size
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one execution
+
+    Calls are grouped by ``key``. ``size`` describes how much the call
+    returns (e.g. the requested result count): a caller asking for no more
+    than an in-flight call's size waits for that call and shares its result
+    instead of starting its own. Thread-safe; Streamlit runs each session in
+    its own thread.
+
+    Only a leader's ``Exception`` is shared with the callers waiting on it.
+    Anything else (Streamlit's rerun and stop signals, KeyboardInterrupt)
+    belongs to the leader's own thread: its waiters are woken and retry,
+    one of them leading the call again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, size, fn, share=None):
+        """Run ``fn`` unless a covering call is in flight
+
+        Returns ``(result, shared)`` where ``shared`` is True when the result
+        came from another caller's execution and may be larger than ``size``.
+        A shared result is passed through ``share`` first, e.g. to give each
+        caller its own copy of a mutable result.
+        """
+        while True:
+            with self._lock:
+                call = next((c for c in self._calls.get(key, []) if c.size >= size), None)
+                leader = call is None
+                if leader:
+                    call = _Call(size)
+                    self._calls.setdefault(key, []).append(call)
+            if leader:
+                break
+
+            call.event.wait()
+            if call.abandoned:
+                continue
+            if call.error is not None:
+                raise call.error
+            return (share(call.result) if share else call.result), True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            call.abandoned = True
+            raise
+        finally:
+            with self._lock:
+                calls = self._calls.get(key, [])
+                calls.remove(call)
+                if not calls:
+                    self._calls.pop(key, None)
+            call.event.set()
+
+        return call.result, False
+
+    def in_flight(self):
+        """Number of calls currently executing"""
+        with self._lock:
+            return sum(len(calls) for calls in self._calls.values())
@@ -0,0 +1,561 @@
+import base64
+import gzip
+import hashlib
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from datetime import date
+
+import numpy as np
+
+from config.settings import SKETCH_CONFIG
+from utils.indicators import extract_indicators
+from utils.trends import day_number, is_future
+
+# History columns the sketches read
+SKETCH_COLUMNS = ('article_id', 'threat_keyword', 'category', 'source', 'title', 'summary',
+                  'published_date', 'threat_score')
+
+_MASK64 = (1 << 64) - 1
+
+
+def hash64(value):
+    """Stable 64-bit hash of a string"""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _month_of(day):
+    month = date.fromordinal(day)
+    return month.year, month.month
+
+
+def _encode(array):
+    return base64.b64encode(array.tobytes()).decode('ascii')
+
+
+def _decode(text, dtype):
+    return np.frombuffer(base64.b64decode(text), dtype=dtype).copy()
+
+
+class HyperLogLog:
+    """Distinct-count sketch: ``2**precision`` one-byte registers
+
+    Standard error is 1.04 / sqrt(2**precision), 1.6% at precision 12.
+    Merging takes the register-wise maximum, so a merged sketch equals the
+    sketch of the union.
+    """
+
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision=None, registers=None):
+        self.precision = precision or SKETCH_CONFIG['hll_precision']
+        self.registers = registers if registers is not None else np.zeros(1 << self.precision, dtype=np.uint8)
+
+    def add(self, value):
+        h = hash64(value)
+        index = h >> (64 - self.precision)
+        rest = (h << self.precision) & _MASK64
+        rank = 65 - rest.bit_length() if rest else 65 - self.precision
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.ldexp(1.0, -self.registers.astype(np.int32)).sum()
+        zeros = m - np.count_nonzero(self.registers)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)   # Linear counting for small cardinalities
+        return int(round(estimate))
+
+    def to_dict(self):
+        return {'precision': self.precision, 'registers': _encode(self.registers)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['precision'], _decode(data['registers'], np.uint8))
+
+
+class SpaceSaving:
+    """Heavy-hitter counts over a stream using ``capacity`` counters
+
+    Each reported count overestimates the true count by at most its
+    ``error`` term, which never exceeds total / capacity; every item whose
+    true count is above total / capacity is reported. Mergeable with the
+    same guarantee, with total being the merged total. Evicting the
+    smallest counter uses a lazily cleaned heap, so updates are O(log k).
+    """
+
+    __slots__ = ('capacity', 'counts', 'errors', 'total', '_heap')
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or SKETCH_CONFIG['heavy_hitters']
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        self._heap = []
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, item, count=1):
+        self.total += count
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+        else:
+            floor = self._pop_min()
+            counts[item] = floor + count
+            self.errors[item] = floor
+        self._push(item)
+
+    def _push(self, item):
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self):
+        """Remove the smallest counter, returning its count"""
+        heap, counts = self._heap, self.counts
+        while True:
+            count, item = heapq.heappop(heap)
+            if counts.get(item) == count:
+                del counts[item]
+                del self.errors[item]
+                return count
+
+    def min_count(self):
+        """Count any unreported item could at most have"""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def top(self, n=None):
+        """``[(item, count, error), ...]`` by descending count"""
+        items = heapq.nlargest(n, self.counts.items(), key=lambda kv: kv[1]) if n else \
+            sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        return [(item, count, self.errors[item]) for item, count in items]
+
+    @classmethod
+    def merged(cls, summaries, capacity=None):
+        """One summary of the union of several streams"""
+        result = cls(capacity)
+        floors = [summary.min_count() for summary in summaries]
+        # An item missing from a full summary may have had up to that summary's floor there
+        base = sum(floors)
+        counts, errors = {}, {}
+        for summary, floor in zip(summaries, floors):
+            for item, count in summary.counts.items():
+                counts[item] = counts.get(item, base) + count - floor
+                errors[item] = errors.get(item, base) + summary.errors[item] - floor
+            result.total += summary.total
+        kept = heapq.nlargest(result.capacity, counts.items(), key=lambda kv: kv[1])
+        result.counts = dict(kept)
+        result.errors = {item: errors[item] for item in result.counts}
+        result._heap = [(count, item) for item, count in kept]
+        heapq.heapify(result._heap)
+        return result
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'total': self.total,
+                'items': [[item, count, self.errors[item]] for item, count in self.counts.items()]}
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(data['capacity'])
+        summary.total = data['total']
+        for item, count, error in data['items']:
+            summary.counts[item] = count
+            summary.errors[item] = error
+        summary._heap = [(count, item) for item, count in summary.counts.items()]
+        heapq.heapify(summary._heap)
+        return summary
+
+
+class TDigest:
+    """Mergeable quantile sketch (merging t-digest, k1 scale function)
+
+    Keeps about ``compression`` / 2 centroids, fewer for discrete data.
+    Rank error is smallest at the tails and at most about
+    ``pi / compression`` (3% at 100) in the middle; min and max are exact.
+    Compression is vectorised, so merging many digests is one sort.
+    """
+
+    __slots__ = ('compression', 'means', 'weights', 'exact', 'minimum', 'maximum', '_buffer')
+
+    def __init__(self, compression=None):
+        self.compression = compression or SKETCH_CONFIG['tdigest_compression']
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.exact = np.empty(0, dtype=bool)     # Centroid holds a single distinct value
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._buffer = []
+
+    @property
+    def count(self):
+        return float(self.weights.sum()) + len(self._buffer)
+
+    def add(self, value):
+        self._buffer.append(value)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def _compress(self, means=(), weights=(), exact=()):
+        buffered = len(self._buffer)
+        means = np.concatenate([self.means, np.asarray(self._buffer, dtype=float), *means])
+        weights = np.concatenate([self.weights, np.ones(buffered), *weights])
+        exact = np.concatenate([self.exact, np.ones(buffered, dtype=bool), *exact])
+        self._buffer = []
+        if not len(means):
+            return
+        # Equal values collapse exactly, which keeps discrete scores sharp
+        means, inverse = np.unique(means, return_inverse=True)
+        weights = np.bincount(inverse, weights=weights)
+        exact = np.bincount(inverse, weights=~exact) == 0
+
+        # Centroid boundaries at whole steps of the k1 scale, so each
+        # centroid covers at most one unit of k: small at the tails
+        total = weights.sum()
+        q_left = (np.cumsum(weights) - weights) / total
+        bins = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * q_left - 1)).astype(np.int64)
+        bins -= bins[0]
+        merged_weights = np.bincount(bins, weights=weights)
+        occupied = merged_weights > 0
+        self.weights = merged_weights[occupied]
+        self.means = np.bincount(bins, weights=means * weights)[occupied] / self.weights
+        # Still exact if the bin received one exact value and nothing else
+        self.exact = (np.bincount(bins)[occupied] == 1) & (np.bincount(bins, weights=exact)[occupied] == 1)
+
+    @classmethod
+    def merged(cls, digests, compression=None):
+        """One digest of the union, compressed once over all centroids"""
+        result = cls(compression)
+        for digest in digests:
+            result._buffer.extend(digest._buffer)
+            result.minimum = min(result.minimum, digest.minimum)
+            result.maximum = max(result.maximum, digest.maximum)
+        result._compress([digest.means for digest in digests], [digest.weights for digest in digests],
+                         [digest.exact for digest in digests])
+        return result
+
+    def quantile(self, q):
+        if self._buffer:
+            self._compress()
+        total = self.weights.sum()
+        if not total:
+            return None
+        cumulative = np.cumsum(self.weights)
+        containing = min(int(np.searchsorted(cumulative, q * total)), len(cumulative) - 1)
+        if self.exact[containing]:
+            return float(self.means[containing])
+        centers = cumulative - self.weights / 2
+        return float(np.interp(q * total, np.concatenate([[0], centers, [total]]),
+                               np.concatenate([[self.minimum], self.means, [self.maximum]])))
+
+    def to_dict(self):
+        if self._buffer:
+            self._compress()
+        return {'compression': self.compression, 'means': self.means.tolist(), 'weights': self.weights.tolist(),
+                'exact': self.exact.tolist(), 'min': self.minimum, 'max': self.maximum}
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(data['compression'])
+        digest.means = np.array(data['means'], dtype=float)
+        digest.weights = np.array(data['weights'], dtype=float)
+        digest.exact = np.array(data['exact'], dtype=bool)
+        digest.minimum = data['min'] if data['min'] is not None else math.inf
+        digest.maximum = data['max'] if data['max'] is not None else -math.inf
+        return digest
+
+
+class BloomFilter:
+    """Set membership with false positives only, in ``capacity`` * ~14 bits at 0.1%"""
+
+    __slots__ = ('bits', 'size', 'hashes')
+
+    def __init__(self, capacity=None, error_rate=None, bits=None, hashes=None):
+        capacity = capacity or SKETCH_CONFIG['dedupe_capacity']
+        error_rate = error_rate or SKETCH_CONFIG['dedupe_error_rate']
+        if bits is None:
+            size = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            bits = np.zeros((size + 7) // 8, dtype=np.uint8)
+            hashes = max(1, round(size / capacity * math.log(2)))
+        self.bits = bits
+        self.size = len(bits) * 8
+        self.hashes = hashes
+
+    def add(self, value):
+        """Add ``value``, returning True if it was (probably) already present"""
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        present = True
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % self.size
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                present = False
+                self.bits[byte] |= mask
+        return present
+
+    def to_dict(self):
+        return {'hashes': self.hashes, 'bits': _encode(self.bits)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(bits=_decode(data['bits'], np.uint8), hashes=data['hashes'])
+
+
+class SketchBucket:
+    """Sketches of one day's articles; merging buckets gives any date range"""
+
+    __slots__ = ('articles', 'sources', 'indicators', 'top_sources', 'categories', 'threats', 'scores')
+
+    def __init__(self):
+        self.articles = 0
+        self.sources = HyperLogLog()
+        self.indicators = HyperLogLog()
+        self.top_sources = SpaceSaving()
+        self.categories = SpaceSaving()
+        self.threats = SpaceSaving()
+        self.scores = TDigest()
+
+    def add(self, article):
+        self.articles += 1
+        source = article.get('source') or 'Unknown'
+        self.sources.add(source)
+        self.top_sources.add(source)
+        self.categories.add(article.get('category') or 'Unknown')
+        self.threats.add(article['threat_keyword'])
+        if article.get('threat_score') is not None:
+            self.scores.add(article['threat_score'])
+        for kind, value in extract_indicators(article.get('title'), article.get('summary')):
+            self.indicators.add(f"{kind}:{value}")
+
+    @classmethod
+    def merged(cls, buckets):
+        result = cls()
+        for bucket in buckets:
+            result.articles += bucket.articles
+            result.sources.merge(bucket.sources)
+            result.indicators.merge(bucket.indicators)
+        result.scores = TDigest.merged([b.scores for b in buckets])
+        result.top_sources = SpaceSaving.merged([b.top_sources for b in buckets])
+        result.categories = SpaceSaving.merged([b.categories for b in buckets])
+        result.threats = SpaceSaving.merged([b.threats for b in buckets])
+        return result
+
+    def to_dict(self):
+        return {name: getattr(self, name) if name == 'articles' else getattr(self, name).to_dict()
+                for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        bucket = cls()
+        bucket.articles = data['articles']
+        bucket.sources = HyperLogLog.from_dict(data['sources'])
+        bucket.indicators = HyperLogLog.from_dict(data['indicators'])
+        bucket.top_sources = SpaceSaving.from_dict(data['top_sources'])
+        bucket.categories = SpaceSaving.from_dict(data['categories'])
+        bucket.threats = SpaceSaving.from_dict(data['threats'])
+        bucket.scores = TDigest.from_dict(data['scores'])
+        return bucket
+
+
+class HistorySketches:
+    """Per-day sketch buckets over the whole article history
+
+    Follows the HistoryStore like TrendDetector does and snapshots to a
+    gzipped JSON file. Articles re-ingested by later fetches are skipped
+    with a Bloom filter on (threat, article id), so counts are of distinct
+    articles, up to the filter's false-positive rate. There is one filter
+    per publication month, dropped with the month's last bucket, so the
+    filters stay as bounded as the buckets. Days are kept for ``max_days``
+    before today; articles dated more than a day ahead are ignored, so a
+    bad date cannot expire the real history. Range aggregates
+    never touch the article rows: calendar months wholly inside the range
+    use a cached merge of their days, so a year costs about twelve month
+    buckets plus the partial months at either end. Each snapshot is
+    self-consistent, so the dashboard and API service can share one file.
+    """
+
+    def __init__(self, state_path=None, max_days=None):
+        self.state_path = state_path or SKETCH_CONFIG['state_path']
+        self.max_days = max_days or SKETCH_CONFIG['max_days']
+        self.buckets = {}
+        self._months = {}        # (year, month) -> merged bucket of a fully covered month
+        self.seen = {}           # (year, month) -> Bloom filter of the month's (threat, article id)
+        self.mark = 0
+        self.stats = {'added': 0, 'duplicates': 0, 'undated': 0, 'expired': 0, 'future': 0}
+        self._synced_at = 0.0
+        self._lock = threading.RLock()
+
+    def _cutoff(self):
+        """Last day too old to keep"""
+        return date.today().toordinal() - self.max_days
+
+    def add(self, article):
+        """Sketch one article into its publication day's bucket"""
+        day = day_number(article.get('published_date'))
+        with self._lock:
+            if day is None:
+                self.stats['undated'] += 1
+                return
+            if is_future(day):
+                self.stats['future'] += 1
+                return
+            if day <= self._cutoff():
+                self.stats['expired'] += 1
+                return
+            seen = self.seen.get(_month_of(day))
+            if seen is None:
+                seen = self.seen[_month_of(day)] = BloomFilter()
+            if seen.add(f"{article['threat_keyword']}\x1f{article['article_id']}"):
+                self.stats['duplicates'] += 1
+                return
+            bucket = self.buckets.get(day)
+            if bucket is None:
+                bucket = self.buckets[day] = SketchBucket()
+                self._expire()
+            bucket.add(article)
+            self._months.pop(_month_of(day), None)
+            self.stats['added'] += 1
+
+    def _expire(self):
+        cutoff = self._cutoff()
+        for day in [day for day in self.buckets if day <= cutoff]:
+            del self.buckets[day]
+            self._months.pop(_month_of(day), None)
+            self.stats['expired'] += 1
+        first_month = _month_of(cutoff + 1)
+        for month in [month for month in self.seen if month < first_month]:
+            del self.seen[month]
+
+    def sync(self, history_store, force=False, interval=None):
+        """Sketch rows ingested since the last sync; returns the number read"""
+        interval = SKETCH_CONFIG['sync_interval'] if interval is None else interval
+        with self._lock:
+            if not force and time.time() - self._synced_at < interval:
+                return 0
+            self._synced_at = time.time()
+
+            consumed = 0
+            while True:
+                rows = history_store.ingested_since(self.mark, columns=SKETCH_COLUMNS)
+                if not rows:
+                    break
+                for row in rows:
+                    self.add(row)
+                consumed += len(rows)
+                self.mark = rows[-1]['rowid']
+
+            if consumed:
+                self.save()
+            return consumed
+
+    def days(self):
+        """First and last day with sketched articles, as dates"""
+        with self._lock:
+            if not self.buckets:
+                return None, None
+            return date.fromordinal(min(self.buckets)), date.fromordinal(max(self.buckets))
+
+    def aggregate(self, since=None, until=None, top_n=10):
+        """Approximate aggregates for publication dates in [since, until]
+
+        ``since`` and ``until`` are dates (inclusive, open-ended if None).
+        Returned counts come with their error bounds: ``±`` terms for
+        heavy hitters (Space-Saving) and the relative standard error of
+        the distinct counts (HyperLogLog).
+        """
+        low = since.toordinal() if since else -math.inf
+        high = until.toordinal() if until else math.inf
+        with self._lock:
+            merged = SketchBucket.merged(self._range_buckets(low, high))
+
+        return {
+            'articles': merged.articles,
+            'distinct_sources': merged.sources.count(),
+            'distinct_indicators': merged.indicators.count(),
+            'distinct_error': round(1.04 / math.sqrt(len(merged.sources.registers)), 4),
+            'top_sources': merged.top_sources.top(top_n),
+            'categories': merged.categories.top(),
+            'threats': merged.threats.top(),
+            'heavy_hitter_error': math.ceil(merged.top_sources.total / merged.top_sources.capacity),
+            'score_quantiles': {f"p{int(q * 100)}": merged.scores.quantile(q) for q in (0.5, 0.9, 0.99)}
+        }
+
+    def _range_buckets(self, low, high):
+        """Day buckets in [low, high], with wholly covered months pre-merged"""
+        by_month = {}
+        for day in self.buckets:
+            if low <= day <= high:
+                by_month.setdefault(_month_of(day), []).append(day)
+
+        selected = []
+        for (year, month), days in by_month.items():
+            first = date(year, month, 1).toordinal()
+            last = (date(year + month // 12, month % 12 + 1, 1).toordinal()) - 1
+            if low <= first and last <= high:
+                cached = self._months.get((year, month))
+                if cached is None:
+                    cached = self._months[(year, month)] = SketchBucket.merged([self.buckets[d] for d in days])
+                selected.append(cached)
+            else:
+                selected.extend(self.buckets[day] for day in days)
+        return selected
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'version': 3,
+                'saved_at': time.time(),
+                'mark': self.mark,
+                'stats': self.stats,
+                'seen': {f"{year}-{month}": seen.to_dict() for (year, month), seen in self.seen.items()},
+                'buckets': {str(day): bucket.to_dict() for day, bucket in self.buckets.items()}
+            }
+
+    def save(self, path=None):
+        """Atomically write the sketches as gzipped JSON"""
+        path = path or self.state_path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=1) as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None, **kwargs):
+        """Restore from a snapshot, or start empty if there is none
+
+        Snapshots from before the per-month filters are ignored; the next
+        sync rebuilds the sketches from the history instead.
+        """
+        sketches = cls(state_path=path, **kwargs)
+        if os.path.exists(sketches.state_path):
+            with gzip.open(sketches.state_path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version', 1) < 3:
+                return sketches
+            sketches.mark = data['mark']
+            sketches.stats.update(data['stats'])
+            sketches.seen = {tuple(map(int, month.split('-'))): BloomFilter.from_dict(seen)
+                             for month, seen in data['seen'].items()}
+            sketches.buckets = {int(day): SketchBucket.from_dict(bucket) for day, bucket in data['buckets'].items()}
+        return sketches
@@ -1,39 +1,31 @@
-import re
-import streamlit as st
-from datetime import datetime
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-from config.settings import CYBER_THREATS, CYBER_KEYWORDS, THREAT_SCORING, HIGH_IMPACT_KEYWORDS, MAJOR_SECURITY_SOURCES
+from config.settings import CYBER_THREATS, CYBER_KEYWORDS, THREAT_SCORING, CACHE_CONFIG
+from utils.cache_backend import ObjectCache, get_cache
+from utils.article_record import ThreatArticle
+from utils.indicators import extract_article_indicators
+from utils.attack_tagger import get_attack_tagger
+from utils.scoring import ScoringModel
+from utils.sentiment import BatchSentimentAnalyzer
+from utils.tokens import STOPWORDS, get_vocabulary
 
 
 class ThreatProcessor:
     """Process and analyze threat intelligence data"""
 
     def __init__(self):
-        self.sia = SentimentIntensityAnalyzer()
+        self.vocabulary = get_vocabulary()
+        self.sentiment = BatchSentimentAnalyzer(self.vocabulary)
+        self.scoring_model = ScoringModel()
+        self.attack_tagger = get_attack_tagger()
+        self.analysis_cache = ObjectCache(get_cache(), 'analysis')
 
     def extract_cybersecurity_terms(self, user_query):
         """Extract cybersecurity-related terms from natural language query using NLP"""
         query_lower = user_query.lower()
 
-        # Simple tokenization with fallback
-        try:
-            from nltk.corpus import stopwords
-            from nltk.tokenize import word_tokenize
-
-            stop_words = set(stopwords.words('english'))
-            tokens = word_tokenize(query_lower)
-            tokens = [token for token in tokens if token.isalpha() and token not in stop_words]
-        except Exception as e:
-            st.warning(f"Using simple tokenization: {str(e)}")
-            simple_stop_words = {
-                'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
-                'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be',
-                'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                'would', 'could', 'should', 'may', 'might', 'can', 'what',
-                'how', 'when', 'where', 'why', 'who', 'this', 'that', 'these', 'those'
-            }
-            tokens = re.findall(r'\b[a-zA-Z]+\b', query_lower)
-            tokens = [token for token in tokens if token not in simple_stop_words and len(token) > 2]
+        # Query words, tokenised like article text, minus stopwords
+        token_ids = self.vocabulary.encode(user_query)
+        stopword = self.vocabulary.column('stopword', STOPWORDS.__contains__, bool)
+        tokens = set(token_ids[~stopword[token_ids]].tolist())
 
         # Find matching cybersecurity terms
         confidence_scores = {}
@@ -61,7 +53,7 @@ class ThreatProcessor:
                         score += 12
                     else:
                         score += 6
-                elif any(word in synonym.split() for word in tokens):
+                elif not tokens.isdisjoint(self.vocabulary.id(word) for word in synonym.split()):
                     score += 2
 
             if score > 0:
@@ -126,46 +118,92 @@ class ThreatProcessor:
                 confidence_scores['cyber attack'] = confidence_scores.get('cyber attack', 0) + 3
 
     def analyze_threat_sentiment(self, threat_data, threat_keyword):
-        """Enhanced threat analysis with scoring"""
+        """Enhanced threat analysis with scoring
+
+        Results for a stored response (identified by its ``raw_ref``) are
+        shared with other processes through the cache backend.
+        """
         if not threat_data or 'results' not in threat_data:
             return []
 
-        threat_analysis = []
+        raw_ref = threat_data.get('raw_ref')
+        cache_key = f"{threat_keyword}:{raw_ref}:{len(threat_data['results'])}"
+        if raw_ref:
+            cached = self.analysis_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        threat_analysis = self._analyze_results(threat_data, threat_keyword)
+
+        if raw_ref:
+            self.analysis_cache.set(cache_key, threat_analysis, ttl=CACHE_CONFIG['analysis_ttl'])
+        return threat_analysis
+
+    def analyze_results_at(self, threat_data, threat_keyword, indices):
+        """Analyse only the articles at ``indices`` of a response (uncached)
+
+        Used by adaptive fetching to score just the newly arrived part of a
+        larger response.
+        """
+        if not threat_data or 'results' not in threat_data:
+            return []
+        return self._analyze_results(threat_data, threat_keyword, indices)
 
-        for article in threat_data['results']:
-            summary = article.get('summary', '')
-            title = article.get('title', '')
+    def _analyze_results(self, threat_data, threat_keyword, indices=None):
+        """Run sentiment analysis and scoring over the articles in a response"""
+        analysis_items = []
+        raw_ref = threat_data.get('raw_ref')
+        results = threat_data['results']
+        indices = range(len(results)) if indices is None else list(indices)
 
-            # Clean the text
-            clean_summary = re.sub(r"http\S+|www\.\S+", "", summary.lower())
-            clean_summary = re.sub(r"[^a-z\s]", " ", clean_summary)
-            clean_summary = re.sub(r"\s+", " ", clean_summary).strip()
+        # Tokenise the summaries once; sentiment, scoring and clustering read the token IDs
+        token_ids, offsets = self.vocabulary.encode_batch([results[index].get('summary') or '' for index in indices])
+        sentiment = self.sentiment.score_tokens(token_ids, offsets)
 
-            # Get sentiment
-            sentiment = self.sia.polarity_scores(clean_summary)
+        for position, (index, compound, neg) in enumerate(zip(indices, sentiment['compound'].tolist(),
+                                                              sentiment['neg'].tolist())):
+            article = results[index]
+            # The API sends null for missing fields, so fall back on `or`, not get() defaults
+            summary = article.get('summary') or ''
+            title = article.get('title') or ''
+            url = article.get('url') or ''
+
+            # Extract IOCs/CVEs from the raw text (cleaning strips digits and dots)
+            indicators = extract_article_indicators(article)
+
+            # Tag ATT&CK techniques from the article content
+            techniques = self.attack_tagger.tag_article(article)
 
             # Get date and source
-            published_date = article.get('timestamp', 'Date not available')
-            source = self._extract_source(article.get('url', ''))
+            published_date = article.get('timestamp') or 'Date not available'
+            source = self._extract_source(url)
 
             analysis_item = {
                 'title': title,
                 'summary': summary,
-                'clean_summary': clean_summary,
-                'sentiment_compound': sentiment['compound'],
-                'sentiment_neg': sentiment['neg'],
+                'url': url,
+                'token_ids': token_ids[offsets[position]:offsets[position + 1]],
+                'sentiment_compound': compound,
+                'sentiment_neg': neg,
                 'published_date': published_date,
                 'source': source,
-                'highlights': article.get('highlights', []),
+                'highlights': article.get('highlights') or [],
                 'threat_keyword': threat_keyword,
                 'category': CYBER_THREATS.get(threat_keyword, {}).get("category", "Unknown"),
-                'raw_article': article
+                'indicators': indicators,
+                'techniques': techniques
             }
 
-            # Calculate threat score
-            analysis_item['threat_score'] = self._calculate_threat_score(analysis_item, threat_keyword)
+            analysis_items.append(analysis_item)
 
-            threat_analysis.append(analysis_item)
+        # Score the whole batch at once
+        scores = self.scoring_model.score_batch(analysis_items, threat_keyword).tolist()
+
+        # Keep slim records; the raw articles stay in the payload store
+        threat_analysis = []
+        for index, analysis_item, score in zip(indices, analysis_items, scores):
+            analysis_item['threat_score'] = score
+            threat_analysis.append(ThreatArticle.from_analysis(analysis_item, raw_ref, index))
 
         return sorted(threat_analysis, key=lambda x: x['threat_score'], reverse=True)
 
@@ -183,65 +221,8 @@ class ThreatProcessor:
 
     def _calculate_threat_score(self, article, threat_keyword):
         """Calculate threat severity score based on multiple factors"""
-        base_severity = CYBER_THREATS.get(threat_keyword, {}).get("severity", 3)
-
-        # Sentiment factor
-        sentiment_score = 0
-        if article['sentiment_compound'] < -0.5:
-            sentiment_score = 3
-        elif article['sentiment_compound'] < -0.1:
-            sentiment_score = 2
-        elif article['sentiment_compound'] < 0.1:
-            sentiment_score = 1
-        else:
-            sentiment_score = 0
-
-        # Recency factor
-        recency_score = self._calculate_recency_score(article['published_date'])
-
-        # High impact keywords
-        keyword_score = 0
-        for keyword in HIGH_IMPACT_KEYWORDS:
-            if keyword in article['clean_summary']:
-                keyword_score += 0.5
-        keyword_score = min(keyword_score, 3)
-
-        # Source credibility boost
-        source_boost = 0
-        source_lower = article['source'].lower()
-        if any(source in source_lower for source in MAJOR_SECURITY_SOURCES):
-            source_boost = 1
-
-        # Calculate final score
-        final_score = base_severity + sentiment_score + recency_score + keyword_score + source_boost
-
-        # Normalize to 1-10 scale
-        final_score = min(10, max(1, final_score))
-
-        return final_score
+        return self.scoring_model.score(article, threat_keyword)
 
     def _calculate_recency_score(self, published_date):
         """Calculate recency score based on publication date"""
-        recency_score = 0
-        try:
-            if published_date != 'Date not available':
-                if 'T' in published_date:
-                    pub_date = datetime.fromisoformat(published_date.replace('Z', '+00:00'))
-                else:
-                    pub_date = datetime.strptime(published_date[:10], '%Y-%m-%d')
-
-                days_old = (datetime.now(pub_date.tzinfo) - pub_date).days
-                if days_old <= 7:
-                    recency_score = 2
-                elif days_old <= 30:
-                    recency_score = 1
-                elif days_old <= 90:
-                    recency_score = 0.5
-                else:
-                    recency_score = 0
-            else:
-                recency_score = 0.5
-        except:
-            recency_score = 0.5
-
-        return recency_score
\ No newline at end of file
+        return self.scoring_model.recency_score(published_date)
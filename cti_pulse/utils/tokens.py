@@ -0,0 +1,168 @@
+import re
+import threading
+
+import numpy as np
+
+# Function words, dropped before clustering, term analytics and query matching
+STOPWORDS = frozenset('''
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers him his how i if in into is it its itself just may me might more most must my new no nor
+not now of off on once only or other our ours out over own said same says she should so some such than
+that the their theirs them then there these they this those through to too under until up us very was we
+were what when where which while who whom why will with would you your yours
+'''.split())
+
+# Token ID 0: separates the texts of a batch, and fills in beyond either end of a text
+BOUNDARY = '\x00'
+
+_URL_RE = re.compile(r"http\S+|www\.\S+")
+_NON_LETTER_RE = re.compile(r"[^a-z\s]")
+_NON_LETTER_OR_BOUNDARY_RE = re.compile(r"[^a-z\s\x00]")
+
+
+def clean_text(text):
+    """Normalise article text for sentiment and keyword analysis"""
+    clean = re.sub(r"http\S+|www\.\S+", "", text.lower())
+    clean = re.sub(r"[^a-z\s]", " ", clean)
+    return re.sub(r"\s+", " ", clean).strip()
+
+
+def is_term(word):
+    """Content word: long enough and not a stopword"""
+    return len(word) > 2 and word not in STOPWORDS
+
+
+class _Column:
+    """Per-token values, filled in lazily as the vocabulary grows"""
+
+    __slots__ = ('fn', 'values', 'filled')
+
+    def __init__(self, fn, dtype):
+        self.fn = fn
+        self.values = np.zeros(1024, dtype=dtype)
+        self.filled = 0
+
+
+class _TokenIds(dict):
+    """Word -> token ID, assigning the next ID to unseen words on lookup"""
+
+    def __init__(self, words):
+        super().__init__()
+        self.words = words
+
+    def __missing__(self, word):
+        index = self[word] = len(self.words)
+        self.words.append(word)
+        return index
+
+
+class Vocabulary:
+    """Process-wide word <-> token ID table shared by every text consumer
+
+    Article text goes through ``clean_text`` and is split into words once,
+    when the article is analysed, giving a compact int32 array of token
+    IDs. Sentiment, keyword scoring, clustering, emerging terms and query
+    matching then read that array. What each consumer needs to know about a
+    word (lexicon valence, stopword, keyword hits, hash) is a column indexed
+    by token ID. A column is computed once per distinct word, not once per
+    occurrence.
+
+    IDs are only meaningful within this process, so they are never
+    persisted or shared; records that are pickled re-encode their text.
+    """
+
+    def __init__(self):
+        self.words = []
+        self._ids = _TokenIds(self.words)
+        self._columns = {}
+        self._lock = threading.RLock()
+        self._ids[BOUNDARY]
+
+    def __len__(self):
+        return len(self.words)
+
+    def id(self, word):
+        """Token ID of a word, added if new"""
+        with self._lock:
+            return self._ids[word]
+
+    def encode_batch(self, texts, clean=True):
+        """Token IDs of many texts as one flat array plus ``len(texts) + 1`` offsets
+
+        With ``clean`` the texts are normalised exactly as ``clean_text``
+        does, but with one pass of each regex over the whole batch; without
+        it they are only split on whitespace.
+        """
+        joined = f" {BOUNDARY} ".join(text.replace(BOUNDARY, ' ') for text in texts) + f" {BOUNDARY}"
+        if clean:
+            joined = _NON_LETTER_OR_BOUNDARY_RE.sub(' ', _URL_RE.sub('', joined.lower()))
+        words = joined.split()
+        with self._lock:
+            raw = np.fromiter(map(self._ids.__getitem__, words), dtype=np.int32, count=len(words))
+        boundaries = np.flatnonzero(raw == 0)
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        offsets[1:] = boundaries - np.arange(len(boundaries))
+        return raw[raw != 0], offsets
+
+    def encode(self, text, clean=True):
+        """Token IDs of one text"""
+        text = _NON_LETTER_RE.sub(' ', _URL_RE.sub('', text.lower())) if clean else text.replace(BOUNDARY, ' ')
+        words = text.split()
+        with self._lock:
+            return np.fromiter(map(self._ids.__getitem__, words), dtype=np.int32, count=len(words))
+
+    def decode(self, ids):
+        """The cleaned text the token IDs were encoded from"""
+        return ' '.join(map(self.words.__getitem__, ids.tolist()))
+
+    def column(self, name, fn, dtype):
+        """``fn(word)`` for every token ID, as an array indexed by token ID
+
+        The first caller of a name decides ``fn``; later calls only extend
+        the column to words added since, so fetch a column after encoding
+        the text it is applied to. ``fn`` may itself add words.
+        """
+        with self._lock:
+            column = self._columns.get(name)
+            if column is None:
+                column = self._columns[name] = _Column(fn, dtype)
+            while column.filled < len(self.words):
+                if column.filled == len(column.values):
+                    grown = np.zeros(2 * len(column.values), dtype=column.values.dtype)
+                    grown[:column.filled] = column.values
+                    column.values = grown
+                column.values[column.filled] = column.fn(self.words[column.filled])
+                column.filled += 1
+            return column.values[:column.filled]
+
+
+def segment_or(values, offsets):
+    """Bitwise OR of ``values`` within each ``offsets`` segment (0 for empty ones)"""
+    starts = offsets[:-1]
+    result = np.zeros(len(starts), dtype=values.dtype)
+    nonempty = np.diff(offsets) > 0
+    if nonempty.any():
+        result[nonempty] = np.bitwise_or.reduceat(values, starts[nonempty])
+    return result
+
+
+def article_tokens(article):
+    """Token IDs of an article's summary: the stored array, or encoded now"""
+    tokens = article.get('token_ids')
+    if tokens is None:
+        tokens = get_vocabulary().encode(article.get('summary') or '')
+    return tokens
+
+
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_vocabulary():
+    """Process-wide vocabulary"""
+    global _vocabulary
+    with _vocabulary_lock:
+        if _vocabulary is None:
+            _vocabulary = Vocabulary()
+        return _vocabulary
@@ -0,0 +1,326 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from datetime import date
+
+from config.settings import TREND_CONFIG
+
+# History columns the detector reads
+TREND_COLUMNS = ('article_id', 'threat_keyword', 'source', 'published_date', 'threat_score')
+
+# Variance floors, so a quiet series does not flag one extra article (volume)
+# or half a point of severity as a spike
+VOLUME_VARIANCE_FLOOR = 1.0
+SEVERITY_VARIANCE_FLOOR = 0.25
+
+
+def day_number(published_date):
+    """Ordinal of an article's publication day, or None if undated"""
+    try:
+        return date.fromisoformat(published_date[:10]).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def is_future(day):
+    """Whether a publication day is more than a day past today: a bad date, not news"""
+    return day > date.today().toordinal() + 1
+
+
+def ewma_update(mean, var, value, alpha):
+    """One exponentially weighted update of a running mean and variance"""
+    diff = value - mean
+    increment = alpha * diff
+    return mean + increment, (1 - alpha) * (var + diff * increment)
+
+
+class SeriesBaseline:
+    """Daily volume and mean-severity baselines for one threat or source
+
+    The last ``lateness_days`` days stay open so late-arriving articles
+    still count; older days are closed once and folded into the EWMAs.
+    """
+
+    __slots__ = ('open', 'seen', 'newest', 'days', 'volume_mean', 'volume_var',
+                 'severity_days', 'severity_mean', 'severity_var')
+
+    def __init__(self):
+        self.open = {}           # day -> [count, score sum]
+        self.seen = {}           # day -> article ids counted that day
+        self.newest = None
+        self.days = 0
+        self.volume_mean = 0.0
+        self.volume_var = 0.0
+        self.severity_days = 0
+        self.severity_mean = 0.0
+        self.severity_var = 0.0
+
+    def volume_z(self, count):
+        return (count - self.volume_mean) / math.sqrt(self.volume_var + VOLUME_VARIANCE_FLOOR)
+
+    def severity_z(self, severity):
+        return (severity - self.severity_mean) / math.sqrt(self.severity_var + SEVERITY_VARIANCE_FLOOR)
+
+    def to_dict(self):
+        return {
+            'open': {str(day): bucket for day, bucket in self.open.items()},
+            'seen': {str(day): sorted(ids) for day, ids in self.seen.items()},
+            'newest': self.newest,
+            'days': self.days,
+            'volume': [self.volume_mean, self.volume_var],
+            'severity_days': self.severity_days,
+            'severity': [self.severity_mean, self.severity_var]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        series = cls()
+        series.open = {int(day): bucket for day, bucket in data['open'].items()}
+        series.seen = {int(day): set(ids) for day, ids in data['seen'].items()}
+        series.newest = data['newest']
+        series.days = data['days']
+        series.volume_mean, series.volume_var = data['volume']
+        series.severity_days = data['severity_days']
+        series.severity_mean, series.severity_var = data['severity']
+        return series
+
+
+class TrendDetector:
+    """Streaming spike detection on per-threat and per-source daily volume and severity
+
+    Each article updates the open daily bucket of its threat series and its
+    source series in O(1). When a series' newest day moves forward, days
+    leaving the lateness window are closed. A closed day is flagged as an
+    anomaly if its volume, or its mean severity, is ``z_threshold`` standard
+    deviations above the EWMA baseline. Only then is the day folded into
+    the baseline. A run of empty days costs O(1) apiece, capped at
+    ``max_gap_days``. Longer gaps decay the baseline in closed form.
+
+    The detector follows the HistoryStore like a log (``sync``) and
+    snapshots its state to JSON, so it never rescans history after the
+    first run.
+    """
+
+    def __init__(self, alpha=None, z_threshold=None, min_count=None, warmup=None, lateness_days=None,
+                 max_gap_days=None, max_events=None, state_path=None):
+        self.alpha = alpha or TREND_CONFIG['alpha']
+        self.z_threshold = z_threshold or TREND_CONFIG['z_threshold']
+        self.min_count = min_count or TREND_CONFIG['min_count']
+        self.warmup = warmup or TREND_CONFIG['warmup_days']
+        self.lateness_days = lateness_days or TREND_CONFIG['lateness_days']
+        self.max_gap_days = max(max_gap_days or TREND_CONFIG['max_gap_days'], self.lateness_days)
+        self.state_path = state_path or TREND_CONFIG['state_path']
+
+        self.series = {}
+        self.events = deque(maxlen=max_events or TREND_CONFIG['max_events'])
+        self.newest = None
+        self.mark = 0
+        self.stats = {'observed': 0, 'late': 0, 'duplicates': 0, 'undated': 0, 'future': 0}
+        self._synced_at = 0.0
+        self._lock = threading.RLock()
+
+    # Streaming updates
+
+    def observe(self, article):
+        """Count one article in its threat and source series"""
+        day = day_number(article.get('published_date'))
+        if day is None:
+            self.stats['undated'] += 1
+            return
+        # One article dated years ahead would close every real open day
+        if is_future(day):
+            self.stats['future'] += 1
+            return
+        with self._lock:
+            self.stats['observed'] += 1
+            if self.newest is None or day > self.newest:
+                self.newest = day
+            for key in (f"threat:{article['threat_keyword']}", f"source:{article['source']}"):
+                self._observe(key, day, article['article_id'], article['threat_score'])
+
+    def _observe(self, key, day, article_id, score):
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = SeriesBaseline()
+        if series.newest is None:
+            series.newest = day
+        elif day > series.newest:
+            self._advance(key, series, day)
+
+        if day <= series.newest - self.lateness_days:
+            self.stats['late'] += 1
+            return
+        seen = series.seen.setdefault(day, set())
+        if article_id in seen:
+            self.stats['duplicates'] += 1
+            return
+        seen.add(article_id)
+        bucket = series.open.setdefault(day, [0, 0.0])
+        bucket[0] += 1
+        bucket[1] += score
+
+    def _advance(self, key, series, day):
+        """Close the days that leave the lateness window, oldest first"""
+        start = series.newest - self.lateness_days + 1
+        close_until = day - self.lateness_days
+        explicit_end = min(close_until, start + self.max_gap_days - 1)
+        for closing in range(start, explicit_end + 1):
+            self._close(key, series, closing)
+
+        # Remaining days are all empty: decay the volume baseline in one step
+        skipped = close_until - explicit_end
+        if skipped > 0:
+            decay = (1 - self.alpha) ** skipped
+            series.volume_mean *= decay
+            series.volume_var *= decay
+            series.days += skipped
+        series.newest = day
+
+    def _close(self, key, series, day):
+        count, score_sum = series.open.pop(day, (0, 0.0))
+        series.seen.pop(day, None)
+
+        if series.days >= self.warmup and count >= self.min_count:
+            z = series.volume_z(count)
+            if z >= self.z_threshold:
+                self._record(key, 'volume', day, count, series.volume_mean, z)
+        series.volume_mean, series.volume_var = ewma_update(series.volume_mean, series.volume_var, count, self.alpha)
+        series.days += 1
+
+        if count:
+            severity = score_sum / count
+            if series.severity_days >= self.warmup and count >= self.min_count:
+                z = series.severity_z(severity)
+                if z >= self.z_threshold:
+                    self._record(key, 'severity', day, severity, series.severity_mean, z)
+            series.severity_mean, series.severity_var = ewma_update(
+                series.severity_mean, series.severity_var, severity, self.alpha)
+            series.severity_days += 1
+
+    def _record(self, key, kind, day, value, baseline, z):
+        series_type, name = key.split(':', 1)
+        self.events.append({
+            'series': series_type,
+            'name': name,
+            'kind': kind,
+            'day': date.fromordinal(day).isoformat(),
+            'value': round(value, 2),
+            'baseline': round(baseline, 2),
+            'z': round(z, 2)
+        })
+
+    # Reads
+
+    def surging(self, series_type='threat'):
+        """Series whose open (current) days already exceed their baseline
+
+        Returns ``{name: {'day', 'count', 'baseline', 'z'}}`` for the
+        strongest current spike per series. Only days within the lateness
+        window of the newest article seen overall count as current.
+        """
+        prefix = f"{series_type}:"
+        with self._lock:
+            if self.newest is None:
+                return {}
+            current_from = self.newest - self.lateness_days + 1
+            result = {}
+            for key, series in self.series.items():
+                if not key.startswith(prefix) or series.days < self.warmup:
+                    continue
+                for day, (count, _) in series.open.items():
+                    if day < current_from or count < self.min_count:
+                        continue
+                    z = series.volume_z(count)
+                    if z >= self.z_threshold and z > result.get(key[len(prefix):], {}).get('z', 0):
+                        result[key[len(prefix):]] = {
+                            'day': date.fromordinal(day).isoformat(),
+                            'count': count,
+                            'baseline': round(series.volume_mean, 2),
+                            'z': round(z, 2)
+                        }
+            return result
+
+    def anomalies(self, series_type=None):
+        """Recorded anomaly events, oldest first"""
+        with self._lock:
+            return [event for event in self.events if series_type is None or event['series'] == series_type]
+
+    # Following the history store
+
+    def sync(self, history_store, force=False, interval=None):
+        """Consume rows ingested since the last sync; returns the number read
+
+        On the very first sync the existing history is streamed once in
+        publication order. Calls within ``interval`` seconds of the last
+        sync return immediately unless ``force`` is set.
+        """
+        interval = TREND_CONFIG['sync_interval'] if interval is None else interval
+        with self._lock:
+            if not force and time.time() - self._synced_at < interval:
+                return 0
+            self._synced_at = time.time()
+
+            consumed = 0
+            if not self.mark:
+                for row in history_store.scan_by_published(columns=TREND_COLUMNS):
+                    self.observe(row)
+                    self.mark = max(self.mark, row['rowid'])
+                    consumed += 1
+            while True:
+                rows = history_store.ingested_since(self.mark, columns=TREND_COLUMNS)
+                if not rows:
+                    break
+                for row in rows:
+                    self.observe(row)
+                consumed += len(rows)
+                self.mark = rows[-1]['rowid']
+
+            if consumed:
+                self.save()
+            return consumed
+
+    # Snapshots
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'version': 2,
+                'saved_at': time.time(),
+                'mark': self.mark,
+                'newest': self.newest,
+                'stats': self.stats,
+                'events': list(self.events),
+                'series': {key: series.to_dict() for key, series in self.series.items()}
+            }
+
+    def save(self, path=None):
+        """Atomically write the detector state as JSON"""
+        path = path or self.state_path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None, **kwargs):
+        """Restore from a snapshot, or start empty if there is none or it is of another version"""
+        detector = cls(state_path=path, **kwargs)
+        if os.path.exists(detector.state_path):
+            with open(detector.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != 2:
+                return detector
+            detector.mark = data['mark']
+            detector.newest = data['newest']
+            detector.stats.update(data['stats'])
+            detector.events.extend(data['events'])
+            detector.series = {key: SeriesBaseline.from_dict(series) for key, series in data['series'].items()}
+        return detector